@@ -83,6 +83,7 @@ pyinstaller --noconfirm --windowed \
   --add-data="config.xml;." \
   --add-data="style/style.qss;style" \
   --add-data="images/*;images" \
+  --add-data="listeners/*;listeners" \
   --add-data="${QT_BIN_PATH}/Qt6Core.dll;." \
   --add-data="${QT_BIN_PATH}/Qt6Gui.dll;." \
   --add-data="${QT_BIN_PATH}/Qt6Widgets.dll;." \
@@ -0,0 +1,83 @@
+"""Headless distributed execution.
+
+Start a worker on every host that should run tests::
+
+    python distributed.py worker --host 0.0.0.0 --port 8270 --processes 4 --token secret
+
+then run suites from the coordinator, their outputs are combined into one
+output.xml, log and report::
+
+    python distributed.py run --workers host1:8270,host2:8270 --outputdir Results tests/*.robot
+"""
+import argparse
+import os
+import sys
+from robot.api import ExecutionResult
+from utils.concurrency import cpu_count
+from utils.distributed import DEFAULT_PORT, DistributedError, DistributedRun, WorkerServer, parse_workers
+from utils.run_queue import parse_variables
+from utils.scheduling import TimingHistory
+from utils.test_utils import LOG_TITLE, REPORT_TITLE
+
+
+def run_worker(args):
+    server = WorkerServer((args.host, args.port), args.processes, args.token)
+    print(f"Worker listening on {args.host}:{server.server_address[1]} with {server.processes} process(es)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def run_coordinator(args):
+    root = args.root or os.path.commonpath([os.path.dirname(os.path.abspath(source)) for source in args.suites])
+    timing_history = TimingHistory()
+    distributed_run = DistributedRun(parse_workers(args.workers), args.token)
+    os.makedirs(args.outputdir, exist_ok=True)
+    output_path = distributed_run.run(
+        args.suites, root, os.path.abspath(args.outputdir),
+        options=parse_variables(args.variables), test_timeout=args.test_timeout,
+        timing_history=timing_history, report_options=["--reporttitle", REPORT_TITLE, "--logtitle", LOG_TITLE],
+        run_timeout=args.run_timeout * 60)
+    result = ExecutionResult(output_path)
+    timing_history.record_result(result)
+    statistics = result.suite.statistics
+    print(f"Total: {statistics.total} | Passed: {statistics.passed} | Failed: {statistics.failed}")
+    print(f"Output: {output_path}")
+    return min(statistics.failed, 250)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Robot Framework suites on several worker hosts")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    worker = subparsers.add_parser("worker", help="run suites sent by a coordinator")
+    worker.add_argument("--host", default="127.0.0.1", help="interface to listen on, 0.0.0.0 for all (requires --token)")
+    worker.add_argument("--port", type=int, default=DEFAULT_PORT)
+    worker.add_argument("--processes", type=int, default=cpu_count(), help="pabot processes of this worker")
+    worker.add_argument("--token", default=os.environ.get("ROBOT_RUNNER_TOKEN", ""),
+                        help="shared secret required from coordinators")
+
+    run = subparsers.add_parser("run", help="split suites across workers and combine their results")
+    run.add_argument("--workers", required=True, help="comma separated host:port list")
+    run.add_argument("--outputdir", default="Results")
+    run.add_argument("--root", help="test directory sent to the workers, defaults to the suites' common folder")
+    run.add_argument("--variables", default="", help="NAME:value; NAME:value")
+    run.add_argument("--test-timeout", type=int, default=0, help="default test timeout in seconds")
+    run.add_argument("--run-timeout", type=int, default=0, help="budget of the whole run in minutes, 0 for none")
+    run.add_argument("--token", default=os.environ.get("ROBOT_RUNNER_TOKEN", ""))
+    run.add_argument("suites", nargs="+")
+
+    args = parser.parse_args(argv)
+    try:
+        return run_worker(args) if args.mode == "worker" else run_coordinator(args)
+    except (DistributedError, ValueError, OSError) as e:
+        print(f"Error: {e}")
+        return 252
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Robot Framework listener (API v3) streaming test events to Robot Runner.
+
+Bundled with the application and injected by the runner as
+``--listener path/to/LiveResultsListener.py:PORT``. Every event is sent as
+one JSON document per line to the runner listening on 127.0.0.1:PORT.
+"""
+import ctypes
+import json
+import os
+import socket
+import sys
+import time
+
+
+class LiveResultsListener:
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, port, host="127.0.0.1"):
+        self.start_times = {}
+        try:
+            self.connection = socket.create_connection((host, int(port)), timeout=5)
+        except OSError:
+            # The run must never fail because the GUI is unreachable
+            self.connection = None
+
+    def start_test(self, data, result):
+        self.start_times[result.longname] = time.time()
+        self._send({
+            'event': 'start_test',
+            'name': result.name,
+            'longname': result.longname,
+            'source': str(data.source or ''),
+            'start': self.start_times[result.longname],
+            'timeout': str(data.timeout or ''),
+        })
+
+    def end_test(self, data, result):
+        self._send({
+            'event': 'end_test',
+            'name': result.name,
+            'longname': result.longname,
+            'source': str(data.source or ''),
+            'status': result.status,
+            'message': result.message,
+            'start': self.start_times.pop(result.longname, time.time()),
+            'duration': self._elapsed_seconds(result),
+            'pid': os.getpid(),
+        })
+
+    def close(self):
+        # Used by the runner to size the number of parallel workers
+        self._send({'event': 'worker_stats', 'pid': os.getpid(), 'peak_rss': self._peak_rss()})
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def _elapsed_seconds(self, result):
+        elapsed = getattr(result, 'elapsed_time', None)
+        if elapsed is not None:
+            return elapsed.total_seconds()
+        return result.elapsedtime / 1000.0
+
+    def _peak_rss(self):
+        """Peak resident memory of this robot process in bytes, 0 when unknown"""
+        try:
+            import resource
+        except ImportError:
+            return self._windows_peak_rss()
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    def _windows_peak_rss(self):
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+        try:
+            counters = ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(ProcessMemoryCounters)
+            process = ctypes.windll.kernel32.GetCurrentProcess()
+            if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+                return counters.PeakWorkingSetSize
+        except (AttributeError, OSError):
+            pass
+        return 0
+
+    def _send(self, event):
+        if not self.connection:
+            return
+        try:
+            self.connection.sendall((json.dumps(event) + "\n").encode("utf-8"))
+        except OSError:
+            self.connection = None
@@ -0,0 +1,19 @@
+"""Robot Framework listener (API v3) applying Robot Runner's default test timeout.
+
+Injected by the runner as ``--listener path/to/TestTimeoutListener.py:SECONDS``.
+Tests that have no timeout of their own (from ``[Timeout]`` or the suite
+``Test Timeout`` setting) get the given one, so a hung keyword fails the
+test instead of blocking the whole run.
+"""
+
+
+class TestTimeoutListener:
+    ROBOT_LISTENER_API_VERSION = 3
+
+    def __init__(self, timeout):
+        self.timeout = f"{timeout} seconds"
+
+    def start_suite(self, data, result):
+        for test in data.tests:
+            if not test.timeout:
+                test.timeout = self.timeout
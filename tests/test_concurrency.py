@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from utils.concurrency import ConcurrencyHistory, choose_process_count
+
+MB = 1024 * 1024
+
+
+class TestChooseProcessCount(unittest.TestCase):
+    def test_bounded_by_cpu_cores(self):
+        durations = {f"--suite S{i}": 10.0 for i in range(8)}
+        self.assertEqual(choose_process_count(durations, cpus=4), (4, 20.0))
+
+    def test_bounded_by_free_memory(self):
+        durations = {f"--suite S{i}": 10.0 for i in range(8)}
+        count, _ = choose_process_count(durations, cpus=8, free_memory=500 * MB, worker_memory=200 * MB)
+        self.assertEqual(count, 2)
+
+    def test_extra_workers_that_do_not_shorten_the_run_are_not_used(self):
+        # The 60s suite dominates, more than two workers cannot finish sooner
+        durations = {'--suite Long': 60.0, '--suite A': 5.0, '--suite B': 5.0, '--suite C': 5.0}
+        self.assertEqual(choose_process_count(durations, cpus=8), (2, 60.0))
+
+    def test_at_least_one_process(self):
+        self.assertEqual(choose_process_count({}, cpus=4, free_memory=MB)[0], 1)
+
+
+class TestConcurrencyHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "concurrency.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_worker_memory_follows_growth_and_decays_slowly(self):
+        history = ConcurrencyHistory(self.path)
+        history.record_worker_peaks([100 * MB, 150 * MB])
+        self.assertEqual(history.worker_memory(), 150 * MB)
+        history.record_worker_peaks([50 * MB])
+        self.assertEqual(history.worker_memory(), 100 * MB)
+        history.record_worker_peaks([300 * MB])
+        self.assertEqual(history.worker_memory(), 300 * MB)
+
+    def test_runs_are_persisted_with_their_speedup(self):
+        history = ConcurrencyHistory(self.path)
+        history.record_worker_peaks([120 * MB])
+        self.assertEqual(history.record_run(4, True, 30.0, 90.0), 3.0)
+
+        reloaded = ConcurrencyHistory(self.path)
+        self.assertEqual(reloaded.worker_memory(), 120 * MB)
+        self.assertEqual(reloaded.last_run()['processes'], 4)
+        self.assertTrue(reloaded.last_run()['auto'])
+        self.assertEqual(reloaded.last_run()['speedup'], 3.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
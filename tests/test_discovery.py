@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from utils.discovery import (
+    DEFAULT_IGNORE_PATTERNS, DiscoveryIndex, is_ignored, parse_patterns, parse_suite_file, scan_suites
+)
+
+
+class TestScanSuites(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        for path in ("b.robot", "a.robot", "notes.txt", "common.resource", "api/users.robot",
+                     "api/v2/orders.robot", "ui/login.robot", ".git/x.robot", "_private/y.robot",
+                     "Results/pabot_results/0/z.robot", "ui/drafts/wip.robot", "out/result.robot"):
+            full_path = os.path.join(self.root, *path.split("/"))
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            open(full_path, "w").close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def suites(self, patterns, excluded=()):
+        return [path.replace(os.sep, "/") for _, files, _ in scan_suites(self.root, patterns, excluded)
+                for path, _ in files]
+
+    def test_recursive_scan_in_sorted_order(self):
+        self.assertEqual(self.suites(parse_patterns(DEFAULT_IGNORE_PATTERNS)), [
+            "a.robot", "b.robot", "api/users.robot", "api/v2/orders.robot",
+            "out/result.robot", "ui/login.robot", "ui/drafts/wip.robot",
+        ])
+
+    def test_ignore_patterns_match_names_and_relative_paths(self):
+        patterns = parse_patterns(DEFAULT_IGNORE_PATTERNS + "; ui/drafts, v2")
+        self.assertNotIn("ui/drafts/wip.robot", self.suites(patterns))
+        self.assertNotIn("api/v2/orders.robot", self.suites(patterns))
+        self.assertTrue(is_ignored("wip.robot", os.path.join("ui", "wip.robot"), ["ui/*"]))
+
+    def test_excluded_folders_are_skipped(self):
+        suites = self.suites([], excluded=[os.path.join(self.root, "out")])
+        self.assertNotIn("out/result.robot", suites)
+        self.assertIn(".git/x.robot", suites)
+
+    def test_rescan_of_folders_does_not_enter_known_sub_folders(self):
+        scanned = [(folder.replace(os.sep, "/"), [path.replace(os.sep, "/") for path, _ in files])
+                   for folder, files, _ in scan_suites(self.root, [".*", "_*", "Results"], folders=["", "gone"],
+                                                       known={"api", "out"})]
+        self.assertEqual(scanned, [("", ["a.robot", "b.robot"]), ("ui", ["ui/login.robot"]),
+                                   ("ui/drafts", ["ui/drafts/wip.robot"])])
+
+    def test_missing_root_raises(self):
+        with self.assertRaises(OSError):
+            list(scan_suites(os.path.join(self.root, "missing")))
+
+
+SUITE = """*** Settings ***
+Documentation    Orders API
+Test Tags    api
+Default Tags    slow
+
+*** Test Cases ***
+Create Order
+    [Documentation]    Creates one order
+    [Tags]    smoke
+    Log    created
+List Orders
+    Log    listed
+"""
+
+
+class TestDiscoveryIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "01__orders.robot")
+        with open(self.path, "w") as suite_file:
+            suite_file.write(SUITE)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_suite_file(self):
+        info = parse_suite_file(self.path)
+        self.assertEqual(info['name'], "Orders")
+        self.assertEqual(info['documentation'], "Orders API")
+        self.assertEqual(info['tests'], [
+            {'name': "Create Order", 'tags': ["api", "smoke"], 'documentation': "Creates one order"},
+            {'name': "List Orders", 'tags': ["api", "slow"], 'documentation': ""},
+        ])
+
+    def test_store_load_and_remove(self):
+        index = DiscoveryIndex(os.path.join(self.tmp.name, "index.sqlite"))
+        info = parse_suite_file(self.path)
+        connection = index.open()
+        index.store(connection, self.path, 123, len(SUITE), info)
+        connection.commit()
+        connection.close()
+
+        connection = index.open()
+        self.assertEqual(index.load(connection, self.tmp.name), {self.path: (123, len(SUITE), info)})
+        self.assertEqual(index.load(connection, os.path.join(self.tmp.name, "other")), {})
+        index.remove(connection, [self.path])
+        self.assertEqual(index.load(connection, self.tmp.name), {})
+        connection.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from robot.api import ExecutionResult
+from utils.distributed import (MAX_HEADER_BYTES, MAX_PAYLOAD_BYTES, DistributedError, DistributedRun, WorkerServer,
+                               parse_workers, receive_message, worker_options)
+
+SUITE = """*** Settings ***
+Resource    ../common.resource
+
+*** Test Cases ***
+{name} Test
+    Shared Keyword    ${{VALUE}}
+"""
+
+RESOURCE = """*** Keywords ***
+Shared Keyword
+    [Arguments]    ${value}
+    Should Be Equal    ${value}    expected
+"""
+
+
+class TestParseWorkers(unittest.TestCase):
+    def test_hosts_and_ports(self):
+        self.assertEqual(parse_workers("build1:9000, 10.0.0.2 ;localhost"),
+                         [("build1", 9000), ("10.0.0.2", 8270), ("localhost", 8270)])
+
+    def test_invalid_port(self):
+        with self.assertRaises(DistributedError):
+            parse_workers("build1:http")
+
+
+class TestWorkerSecurity(unittest.TestCase):
+    def test_only_selection_options_are_allowed(self):
+        options = ["--variable", "VALUE:expected", "--include", "smoke", "--test", "Suite.Login"]
+        self.assertEqual(worker_options(options), options)
+        for options in (["--listener", "evil.py"], ["--pythonpath", "."], ["--prerunmodifier", "evil.py"],
+                        ["--variable"], ["--listener=evil.py", "x"]):
+            with self.assertRaises(DistributedError):
+                worker_options(options)
+
+    def test_remote_interface_requires_a_token(self):
+        with self.assertRaises(DistributedError):
+            WorkerServer(("0.0.0.0", 0), processes=1, log=lambda _: None)
+        server = WorkerServer(("127.0.0.1", 0), processes=1, log=lambda _: None)
+        server.server_close()
+
+    def test_message_sizes_are_limited(self):
+        self.assertEqual(receive_message(io.BytesIO(b'{"size": 2}\nok')), ({'size': 2}, b"ok"))
+        for message in (b'{"command": "' + b"x" * MAX_HEADER_BYTES + b'"}\n',
+                        json.dumps({'size': MAX_PAYLOAD_BYTES + 1}).encode() + b"\n",
+                        b'{"size": -1}\n', b'{"size": "2"}\n', b'[]\n'):
+            with self.assertRaises(DistributedError):
+                receive_message(io.BytesIO(message))
+
+
+class TestDistributedRun(unittest.TestCase):
+    """Two workers on localhost run the shares of four suites"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "tests")
+        os.makedirs(os.path.join(self.root, "suites"))
+        with open(os.path.join(self.root, "common.resource"), "w") as resource:
+            resource.write(RESOURCE)
+        self.sources = []
+        for name in ("First", "Second", "Third", "Fourth"):
+            path = os.path.join(self.root, "suites", f"{name.lower()}.robot")
+            with open(path, "w") as suite:
+                suite.write(SUITE.format(name=name))
+            self.sources.append(path)
+
+        self.servers = [WorkerServer(("127.0.0.1", 0), processes=1, token="secret", log=lambda _: None)
+                        for _ in range(2)]
+        for server in self.servers:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.workers = [server.server_address for server in self.servers]
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+        self.tmp.cleanup()
+
+    def test_outputs_are_combined(self):
+        output_dir = os.path.join(self.tmp.name, "results")
+        distributed_run = DistributedRun(self.workers, "secret", log=lambda _: None)
+        output_path = distributed_run.run(self.sources, self.root, output_dir,
+                                          options=["--variable", "VALUE:expected"])
+
+        result = ExecutionResult(output_path)
+        self.assertEqual(result.suite.name, "Suites")
+        self.assertEqual(result.suite.statistics.passed, 4)
+        self.assertEqual(sorted(str(suite.source) for suite in result.suite.suites), sorted(self.sources))
+        self.assertEqual(len(os.listdir(os.path.join(output_dir, "workers"))), 2)
+
+    def test_worker_refuses_code_running_options(self):
+        listener = os.path.join(self.tmp.name, "listener.py")
+        open(listener, "w").close()
+        distributed_run = DistributedRun(self.workers, "secret", log=lambda _: None)
+        with self.assertRaises(DistributedError):
+            distributed_run.run(self.sources, self.root, os.path.join(self.tmp.name, "results"),
+                                options=["--listener", listener])
+
+    def test_timeouts_must_be_seconds(self):
+        distributed_run = DistributedRun(self.workers, "secret", log=lambda _: None)
+        for timeout in ("5:evil.py", -1, 1.5):
+            with self.assertRaises(DistributedError):
+                distributed_run.run(self.sources, self.root, os.path.join(self.tmp.name, "results"),
+                                    test_timeout=timeout)
+
+    def test_worker_stops_a_run_over_its_budget(self):
+        sleeping = self.sleeping_suite()
+        distributed_run = DistributedRun(self.workers[:1], "secret", log=lambda _: None)
+        started = time.monotonic()
+        with self.assertRaises(DistributedError):
+            distributed_run.run([sleeping], self.root, os.path.join(self.tmp.name, "results"), run_timeout=1)
+        self.assertLess(time.monotonic() - started, 20)
+
+    def test_abort_keeps_the_outputs_of_finished_shares(self):
+        sleeping = self.sleeping_suite()
+        distributed_run = DistributedRun(self.workers, "secret", log=lambda _: None)
+        threading.Timer(3, distributed_run.abort, ["Run exceeded its 1 minute limit"]).start()
+        started = time.monotonic()
+        output_path = distributed_run.run([self.sources[0], sleeping], self.root,
+                                          os.path.join(self.tmp.name, "results"),
+                                          options=["--variable", "VALUE:expected"])
+        self.assertLess(time.monotonic() - started, 20)
+        result = ExecutionResult(output_path)
+        self.assertEqual([test.name for test in result.suite.all_tests], ["First Test"])
+
+    def sleeping_suite(self):
+        path = os.path.join(self.root, "suites", "sleeping.robot")
+        with open(path, "w") as suite:
+            suite.write("*** Test Cases ***\nSleeping Test\n    Sleep    30s\n")
+        return path
+
+    def test_wrong_token_is_rejected(self):
+        distributed_run = DistributedRun(self.workers, "wrong", log=lambda _: None)
+        with self.assertRaises(DistributedError):
+            distributed_run.run(self.sources, self.root, os.path.join(self.tmp.name, "results"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+from robot.api import ExecutionResult
+from utils.execution_engine import NO_OUTPUT_EXIT_CODES, TestExecutionEngine
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+FINAL_OUTPUT = '<?xml version="1.0" encoding="UTF-8"?>\n<robot generator="Robot 6.1.1">\n</robot>\n'
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+def write_output(path, exit_code=0):
+    """Command writing a finalized output.xml, then exiting with exit_code"""
+    return python(f"import sys; open({path!r}, 'w').write({FINAL_OUTPUT!r}); sys.exit({exit_code})")
+
+
+class EngineTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.output_path = os.path.join(self.tmp.name, "output.xml")
+        self.engine = TestExecutionEngine()
+        self.events = []
+        self.engine.started.connect(lambda: self.events.append(("started",)))
+        self.engine.finished.connect(lambda path: self.events.append(("finished", path)))
+        self.engine.failed.connect(lambda message: self.events.append(("failed", message)))
+
+    def run_command(self, command, on_started=None):
+        """Start a command and process events until the engine finishes or fails"""
+        loop = QEventLoop()
+        self.engine.finished.connect(loop.quit)
+        self.engine.failed.connect(loop.quit)
+        if on_started:
+            self.engine.started.connect(on_started)
+        QTimer.singleShot(30000, loop.quit)
+        self.assertTrue(self.engine.start(command, self.tmp.name, self.output_path))
+        loop.exec()
+        self.assertFalse(self.engine.is_running())
+        return self.events[-1]
+
+
+class TestExecutionEngineRuns(EngineTestCase):
+    def test_finished_once_the_output_is_written(self):
+        self.assertEqual(self.run_command(write_output(self.output_path)), ("finished", self.output_path))
+        self.assertEqual(self.events[0], ("started",))
+
+    def test_failed_tests_exit_code_is_not_an_error(self):
+        self.assertEqual(self.run_command(write_output(self.output_path, exit_code=3)),
+                         ("finished", self.output_path))
+
+    def test_exit_codes_without_output(self):
+        for exit_code in NO_OUTPUT_EXIT_CODES:
+            with self.subTest(exit_code=exit_code):
+                event, message = self.run_command(python(f"raise SystemExit({exit_code})"))
+                self.assertEqual(event, "failed")
+                self.assertIn(f"exited with code {exit_code} without producing output.xml", message)
+
+    def test_output_written_by_an_error_exit_code_is_used(self):
+        self.assertEqual(self.run_command(write_output(self.output_path, exit_code=NO_OUTPUT_EXIT_CODES[0])),
+                         ("finished", self.output_path))
+
+    def test_output_never_finalized(self):
+        self.engine.output_watcher.deadline.setInterval(300)
+        event, message = self.run_command(python("pass"))
+        self.assertEqual(event, "failed")
+        self.assertIn("output.xml not finalized", message)
+
+    def test_command_that_cannot_start(self):
+        event, message = self.run_command([os.path.join(self.tmp.name, "missing-robot")])
+        self.assertEqual(event, "failed")
+        self.assertIn("Failed to start", message)
+
+    def test_run_in_progress_refuses_another(self):
+        self.engine.start(python("import time; time.sleep(30)"), self.tmp.name, self.output_path)
+        self.addCleanup(self.engine.process.waitForFinished)
+        self.addCleanup(self.engine.stop)
+        self.assertFalse(self.engine.start(python("pass"), self.tmp.name, self.output_path))
+        self.assertEqual(self.events[-1], ("failed", "A test run is already in progress"))
+
+
+class TestExecutionEngineAbort(EngineTestCase):
+    """A hung run is killed and the outputs of its finished pabot workers are merged"""
+
+    def worker_output(self, index, test_name):
+        suite = os.path.join(self.tmp.name, f"suite{index}.robot")
+        with open(suite, "w") as suite_file:
+            suite_file.write(f"*** Test Cases ***\n{test_name}\n    Log    done\n")
+        # pabot runs every worker under the same root suite
+        output_dir = os.path.join(self.tmp.name, "pabot_results", str(index))
+        subprocess.run(["robot", "--name", "Suites", "--outputdir", output_dir, "--log", "NONE", "--report", "NONE", suite],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def test_abort_salvages_finished_worker_outputs(self):
+        self.worker_output(0, "First")
+        self.worker_output(1, "Second")
+        # A worker killed while writing its output is left out
+        unfinished = os.path.join(self.tmp.name, "pabot_results", "2", "output.xml")
+        os.makedirs(os.path.dirname(unfinished))
+        with open(unfinished, "w") as output_file:
+            output_file.write(FINAL_OUTPUT[:-10])
+
+        event = self.run_command(python("import time; time.sleep(30)"),
+                                 on_started=lambda: self.engine.abort("Run exceeded its 1 minute limit"))
+        self.assertEqual(event, ("finished", self.output_path))
+        tests = [test.name for test in ExecutionResult(self.output_path).suite.all_tests]
+        self.assertEqual(sorted(tests), ["First", "Second"])
+
+    def test_abort_without_finished_workers(self):
+        event = self.run_command(python("import time; time.sleep(30)"),
+                                 on_started=lambda: self.engine.abort("Run exceeded its 1 minute limit"))
+        self.assertEqual(event, ("failed", "Run exceeded its 1 minute limit. No finished results could be salvaged."))
+
+    def test_abort_after_the_run_does_nothing(self):
+        self.run_command(write_output(self.output_path))
+        self.engine.abort("Run exceeded its 1 minute limit")
+        self.assertEqual(self.engine.abort_reason, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
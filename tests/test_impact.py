@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+from utils.impact import ImpactIndex, scan_file
+
+RESOURCE = """*** Settings ***
+Library    helpers.py
+
+*** Keywords ***
+Open Shop
+    Log    opening
+Buy ${count} Items
+    Log    ${count}
+Checkout
+    Open Shop
+"""
+
+
+class TestImpactIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.write("keywords.resource", RESOURCE)
+        self.write("helpers.py", "def helper():\n    pass\n")
+        self.shop = self.write("shop.robot", "*** Settings ***\nResource    ${CURDIR}/keywords.resource\n\n"
+                                             "*** Test Cases ***\nBuy\n    Given Checkout\n")
+        self.other = self.write("other.robot", "*** Settings ***\nResource    keywords.resource\n\n"
+                                               "*** Test Cases ***\nLook\n    Log    nothing\n")
+        self.index = ImpactIndex(os.path.join(self.root, "index.json"))
+        self.index.record_green(self.index.snapshot([self.shop, self.other], self.root), [self.shop, self.other])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.root, name)
+        with open(path, "w") as data_file:
+            data_file.write(content)
+        return path
+
+    def test_scan_file(self):
+        entry = scan_file(os.path.join(self.root, "keywords.resource"))
+        self.assertEqual(entry['imports'], [("library", "helpers.py")])
+        self.assertEqual(set(entry['keywords']), {"openshop", "buy${count}items", "checkout"})
+        self.assertTrue(entry['keywords']["buy${count}items"]['embedded'])
+        self.assertEqual(entry['keywords']["checkout"]['uses'], ["openshop"])
+
+    def test_unchanged_suites_are_not_affected(self):
+        self.assertEqual(self.index.affected([self.shop, self.other], self.root), [])
+
+    def test_keyword_change_affects_only_its_callers(self):
+        self.write("keywords.resource", RESOURCE.replace("opening", "opened"))
+        self.assertEqual(self.index.affected([self.shop, self.other], self.root), [self.shop])
+
+    def test_library_change_affects_all_importers(self):
+        self.write("helpers.py", "def helper():\n    return 1\n")
+        self.assertEqual(self.index.affected([self.shop, self.other], self.root), [self.shop, self.other])
+
+    def test_suite_that_never_passed_is_affected(self):
+        new_suite = self.write("new.robot", "*** Test Cases ***\nNew\n    Log    new\n")
+        self.assertEqual(self.index.affected([new_suite], self.root), [new_suite])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from PyQt6.QtCore import QCoreApplication, QEventLoop, QTimer
+from utils.output_watcher import OutputWatcher, is_output_finalized
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+PARTIAL_OUTPUT = b'<?xml version="1.0" encoding="UTF-8"?>\n<robot generator="Robot 6.1.1">\n<suite name="S">\n'
+FINAL_OUTPUT = PARTIAL_OUTPUT + b'</suite>\n</robot>\n'
+
+
+class TestIsOutputFinalized(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "output.xml")
+
+    def write(self, content):
+        with open(self.path, "wb") as output_file:
+            output_file.write(content)
+
+    def test_missing_or_partial_output(self):
+        self.assertFalse(is_output_finalized(self.path))
+        self.write(b"")
+        self.assertFalse(is_output_finalized(self.path))
+        self.write(PARTIAL_OUTPUT)
+        self.assertFalse(is_output_finalized(self.path))
+
+    def test_closing_tag_ends_the_output(self):
+        self.write(FINAL_OUTPUT + b"\r\n  ")
+        self.assertTrue(is_output_finalized(self.path))
+        self.write(b"</robot>")
+        self.assertTrue(is_output_finalized(self.path))
+
+    def test_closing_tag_must_be_last(self):
+        self.write(FINAL_OUTPUT + b"<!-- more -->\n")
+        self.assertFalse(is_output_finalized(self.path))
+
+
+class TestOutputWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "output.xml")
+        self.watcher = OutputWatcher(timeout_ms=3000)
+        self.events = []
+        self.watcher.ready.connect(lambda path: self.events.append(("ready", path)))
+        self.watcher.timed_out.connect(lambda path: self.events.append(("timed_out", path)))
+
+    def write(self, content, mode="wb"):
+        with open(self.path, mode) as output_file:
+            output_file.write(content)
+
+    def wait(self, milliseconds=5000):
+        """Process events until the watcher reports, or for the given time"""
+        loop = QEventLoop()
+        self.watcher.ready.connect(loop.quit)
+        self.watcher.timed_out.connect(loop.quit)
+        QTimer.singleShot(milliseconds, loop.quit)
+        loop.exec()
+
+    def test_finalized_output_is_ready_at_once(self):
+        self.write(FINAL_OUTPUT)
+        self.watcher.watch(self.path)
+        self.assertEqual(self.events, [("ready", self.path)])
+        self.assertFalse(self.watcher.is_watching())
+
+    def test_ready_once_the_closing_tag_is_written(self):
+        self.write(PARTIAL_OUTPUT)
+        self.watcher.watch(self.path)
+        self.assertTrue(self.watcher.is_watching())
+        QTimer.singleShot(200, lambda: self.write(b'</suite>\n</robot>\n', "ab"))
+        self.wait()
+        self.assertEqual(self.events, [("ready", self.path)])
+
+    def test_output_created_after_watching_started(self):
+        self.watcher.watch(self.path)
+        QTimer.singleShot(100, lambda: self.write(PARTIAL_OUTPUT))
+        QTimer.singleShot(400, lambda: self.write(b'</suite>\n</robot>\n', "ab"))
+        self.wait()
+        self.assertEqual(self.events, [("ready", self.path)])
+
+    def test_times_out_without_closing_tag(self):
+        self.watcher.deadline.setInterval(300)
+        self.write(PARTIAL_OUTPUT)
+        self.watcher.watch(self.path)
+        self.wait()
+        self.assertEqual(self.events, [("timed_out", self.path)])
+        self.assertFalse(self.watcher.is_watching())
+
+    def test_stopped_watcher_reports_nothing(self):
+        self.watcher.deadline.setInterval(300)
+        self.watcher.watch(self.path)
+        self.watcher.stop()
+        self.write(FINAL_OUTPUT)
+        self.wait(600)
+        self.assertEqual(self.events, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
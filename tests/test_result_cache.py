@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from robot.result import TestSuite
+from utils.impact import ImpactIndex
+from importlib import metadata
+from utils.result_cache import ResultCache, cache_key, library_version
+
+
+class TestCacheKey(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        self.index = ImpactIndex(os.path.join(self.root, "index.json"))
+        self.write("common.resource", "*** Keywords ***\nGreet\n    Log    hello\n")
+        self.write("suite.robot", "*** Settings ***\nResource    common.resource\n\n"
+                                  "*** Test Cases ***\nT\n    Greet\n")
+        self.suite = os.path.join(self.root, "suite.robot")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, content):
+        with open(os.path.join(self.root, name), "w") as data_file:
+            data_file.write(content)
+
+    def test_stable_while_inputs_are_unchanged(self):
+        self.assertEqual(cache_key(self.index, self.suite, self.root),
+                         cache_key(self.index, self.suite, self.root))
+
+    def test_changes_with_imported_resources(self):
+        before = cache_key(self.index, self.suite, self.root)
+        self.write("common.resource", "*** Keywords ***\nGreet\n    Log    bye\n")
+        self.assertNotEqual(cache_key(self.index, self.suite, self.root), before)
+
+    def test_changes_with_variables(self):
+        self.assertNotEqual(cache_key(self.index, self.suite, self.root, ["X:1"]),
+                            cache_key(self.index, self.suite, self.root, ["X:2"]))
+
+    def test_changes_with_tag_selection(self):
+        whole_suite = cache_key(self.index, self.suite, self.root)
+        self.assertNotEqual(cache_key(self.index, self.suite, self.root, ["--include", "smoke"]), whole_suite)
+        self.assertNotEqual(cache_key(self.index, self.suite, self.root, ["--exclude", "smoke"]), whole_suite)
+
+    def test_library_named_unlike_its_distribution_without_packages_distributions(self):
+        # Python 3.9 has no metadata.packages_distributions
+        self.write("suite.robot", "*** Settings ***\nLibrary    pabot.PabotLib\n\n*** Test Cases ***\nT\n    Log    x\n")
+        library_version.cache_clear()
+        self.addCleanup(library_version.cache_clear)
+        with mock.patch.object(metadata, 'packages_distributions', None):
+            before = cache_key(self.index, self.suite, self.root)
+            with mock.patch('pabot.__version__', "0.0.1"):
+                library_version.cache_clear()
+                self.assertNotEqual(cache_key(self.index, self.suite, self.root), before)
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def store(self, cache, key):
+        suite = TestSuite(name=key, source=os.path.join(self.tmp.name, f"{key}.robot"))
+        suite.tests.create(name="T", status="PASS")
+        cache.store(key, suite)
+
+    def test_lookup_returns_stored_output_until_it_expires(self):
+        cache = ResultCache(self.tmp.name, max_age_hours=1)
+        self.store(cache, "a")
+        self.assertTrue(os.path.isfile(cache.lookup("a")))
+        self.assertIsNone(cache.lookup("b"))
+
+        cache.entries["a"]['created'] -= 2 * 3600
+        self.assertIsNone(cache.lookup("a"))
+
+    def test_evict_drops_expired_then_oldest_entries(self):
+        cache = ResultCache(self.tmp.name, max_age_hours=1)
+        for key in ("old", "a", "b"):
+            self.store(cache, key)
+        cache.entries["old"]['created'] -= 2 * 3600
+        cache.entries["a"]['created'] -= 60
+        cache.max_size_mb = cache.entries["b"]['size'] / (1024 * 1024)
+        cache.evict()
+
+        self.assertEqual(list(cache.entries), ["b"])
+        self.assertEqual(sorted(os.listdir(self.tmp.name)), ["b.xml", "index.json"])
+        self.assertEqual(list(ResultCache(self.tmp.name).entries), ["b"])
+
+
+if __name__ == '__main__':
+    unittest.main()
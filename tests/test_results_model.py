@@ -0,0 +1,167 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from xml.parsers import expat
+from robot import run
+from robot.api import ExecutionResult
+from ui.dashboard.dashboard_loader import dashboard_stats
+from unittest import mock
+from utils.results_model import (ResultsModel, SnapshotCache, file_version, iso_times, legacy_times, read_output,
+                                 snapshot_from_result)
+from utils.test_records import NO_START, to_epoch_ms
+
+SUITE = """*** Settings ***
+Suite Setup    Log    setup
+
+*** Test Cases ***
+Passing
+    Log    ok
+
+Failing
+    [Documentation]    Not a status message
+    FOR    ${i}    IN RANGE    2
+        Log    step ${i}
+    END
+    Fail    broken
+
+Skipped
+    Skip    later
+"""
+
+# Robot Framework 7 output (schema 5): times are start and elapsed
+RF7_OUTPUT = """<?xml version="1.0" encoding="UTF-8"?>
+<robot generator="Robot 7.0" generated="2024-01-31T10:00:00.000000" rpa="false" schemaversion="5">
+<suite id="s1" name="Suite">
+<test id="s1-t1" name="Passing">
+<kw name="Log"><msg time="2024-01-31T10:00:00.100000">ok</msg><status status="PASS" start="2024-01-31T10:00:00.100000" elapsed="0.001"/></kw>
+<status status="PASS" start="2024-01-31T10:00:00.100000" elapsed="0.250000"/>
+</test>
+<test id="s1-t2" name="Failing">
+<status status="FAIL" start="2024-01-31T10:00:01" elapsed="1.5">broken</status>
+</test>
+<test id="s1-t3" name="Unreadable">
+<status status="FAIL" start="yesterday" elapsed="1"/>
+</test>
+<status status="FAIL" start="2024-01-31T10:00:00.000000" elapsed="2.0"/>
+</suite>
+</robot>
+"""
+
+
+class TestResultsModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        suite = os.path.join(cls.directory.name, "suite.robot")
+        with open(suite, 'w') as file:
+            file.write(SUITE)
+        cls.output = os.path.join(cls.directory.name, "output.xml")
+        with open(os.devnull, 'w') as devnull:
+            run(suite, output=cls.output, log=None, report=None, stdout=devnull)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_read_reports_progress_up_to_complete(self):
+        progress = []
+        snapshot = read_output(self.output, progress.append)
+        self.assertEqual(progress[-1], 100)
+        self.assertEqual((len(snapshot.tests), snapshot.passed, snapshot.failed), (3, 1, 1))
+        self.assertEqual([test.status for test in snapshot.tests], ["PASS", "FAIL", "SKIP"])
+        self.assertEqual(snapshot.tests[1].message, "broken")
+        self.assertEqual(snapshot.tests[1].suite, "Suite")
+
+    def test_same_snapshot_as_robot_result(self):
+        streamed = read_output(self.output)
+        loaded = snapshot_from_result(streamed.path, streamed.version, ExecutionResult(self.output))
+        self.assertEqual(list(streamed.tests), list(loaded.tests))
+        self.assertEqual((streamed.passed, streamed.failed), (loaded.passed, loaded.failed))
+
+    def test_snapshot_is_parsed_once_per_file_version(self):
+        model = ResultsModel()
+        first = model.snapshot(self.output)
+        self.assertIs(model.snapshot(self.output), first)
+        model.execution_result(self.output)
+        self.assertIs(model.snapshot(self.output), first)
+
+        copy = os.path.join(self.directory.name, "copy.xml")
+        with open(self.output, 'rb') as output, open(copy, 'wb') as file:
+            file.write(output.read())
+        model.execution_result(copy)
+        self.assertEqual(model.snapshot(copy).version, file_version(copy))
+        self.assertEqual(list(model.snapshot(copy).tests), list(first.tests))
+
+    def test_dashboard_stats(self):
+        stats = dashboard_stats(read_output(self.output))
+        self.assertEqual((stats['total_tests'], stats['passed'], stats['failed']), (2, 1, 1))
+        records = stats['records']
+        self.assertEqual([test.name for test in records], ["Passing", "Failing", "Skipped"])
+        self.assertTrue(records.timed().all())
+
+    def test_cache_round_trip_and_stale_version(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SnapshotCache(directory)
+            snapshot = read_output(os.path.abspath(self.output))
+            self.assertIsNone(cache.load(snapshot.path, snapshot.version))
+            cache.store(snapshot)
+            cached = cache.load(snapshot.path, snapshot.version)
+            self.assertEqual(list(cached.tests), list(snapshot.tests))
+            self.assertEqual(cached.tests.strings, snapshot.tests.strings)
+            self.assertIsNone(cache.load(snapshot.path, (snapshot.version[0] + 1, snapshot.version[1])))
+
+    def test_cached_snapshot_survives_a_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = ResultsModel(SnapshotCache(directory)).snapshot(self.output)
+            with mock.patch('utils.results_model.read_output') as read:
+                self.assertEqual(list(ResultsModel(SnapshotCache(directory)).snapshot(self.output).tests),
+                                 list(first.tests))
+            read.assert_not_called()
+
+    def test_cache_evicts_entries_older_than_keep_days(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = SnapshotCache(directory, keep_days=1)
+            snapshot = read_output(os.path.abspath(self.output))
+            cache.store(snapshot)
+            entry = os.path.join(directory, os.listdir(directory)[0])
+            old = time.time() - 2 * 24 * 3600
+            os.utime(entry, (old, old))
+            cache.evict()
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_reads_robot_framework_7_times(self):
+        path = os.path.join(self.directory.name, "rf7.xml")
+        with open(path, 'w') as file:
+            file.write(RF7_OUTPUT)
+        tests = list(read_output(path).tests)
+        self.assertEqual([(test.start, test.duration) for test in tests],
+                         [(datetime(2024, 1, 31, 10, 0, 0, 100000), 0.25), (datetime(2024, 1, 31, 10, 0, 1), 1.5),
+                          (None, 0.0)])
+        self.assertEqual(tests[1].message, "broken")
+
+    def test_timestamps_convert_like_strptime(self):
+        values = ["20240131 10:00:00.123", "20240229 23:59:59.999", "19991231 00:00:00.000"]
+        expected = [to_epoch_ms(datetime.strptime(value, "%Y%m%d %H:%M:%S.%f")) for value in values]
+        self.assertEqual(legacy_times(values).tolist(), expected)
+        self.assertEqual(iso_times(["2024-01-31T10:00:00.123456", "2024-02-29T23:59:59.999",
+                                    "1999-12-31T00:00:00"]).tolist(), expected)
+        malformed = ["N/A", None, "", "20241331 10:00:00.123", "20240131 10:00:00.12", "2024-01-31T10:00:00+02:00"]
+        self.assertEqual(legacy_times(malformed).tolist(), [NO_START] * len(malformed))
+        self.assertEqual(iso_times(malformed).tolist(), [NO_START] * len(malformed))
+
+    def test_malformed_output_raises(self):
+        broken = os.path.join(self.directory.name, "broken.xml")
+        with open(self.output, 'rb') as output, open(broken, 'wb') as file:
+            file.write(output.read()[:-20])
+        with self.assertRaises(expat.ExpatError):
+            read_output(broken)
+
+    def test_cancelled_read_returns_none(self):
+        self.assertIsNone(read_output(self.output, cancelled=lambda: True))
+        self.assertIsNone(ResultsModel().snapshot(self.output, cancelled=lambda: True))
+
+
+if __name__ == '__main__':
+    unittest.main()
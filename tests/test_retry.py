@@ -0,0 +1,96 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from types import SimpleNamespace
+from robot.api import ExecutionResult
+from utils.results_model import ResultsModel, root_suite_name
+from utils.test_utils import RERUN_OUTPUT, continue_run
+
+FLAKY_SUITE = """*** Settings ***
+Library    OperatingSystem
+
+*** Test Cases ***
+Flaky
+    ${again}=    Run Keyword And Return Status    File Should Exist    ${CURDIR}/marker
+    Create File    ${CURDIR}/marker
+    Should Be True    ${again}
+"""
+PASSING_SUITE = "*** Test Cases ***\nPassing\n    Log    ok\n"
+
+
+class Settings:
+    def __init__(self, **values):
+        self.values = values
+
+    def value(self, key, default=None, type=None):
+        return self.values.get(key, default)
+
+
+class Label:
+    def setText(self, text):
+        self.text = text
+
+    def setStyleSheet(self, style):
+        pass
+
+
+class SynchronousEngine:
+    """Execution engine running each command to completion when started"""
+
+    def __init__(self):
+        self.commands = []
+
+    def start(self, command, cwd, output_path):
+        self.commands.append(command)
+        subprocess.run(command, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        return True
+
+
+class TestRetryFailedTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.sources = []
+        for name, content in (("a.robot", FLAKY_SUITE), ("b.robot", PASSING_SUITE)):
+            path = os.path.join(self.tmp.name, name)
+            with open(path, "w", encoding="utf-8") as suite_file:
+                suite_file.write(content)
+            self.sources.append(path)
+        self.window = SimpleNamespace(
+            settings=Settings(retry_failed=True), results_model=ResultsModel(), resultLabel=Label(),
+            execution_engine=SynchronousEngine(), test_directory=self.tmp.name,
+            output_directory=os.path.join(self.tmp.name, "Results"),
+            run_context={'stage': 'run', 'sources': self.sources, 'processes': "1", 'options': []})
+
+    def test_failures_of_one_source_are_merged_into_the_run_of_all(self):
+        output_path = os.path.join(self.window.output_directory, "output.xml")
+        subprocess.run(["robot", "--outputdir", self.window.output_directory] + self.sources,
+                       cwd=self.tmp.name, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.assertEqual(self.window.results_model.snapshot(output_path).failed, 1)
+
+        self.assertTrue(continue_run(self.window, output_path))
+        self.assertEqual(self.window.run_context['stage'], 'rerun')
+        rerun_output = os.path.join(self.window.output_directory, RERUN_OUTPUT)
+        self.assertEqual(root_suite_name(rerun_output), "A & B")
+
+        self.assertTrue(continue_run(self.window, rerun_output))
+        self.assertEqual(self.window.run_context['stage'], 'merge')
+        result = ExecutionResult(output_path)
+        self.assertEqual(result.suite.name, "A & B")
+        self.assertEqual([(test.name, test.status) for test in result.suite.all_tests],
+                         [("Flaky", "PASS"), ("Passing", "PASS")])
+
+    def test_run_aborted_by_the_watchdog_is_not_retried(self):
+        output_path = os.path.join(self.window.output_directory, "output.xml")
+        subprocess.run(["robot", "--outputdir", self.window.output_directory] + self.sources,
+                       cwd=self.tmp.name, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.window.run_context['aborted'] = "Run exceeded its 1 minute limit"
+
+        self.assertFalse(continue_run(self.window, output_path))
+        self.assertEqual(self.window.execution_engine.commands, [])
+        self.assertEqual(self.window.results_model.snapshot(output_path).failed, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
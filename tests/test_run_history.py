@@ -0,0 +1,87 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from utils.run_history import RunHistory
+from utils.test_records import NO_START, TestRecords, to_epoch_ms
+
+
+def run_tests(start, *results):
+    """TestRecords of (name, status) or (name, status, duration) tests started one second apart"""
+    tests = TestRecords()
+    for position, (name, status, *duration) in enumerate(results):
+        tests.append("Suite", name, status, to_epoch_ms(start) + position * 1000, duration[0] if duration else 1.0,
+                     "boom" if status == 'FAIL' else "")
+    return tests.freeze()
+
+
+class TestRunHistory(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.history = RunHistory(os.path.join(self.directory.name, "history.sqlite"))
+        self.today = datetime.now().replace(microsecond=0) - timedelta(hours=1)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record(self, days_ago, *results, **options):
+        return self.history.record_run(run_tests(self.today - timedelta(days=days_ago), *results), **options)
+
+    def test_runs_keep_their_context_and_counts(self):
+        self.record(400, ("Old", 'PASS'))
+        run_id = self.record(2, ("A", 'PASS'), ("B", 'FAIL'), ("C", 'SKIP'), processes="4", host="ci-01")
+        self.record(1, ("A", 'PASS'))
+        runs = self.history.runs()
+        self.assertEqual([run['timestamp'] for run in runs],
+                         [self.today - timedelta(days=2), self.today - timedelta(days=1)])
+        self.assertEqual(runs[0], {'run_id': run_id, 'timestamp': self.today - timedelta(days=2), 'host': "ci-01",
+                                   'processes': 4, 'total': 3, 'passed': 1, 'failed': 1})
+        self.assertEqual(len(self.history.runs(days=500)), 3)
+
+    def test_run_start_can_be_given(self):
+        started = self.today - timedelta(minutes=5)
+        self.record(30, ("Cached", 'PASS'), started=to_epoch_ms(started))
+        self.assertEqual([run['timestamp'] for run in self.history.runs()], [started])
+
+    def test_flaky_tests_count_status_switches(self):
+        # One letter per test, runs from the oldest one
+        statuses = {'P': 'PASS', 'F': 'FAIL', 'S': 'SKIP'}
+        for days_ago, letters in zip((4, 3, 2, 1), ["PPFS", "PFFS", "PPFF", "PFFP"]):
+            self.record(days_ago, *zip(["Stable", "Flaky", "Broken", "Skipped"], map(statuses.get, letters)))
+        self.assertEqual(self.history.flaky_tests(), [("Suite", "Flaky", 3, 2), ("Suite", "Skipped", 1, 1)])
+        # Only the switches and failures of the last two runs
+        self.assertEqual(self.history.flaky_tests(runs=2), [("Suite", "Flaky", 2, 1), ("Suite", "Skipped", 1, 1)])
+        self.assertEqual(self.history.flaky_tests(limit=1), [("Suite", "Flaky", 3, 2)])
+
+    def test_flaky_tests_take_the_last_runs_by_start_time(self):
+        self.record(2, ("Flaky", 'PASS'))
+        self.record(1, ("Flaky", 'FAIL'))
+        # Imported after the recent runs, so with a larger id
+        self.record(10, ("Flaky", 'PASS'))
+        self.assertEqual(self.history.flaky_tests(runs=2), [("Suite", "Flaky", 1, 1)])
+        self.assertEqual(self.history.flaky_tests(runs=3), [("Suite", "Flaky", 2, 1)])
+
+    def test_durations_of_one_test(self):
+        self.record(5, ("A", 'PASS', 1.5), ("B", 'PASS', 2.0))
+        self.record(2, ("A", 'FAIL', 0.25))
+        tests = TestRecords()
+        tests.append("Suite", "A", 'FAIL', NO_START, 0.0, "no times")
+        self.history.record_run(tests.freeze())
+        self.assertEqual(self.history.durations("Suite", "A"), [(self.today - timedelta(days=5), 1.5),
+                                                                 (self.today - timedelta(days=2), 0.25)])
+        self.assertEqual(self.history.durations("Suite", "A", days=3), [(self.today - timedelta(days=2), 0.25)])
+        self.assertEqual(self.history.durations("Other", "A"), [])
+
+    def test_history_outlives_the_store_and_clears(self):
+        self.record(1, ("A", 'FAIL'))
+        reopened = RunHistory(self.history.path)
+        reopened.record_run(run_tests(self.today, ("A", 'PASS')))
+        self.assertEqual([run['failed'] for run in reopened.runs()], [1, 0])
+        self.assertEqual(reopened.flaky_tests(), [("Suite", "A", 1, 1)])
+        reopened.clear()
+        self.assertEqual(self.history.runs(), [])
+        self.assertEqual(self.history.flaky_tests(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
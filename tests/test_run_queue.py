@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+from utils.run_queue import QUEUE_DIR_NAME, QUEUED, RUNNING, RunJob, RunQueue, parse_variables
+
+
+class RecordingQueue(RunQueue):
+    """Run queue starting no process, jobs are finished by the test"""
+
+    def __init__(self, worker_budget):
+        super().__init__(worker_budget=worker_budget)
+        self.started = []
+
+    def _start(self, job):
+        self.started.append(job.name)
+        self._engines[job.id] = self
+        self._set_state(job, RUNNING)
+
+    def finish(self, name):
+        job = next(job for job in self.jobs if job.name == name)
+        job.started = 0
+        self._engines.pop(job.id)
+        self._set_state(job, "Passed")
+        self._dispatch()
+
+
+def job(name, processes=1, priority=0):
+    return RunJob(name, ["robot"], ".", ".", processes, priority)
+
+
+class TestParseVariables(unittest.TestCase):
+    def test_variables_become_robot_options(self):
+        self.assertEqual(parse_variables("BROWSER:firefox; URL:http://localhost:8080 ;"),
+                         ["--variable", "BROWSER:firefox", "--variable", "URL:http://localhost:8080"])
+
+    def test_invalid_variable(self):
+        with self.assertRaises(ValueError):
+            parse_variables("BROWSER")
+
+
+class TestRunQueue(unittest.TestCase):
+    def test_jobs_run_concurrently_within_the_budget(self):
+        queue = RecordingQueue(worker_budget=3)
+        for name in ("a", "b", "c"):
+            queue.add(job(name, processes=1))
+        self.assertEqual(queue.started, ["a", "b", "c"])
+        self.assertEqual(queue.busy_workers(), 3)
+
+    def test_higher_priority_starts_first(self):
+        queue = RecordingQueue(worker_budget=1)
+        queue.add(job("running"))
+        queue.add(job("low", priority=0))
+        queue.add(job("high", priority=5))
+        queue.add(job("low2", priority=0))
+        queue.finish("running")
+        queue.finish("high")
+        self.assertEqual(queue.started, ["running", "high", "low"])
+
+    def test_waiting_job_is_not_overtaken_by_smaller_ones(self):
+        queue = RecordingQueue(worker_budget=4)
+        queue.add(job("small", processes=2))
+        queue.add(job("large", processes=4))
+        queue.add(job("small2", processes=1))
+        self.assertEqual(queue.started, ["small"])
+        queue.finish("small")
+        self.assertEqual(queue.started, ["small", "large"])
+
+    def test_reserved_workers_and_pause(self):
+        queue = RecordingQueue(worker_budget=2)
+        queue.set_reserved_workers(2)
+        queue.add(job("waiting"))
+        self.assertEqual(queue.jobs[0].state, QUEUED)
+        queue.pause()
+        queue.set_reserved_workers(0)
+        self.assertEqual(queue.started, [])
+        queue.resume()
+        self.assertEqual(queue.started, ["waiting"])
+
+    def test_cancel_queued_job(self):
+        queue = RecordingQueue(worker_budget=1)
+        queue.add(job("running"))
+        queue.add(job("cancelled"))
+        queue.cancel(queue.jobs[1])
+        queue.finish("running")
+        self.assertEqual(queue.started, ["running"])
+        self.assertEqual(queue.pending_count(), 0)
+
+    def test_clear_finished_deletes_their_output_folders(self):
+        with tempfile.TemporaryDirectory() as results:
+            folders = [os.path.join(results, QUEUE_DIR_NAME, name) for name in ("done", "running")]
+            for folder in folders:
+                os.makedirs(folder)
+            queue = RecordingQueue(worker_budget=2)
+            for folder in folders:
+                queue.add(RunJob(os.path.basename(folder), ["robot"], ".", folder, 1))
+            queue.finish("done")
+            queue.clear_finished()
+            self.assertEqual([job.name for job in queue.jobs], ["running"])
+            self.assertEqual(os.listdir(os.path.join(results, QUEUE_DIR_NAME)), ["running"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import json
+import os
+import tempfile
+import unittest
+from utils.scheduling import TimingHistory, format_duration, lpt_partition, lpt_schedule, source_key
+
+
+class TestLptSchedule(unittest.TestCase):
+    def test_longest_jobs_are_dispatched_first(self):
+        order, _ = lpt_schedule({'short': 1, 'long': 10, 'medium': 5}, 2)
+        self.assertEqual(order, ['long', 'medium', 'short'])
+
+    def test_makespan_uses_all_processes(self):
+        _, makespan = lpt_schedule({'a': 5, 'b': 4, 'c': 3, 'd': 3, 'e': 3}, 2)
+        self.assertEqual(makespan, 10)
+        _, makespan = lpt_schedule({'a': 5, 'b': 4, 'c': 3}, 4)
+        self.assertEqual(makespan, 5)
+
+    def test_empty_schedule(self):
+        self.assertEqual(lpt_schedule({}, 3), ([], 0.0))
+
+    def test_partition_follows_worker_capacity(self):
+        shares = lpt_partition({'a': 8, 'b': 4, 'c': 4, 'd': 4, 'e': 4}, [3, 1])
+        self.assertEqual(shares, [['a', 'b', 'd', 'e'], ['c']])
+
+
+class TestTimingHistory(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.history_path = os.path.join(self.tmp.name, "timings.json")
+        self.sources = [os.path.join(self.tmp.name, name) for name in ("slow_suite.robot", "fast_suite.robot", "new_suite.robot")]
+        with open(self.history_path, "w") as history_file:
+            json.dump({'suites': {
+                source_key(self.sources[0]): {'duration': 60.0, 'tests': {'Slow Test': 60.0}},
+                source_key(self.sources[1]): {'duration': 10.0, 'tests': {'Quick A': 4.0, 'Quick B': 6.0}},
+            }}, history_file)
+        self.history = TimingHistory(self.history_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_unknown_suites_use_mean_duration(self):
+        jobs = self.history.estimate_jobs(self.sources)
+        self.assertEqual(jobs["--suite Suites.Slow Suite"], 60.0)
+        self.assertEqual(jobs["--suite Suites.New Suite"], 35.0)
+
+    def test_test_level_jobs(self):
+        jobs = self.history.estimate_jobs(self.sources[1:2], test_level=True)
+        self.assertEqual(jobs, {"--test Fast Suite.Quick A": 4.0, "--test Fast Suite.Quick B": 6.0})
+
+    def test_ordering_file(self):
+        path = self.history.write_ordering_file(self.sources[:2], 2, path=os.path.join(self.tmp.name, "ordering.txt"))
+        with open(path) as ordering_file:
+            self.assertEqual(ordering_file.read().splitlines(), ["--suite Suites.Slow Suite", "--suite Suites.Fast Suite"])
+        self.assertEqual(self.history.predict_makespan(self.sources[:2], 2), 60.0)
+
+    def test_format_duration(self):
+        self.assertEqual(format_duration(42), "42s")
+        self.assertEqual(format_duration(125), "2m 05s")
+        self.assertEqual(format_duration(7260), "2h 01m")
+
+
+if __name__ == "__main__":
+    unittest.main()
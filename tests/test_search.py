@@ -0,0 +1,50 @@
+import os
+import unittest
+from utils.search import SearchIndex
+
+SUITES = {
+    os.path.join("api", "users.robot"): {'name': "Users", 'documentation': "User management API", 'tests': [
+        {'name': "Create User", 'tags': [], 'documentation': "Posts a new user"},
+        {'name': "Delete User", 'tags': [], 'documentation': "Removes it again"},
+    ]},
+    os.path.join("ui", "login.robot"): {'name': "Login", 'documentation': "", 'tests': [
+        {'name': "Valid Login", 'tags': [], 'documentation': ""},
+        {'name': "Invalid Password", 'tags': [], 'documentation': "Shows an error message"},
+        {'name': "Logout", 'tags': [], 'documentation': ""},
+    ]},
+    "empty.robot": {'name': "Empty", 'documentation': "Nothing yet", 'tests': []},
+}
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        for path, info in SUITES.items():
+            self.index.set_suite(path, info)
+
+    def test_words_match_parts_of_test_names_and_documentation(self):
+        self.assertEqual(self.index.search("valid"), {os.path.join("ui", "login.robot"): [0, 1]})
+        self.assertEqual(self.index.search("ERROR mess"), {os.path.join("ui", "login.robot"): [1]})
+        self.assertEqual(self.index.search("zzz"), {})
+        self.assertEqual(self.index.search("  "), {})
+
+    def test_suite_matches_show_all_their_tests(self):
+        self.assertEqual(self.index.search("management"), {os.path.join("api", "users.robot"): None})
+        self.assertEqual(self.index.search("yet"), {"empty.robot": None})
+
+    def test_words_can_match_the_suite_and_the_test(self):
+        self.assertEqual(self.index.search("login pass"), {os.path.join("ui", "login.robot"): [1]})
+        self.assertEqual(self.index.search("api delete"), {os.path.join("api", "users.robot"): [1]})
+
+    def test_updates_reach_cached_short_words(self):
+        self.assertEqual(len(self.index.search("e")), 3)
+        self.index.remove_suite("empty.robot")
+        self.index.set_suite("new.robot", {'name': "New", 'documentation': "", 'tests': [
+            {'name': "Check Cart", 'tags': [], 'documentation': ""}]})
+        self.assertEqual(set(self.index.search("e")), {os.path.join("api", "users.robot"),
+                                                       os.path.join("ui", "login.robot"), "new.robot"})
+        self.assertEqual(self.index.search("ca"), {"new.robot": None})
+
+
+if __name__ == '__main__':
+    unittest.main()
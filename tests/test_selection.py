@@ -0,0 +1,32 @@
+import unittest
+from robot.utils import Matcher
+from utils.selection import escape_pattern, filter_arguments
+
+
+class TestFilterArguments(unittest.TestCase):
+    def patterns(self, args):
+        self.assertEqual(args[::2], ["--test"] * (len(args) // 2))
+        return args[1::2]
+
+    def test_no_filters_run_whole_files(self):
+        self.assertEqual(filter_arguments(["/t/login.robot", "/t/api.robot"], {}), [])
+
+    def test_whole_suites_get_a_pattern_when_another_suite_is_filtered(self):
+        patterns = self.patterns(filter_arguments(
+            ["/t/01__login.robot", "/t/api.robot"], {"/t/api.robot": ["Get User"]}))
+        self.assertEqual(patterns, ["Login.*", "*.Login.*", "Api.Get User", "*.Api.Get User"])
+
+    def test_patterns_match_single_and_multi_source_long_names(self):
+        patterns = self.patterns(filter_arguments(["/t/api.robot"], {"/t/api.robot": ["Get User"]}))
+        for longname in ("Api.Get User", "Suites.Api.Get User"):
+            self.assertTrue(any(Matcher(pattern).match(longname) for pattern in patterns))
+        self.assertFalse(any(Matcher(pattern).match("Suites.Api.Get Users") for pattern in patterns))
+
+    def test_wildcards_in_names_are_matched_literally(self):
+        pattern = escape_pattern("Check [x] * ?")
+        self.assertTrue(Matcher(pattern).match("Check [x] * ?"))
+        self.assertFalse(Matcher(pattern).match("Check x anything !"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from robot.model import TagPatterns
+from utils.tags import TagIndex, normalize_tag, tag_arguments
+
+TESTS = {
+    "Login": ["smoke", "UI Test"],
+    "Logout": ["smoke", "slow", "ui_test"],
+    "Get User": ["api", "P1"],
+    "Delete User": ["api", "slow", "p2"],
+    "Untagged": [],
+}
+
+
+class TestTagIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TagIndex()
+        self.index.set_suite("users.robot", [{'name': name, 'tags': tags} for name, tags in TESTS.items()])
+
+    def names(self, expression):
+        return sorted(name for _, name in self.index.match(expression))
+
+    def test_matches_like_robot_framework(self):
+        for expression in ("smoke", "smokeANDslow", "smokeORapi", "smokeNOTslow", "NOTslow", "p*",
+                           "uitest", "UI TEST & smoke", "apiORsmokeNOTslowNOTp1", "smoke AND", "p?ORsmokeANDslow"):
+            patterns = TagPatterns([expression])
+            expected = sorted(name for name, tags in TESTS.items() if patterns.match(tags))
+            self.assertEqual(self.names(expression), expected, expression)
+
+    def test_and_not_reads_as_not(self):
+        self.assertEqual(self.names("smoke AND NOT slow"), ["Login"])
+        self.assertEqual(self.names("api & NOT slow"), ["Get User"])
+
+    def test_remove_suite_drops_its_tags(self):
+        self.index.set_suite("other.robot", [{'name': "Other", 'tags': ["smoke"]}])
+        self.index.remove_suite("users.robot")
+        self.assertEqual(self.index.match("smoke"), {("other.robot", "Other")})
+        self.assertNotIn(normalize_tag("api"), self.index.by_tag)
+
+    def test_tag_arguments(self):
+        self.assertEqual(tag_arguments("  "), [])
+        self.assertEqual(tag_arguments("smoke AND NOT slow"), ["--include", "smoke", "--exclude", "slow"])
+        self.assertEqual(tag_arguments("NOT slow NOT wip"), ["--exclude", "slow", "--exclude", "wip"])
+        self.assertEqual(tag_arguments("smoke OR api"), ["--include", "smokeORapi"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from datetime import datetime
+import numpy as np
+from utils.test_records import NO_START, TestRecords, from_epoch_ms, to_epoch_ms
+
+TESTS = [
+    ("Login", "PASS", datetime(2024, 5, 1, 10, 0, 0, 125000), 1.5, ""),
+    ("Logout", "FAIL", datetime(2024, 5, 2, 9, 30), 0.25, "Timeout\nafter 10s"),
+    ("Search", "FAIL", datetime(2024, 5, 1, 11, 0), 1.5, "Timeout\nafter 10s"),
+    ("Upload", "SKIP", None, 0.0, "Not ready"),
+    ("Download", "FAIL", datetime(2024, 5, 2, 8, 0), 3.0, "Missing file"),
+]
+
+
+class TestTestRecords(unittest.TestCase):
+    def setUp(self):
+        self.records = TestRecords()
+        for name, status, start, duration, message in TESTS:
+            self.records.append("Suite", name, status, to_epoch_ms(start), duration, message)
+
+    def names(self, rows):
+        return [self.records[row].name for row in rows]
+
+    def test_rows_round_trip_with_interned_strings(self):
+        self.assertEqual(len(self.records), 5)
+        self.assertEqual([tuple(test)[1:] for test in self.records], TESTS)
+        self.assertEqual(self.records.strings.count("Timeout\nafter 10s"), 1)
+        self.assertEqual((self.records.count("FAIL"), self.records.count("PASS"), self.records.count("ERROR")),
+                         (3, 1, 0))
+        self.assertEqual(from_epoch_ms(NO_START), None)
+
+    def test_order_and_top_k_keep_file_order_on_ties(self):
+        timed = self.records.timed()
+        self.assertEqual(self.names(self.records.order('starts', descending=True, mask=timed)),
+                         ["Logout", "Download", "Search", "Login"])
+        self.assertEqual(self.names(self.records.top_k(2)), ["Download", "Login"])
+        self.assertEqual(self.names(self.records.top_k(10, mask=timed)), ["Download", "Login", "Search", "Logout"])
+        self.assertEqual(len(self.records.top_k(0)), 0)
+
+    def test_group_count(self):
+        failures = self.records.status_codes == self.records.status_code("FAIL")
+        keys, counts = self.records.group_count('message_ids', failures)
+        self.assertEqual([self.records.string(key) for key in keys], ["Timeout\nafter 10s", "Missing file"])
+        self.assertEqual(counts.tolist(), [2, 1])
+        days, counts = self.records.group_count('day', self.records.timed())
+        self.assertEqual(counts.tolist(), [2, 2])
+
+    def test_frozen_store_is_read_only_and_exports_a_frame(self):
+        self.records.freeze()
+        with self.assertRaises(ValueError):
+            self.records.durations[0] = 1.0
+        frame = self.records.to_frame()
+        self.assertEqual(frame['Status'].tolist(), [status for _, status, _, _, _ in TESTS])
+        self.assertTrue(np.isnat(frame['Timestamp'].to_numpy()[3]))
+        self.assertEqual(frame['Timestamp'][0], datetime(2024, 5, 1, 10, 0, 0, 125000))
+
+    def test_select_keeps_the_rows_of_a_mask(self):
+        selected = self.records.select(self.records.timed())
+        self.assertEqual(list(selected), [test for test in self.records if test.start is not None])
+        self.assertEqual(selected.count("FAIL"), 3)
+        skipped = self.records.select(self.records.status_codes == self.records.status_code("SKIP"))
+        self.assertEqual([test.name for test in skipped], ["Upload"])
+
+
+if __name__ == '__main__':
+    unittest.main()
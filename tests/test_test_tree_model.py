@@ -0,0 +1,85 @@
+import os
+import unittest
+from PyQt6.QtCore import QModelIndex, Qt
+from widgets.test_tree_model import TestTreeModel
+
+
+def suite(*names):
+    return {'name': "Suite", 'documentation': "", 'tests': [
+        {'name': name, 'tags': [], 'documentation': ""} for name in names]}
+
+
+class TestTestTreeModel(unittest.TestCase):
+    def setUp(self):
+        self.model = TestTreeModel()
+        self.model.set_suite(os.path.join("ui", "login.robot"), suite("Login", "Logout"))
+        self.model.set_suite("b.robot", suite("One", "Two", "Three"), None)
+        self.model.set_suite("a.robot", suite())
+
+    def test_suites_are_listed_in_scan_order_with_their_tests(self):
+        self.assertEqual(self.model.paths(), ["a.robot", "b.robot", os.path.join("ui", "login.robot")])
+        parent = self.model.index(1, 0)
+        self.assertEqual(self.model.rowCount(parent), 3)
+        child = self.model.index(2, 0, parent)
+        self.assertEqual(child.data(), "Three")
+        self.assertEqual(self.model.parent(child), parent)
+        self.assertEqual(self.model.rowCount(self.model.index(0, 0)), 0)
+
+    def test_suite_state_follows_its_tests(self):
+        path = os.path.join("ui", "login.robot")
+        self.assertEqual(self.model.check_state(path), Qt.CheckState.Unchecked)
+        parent = self.model.index(2, 0)
+        self.model.setData(self.model.index(0, 0, parent), Qt.CheckState.Checked.value, Qt.ItemDataRole.CheckStateRole)
+        self.assertEqual(parent.data(Qt.ItemDataRole.CheckStateRole), Qt.CheckState.PartiallyChecked)
+        self.assertEqual(self.model.checked_tests(path), ["Login"])
+        self.model.setData(parent, Qt.CheckState.Checked.value, Qt.ItemDataRole.CheckStateRole)
+        self.assertEqual(self.model.check_state(path), Qt.CheckState.Checked)
+
+    def test_select_all_then_uncheck_one(self):
+        self.model.set_all_checked(True)
+        self.assertEqual([self.model.check_state(path) for path in self.model.paths()], [Qt.CheckState.Checked] * 3)
+        self.model.setData(self.model.index(1, 0, self.model.index(1, 0)), Qt.CheckState.Unchecked.value,
+                           Qt.ItemDataRole.CheckStateRole)
+        self.assertEqual(self.model.checked_tests("b.robot"), ["One", "Three"])
+        self.model.set_all_checked(False)
+        self.assertEqual([self.model.check_state(path) for path in self.model.paths()],
+                         [Qt.CheckState.Unchecked] * 3)
+
+    def test_filter_shows_some_tests_and_checks_only_those(self):
+        self.model.set_filter({"b.robot": [0, 2]})
+        self.assertEqual(self.model.rowCount(), 1)
+        parent = self.model.index(0, 0)
+        self.assertEqual([self.model.index(row, 0, parent).data() for row in range(2)], ["One", "Three"])
+        self.model.setData(parent, Qt.CheckState.Unchecked.value, Qt.ItemDataRole.CheckStateRole)
+        self.assertEqual(self.model.checked_tests("b.robot"), ["Two"])
+        self.model.set_all_checked(True)
+        self.assertEqual(self.model.check_state(os.path.join("ui", "login.robot")), Qt.CheckState.Unchecked)
+        self.model.set_filter(None)
+        self.assertEqual(self.model.rowCount(), 3)
+        self.assertEqual(self.model.check_state("b.robot"), Qt.CheckState.Checked)
+
+    def test_replace_keeps_given_checks_and_remove(self):
+        self.model.set_suite("b.robot", suite("One", "Four"), {"One"})
+        self.assertEqual(self.model.checked_tests("b.robot"), ["One"])
+        self.assertEqual(self.model.rowCount(self.model.index(1, 0)), 2)
+        self.model.remove_suite("a.robot")
+        self.assertEqual(self.model.paths(), ["b.robot", os.path.join("ui", "login.robot")])
+        self.assertEqual(self.model.rowCount(QModelIndex()), 2)
+        self.assertFalse(self.model.contains("a.robot"))
+
+    def test_paths_differing_by_case_are_distinct_suites(self):
+        self.model.set_suite("B.robot", suite("Upper"))
+        self.assertEqual(self.model.paths(), ["a.robot", "B.robot", "b.robot", os.path.join("ui", "login.robot")])
+        parent = self.model.index(1, 0)
+        self.assertEqual(parent.data(), "B.robot")
+        self.assertEqual(self.model.parent(self.model.index(0, 0, parent)), parent)
+        self.model.set_suite_checked("B.robot", True)
+        self.assertEqual(self.model.checked_tests("B.robot"), ["Upper"])
+        self.assertEqual(self.model.checked_tests("b.robot"), ["One", "Two", "Three"])
+        self.model.remove_suite("b.robot")
+        self.assertEqual(self.model.paths(), ["a.robot", "B.robot", os.path.join("ui", "login.robot")])
+        self.assertEqual(self.model.rowCount(self.model.index(1, 0)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from unittest import mock
+from utils.watchdog import RunWatchdog
+
+
+class FakeTimer:
+    def __init__(self):
+        self.active = False
+
+    def start(self):
+        self.active = True
+
+    def stop(self):
+        self.active = False
+
+
+class TestRunWatchdog(unittest.TestCase):
+    """The checks are driven by hand with a fake clock, the timer only has to be started and stopped"""
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("utils.watchdog.time.monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.watchdog = RunWatchdog()
+        self.watchdog.timer = FakeTimer()
+        self.reasons = []
+        self.watchdog.timed_out.connect(self.reasons.append)
+
+    def advance(self, seconds):
+        self.now += seconds
+        self.watchdog._check()
+
+    def test_run_exceeding_its_budget_times_out_once(self):
+        self.watchdog.start(test_timeout=0, run_timeout=120)
+        self.advance(119)
+        self.assertEqual(self.reasons, [])
+        self.advance(2)
+        self.assertEqual(self.reasons, ["Run exceeded its 2 minute limit"])
+        self.assertFalse(self.watchdog.timer.active)
+
+    def test_test_timeout_includes_the_grace_period(self):
+        self.watchdog.start(test_timeout=10)
+        self.watchdog.test_started({'longname': "Suite.Slow"})
+        self.advance(10 + RunWatchdog.GRACE_SECONDS)
+        self.assertEqual(self.reasons, [])
+        self.advance(1)
+        self.assertEqual(self.reasons, ["Test 'Suite.Slow' exceeded its 10 second timeout"])
+
+    def test_robot_timeout_of_a_test_wins_over_the_default(self):
+        self.watchdog.start(test_timeout=10)
+        self.watchdog.test_started({'longname': "Suite.Long", 'timeout': "2 minutes"})
+        self.advance(100)
+        self.assertEqual(self.reasons, [])
+        self.watchdog.test_ended({'longname': "Suite.Long"})
+        self.advance(1000)
+        self.assertEqual(self.reasons, [])
+
+    def test_resumed_stage_only_gets_the_budget_left(self):
+        self.watchdog.start(test_timeout=10, run_timeout=60)
+        self.watchdog.test_started({'longname': "Suite.Hung"})
+        self.advance(40)
+        self.watchdog.stop()
+        self.now += 5
+
+        self.watchdog.resume()
+        self.assertTrue(self.watchdog.timer.active)
+        self.assertEqual(self.watchdog.running_tests, {})
+        self.advance(10)
+        self.assertEqual(self.reasons, [])
+        self.advance(6)
+        self.assertEqual(self.reasons, ["Run exceeded its 1 minute limit"])
+
+    def test_next_run_gets_a_new_budget(self):
+        self.watchdog.start(test_timeout=0, run_timeout=60)
+        self.advance(50)
+        self.watchdog.stop()
+        self.watchdog.start(test_timeout=0, run_timeout=60)
+        self.advance(50)
+        self.assertEqual(self.reasons, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,67 +1,93 @@
 import unittest
 import os
+import tempfile
 from PyQt6.QtWidgets import QApplication
+from PyQt6.QtCore import Qt, QEventLoop, QTimer
 from main import RobotTestRunner
-from PyQt6.QtCore import Qt
+from utils.file_utils import clear_results_directory
+from utils import test_utils
+
+app = QApplication([])
+
+SUITE = "*** Test Cases ***\n{name}\n    Log    {name}\n"
+
+
+def suite(*names):
+    return {'name': "Suite", 'documentation': "", 'tests': [
+        {'name': name, 'tags': [], 'documentation': ""} for name in names]}
 
-app = QApplication([]) 
 
 class TestRobotTestRunner(unittest.TestCase):
     def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
         self.window = RobotTestRunner()
 
+    def tearDown(self):
+        self.window.test_discovery.cancel()
+        self.tmp.cleanup()
+
     def test_initial_ui_state(self):
         self.assertEqual(self.window.label.text(), "Select a folder containing .robot files")
-        self.assertEqual(self.window.resultLabel.text(), "Test Results :")
-        self.assertEqual(self.window.processInput.value(), 2)
+        self.assertEqual(self.window.resultLabel.text(), "Test Results:")
+        self.assertEqual(self.window.test_model.rowCount(), 0)
 
     def test_select_directory(self):
-        test_dir = os.getcwd()
-        self.window.test_directory = test_dir
-        self.window.load_tests()
-        self.assertGreaterEqual(self.window.testList.count(), 0)
+        for name in ("first", "second"):
+            with open(os.path.join(self.tmp.name, f"{name}.robot"), "w") as suite_file:
+                suite_file.write(SUITE.format(name=name))
+        self.window.test_directory = self.tmp.name
+        loop = QEventLoop()
+        self.window.test_discovery.finished.connect(loop.quit)
+        QTimer.singleShot(10000, loop.quit)
+        # Module-level load_tests would be taken for unittest's load_tests protocol
+        test_utils.load_tests(self.window)
+        loop.exec()
+        self.assertEqual(self.window.test_model.paths(), ["first.robot", "second.robot"])
 
     def test_toggle_select_all_tests(self):
-        item1 = self.window.testList.addItem("test1.robot")
-        item2 = self.window.testList.addItem("test2.robot")
-
-        QApplication.processEvents()
+        self.window.test_model.set_suite("test1.robot", suite("One", "Two"))
+        self.window.test_model.set_suite("test2.robot", suite("Three"))
 
         self.window.selectAllCheckBox.setChecked(True)
 
-        for i in range(self.window.testList.count()):
-            self.assertEqual(self.window.testList.item(i).checkState(), Qt.CheckState.Checked)
+        for path in self.window.test_model.paths():
+            self.assertEqual(self.window.test_model.check_state(path), Qt.CheckState.Checked)
 
     def test_run_tests_no_selection(self):
-        self.window.run_tests()
-        self.assertEqual(self.window.resultLabel.text(), "Please select a folder.")
-        self.assertEqual(self.window.resultLabel.styleSheet(), "color: #ad402a")
+        self.window.test_directory = ""
+        test_utils.run_tests(self.window)
+        self.assertEqual(self.window.resultLabel.text(), "Veuillez sélectionner un dossier.")
+        self.assertEqual(self.window.resultLabel.styleSheet(), "color: #ad402a; font: bold")
 
     def test_run_tests_with_selection(self):
-        self.window.testList.addItem("test1.robot")
-        self.window.testList.addItem("test2.robot")
-        
-        QApplication.processEvents()
-        
-        self.window.testList.item(0).setCheckState(Qt.CheckState.Checked)
+        commands = []
+        self.window.execution_engine.start = lambda command, cwd, output_path: commands.append(command) or True
+        self.window.test_directory = self.tmp.name
+        self.window.output_directory = os.path.join(self.tmp.name, "Results")
+        self.window.test_model.set_suite("test1.robot", suite("One"))
+        self.window.test_model.set_suite("test2.robot", suite("Two"))
+        self.window.test_model.set_suite_checked("test1.robot", True)
+
+        self.assertEqual(self.window.test_model.check_state("test1.robot"), Qt.CheckState.Checked)
 
-        self.assertEqual(self.window.testList.item(0).checkState(), Qt.CheckState.Checked)
-        
-        self.window.run_tests()
+        self.assertTrue(test_utils.run_tests(self.window))
+        self.assertEqual(len(commands), 1)
+        self.assertIn(os.path.join(self.tmp.name, "test1.robot"), commands[0])
+        self.assertNotIn(os.path.join(self.tmp.name, "test2.robot"), commands[0])
 
     def test_select_output_directory(self):
-        test_dir = os.getcwd()
+        test_dir = self.tmp.name
         self.window.output_directory = test_dir
         self.window.fileLabel.setText(f"Results stored in: {test_dir}")
         self.assertIn("Results stored in:", self.window.fileLabel.text())
 
     def test_clear_results_directory(self):
-        self.window.output_directory = os.path.join(os.getcwd(), "Results")
+        self.window.output_directory = os.path.join(self.tmp.name, "Results")
         os.makedirs(self.window.output_directory, exist_ok=True)
         with open(os.path.join(self.window.output_directory, "dummy.txt"), "w") as f:
             f.write("test")
 
-        self.window.clear_results_directory()
+        clear_results_directory(self.window)
         self.assertEqual(len(os.listdir(self.window.output_directory)), 0)
         self.assertEqual(self.window.resultLabel.text(), "The Results folder has been emptied")
 
@@ -1,7 +1,6 @@
 import os
 import subprocess
 import platform
-import xml.etree.ElementTree as ET
 import pandas as pd
 from datetime import datetime
 import numpy as np
@@ -44,7 +43,12 @@ class AnalyticsController(QObject):
         self.widget.refresh_button.clicked.connect(lambda: self.data_loader.load_data(force=True))
         self.widget.export_button.clicked.connect(self.export_to_excel)
         self.data_loader.data_loaded.connect(self.update_analytics)
+        self.data_loader.loading_progress.connect(self._show_loading_progress)
+        self.data_loader.data_loaded.connect(lambda data: self.widget.refresh_button.setText(" Refresh Analytics"))
         
+    def _show_loading_progress(self, percent):
+        self.widget.refresh_button.setText(f" Loading... {percent}%")
+
     def update_analytics(self, data):
         try:
             logging.debug(f"Data received - keys: {data.keys()}")
@@ -57,6 +61,8 @@ class AnalyticsController(QObject):
             self._update_test_status_distribution(data)
             self._update_failure_analysis(data)
             self._update_execution_time_analysis(data)
+            self._update_duration_trends(data)
+            self._update_flaky_tests(data)
             
         except Exception as e:
             logging.error(f"Error updating analytics: {str(e)}", exc_info=True)
@@ -74,19 +80,12 @@ class AnalyticsController(QObject):
         
         date_data = defaultdict(lambda: {'passed': 0, 'failed': 0})
         
+        # One entry per recorded run (see RunHistory.runs), with its test counts
         for run in recent_runs:
             try:
-                if isinstance(run['timestamp'], str):
-                    date = datetime.strptime(run['timestamp'], "%Y%m%d %H:%M:%S.%f").date()
-                else:
-                    date = run['timestamp'].date()
-                
-                status = run.get('status', '').upper()
-                
-                if status == 'PASS':
-                    date_data[date]['passed'] += 1
-                elif status == 'FAIL':
-                    date_data[date]['failed'] += 1
+                date = run['timestamp'].date()
+                date_data[date]['passed'] += run['passed']
+                date_data[date]['failed'] += run['failed']
                     
             except Exception as e:
                 logging.warning(f"Error processing run data: {str(e)}")
@@ -164,21 +163,19 @@ class AnalyticsController(QObject):
         ax = self.widget.failure_ax
         ax.clear()
         
-        test_details = data.get('test_details', [])
-        if not test_details:
+        records = data.get('records')
+        if records is None or not records.timed().any():
             self._show_empty_chart(ax, "No test details available")
             self.widget.failure_canvas.draw()
             return
             
+        # Count per distinct message, then merge the messages sharing a first line
+        failures = (records.status_codes == records.status_code('FAIL')) & records.timed()
         failure_messages = defaultdict(int)
-        for test in test_details:
-            if not isinstance(test, dict):
-                continue
-                
-            if test.get('status', '').upper() == 'FAIL' and test.get('message'):
-                message = str(test['message']).split('\n')[0].strip()
-                if message:
-                    failure_messages[message] += 1
+        for message_id, count in zip(*records.group_count('message_ids', failures)):
+            message = records.string(message_id).split('\n')[0].strip()
+            if message:
+                failure_messages[message] += int(count)
         
         if not failure_messages:
             self._show_empty_chart(ax, "No failures with messages")
@@ -215,20 +212,14 @@ class AnalyticsController(QObject):
         ax = self.widget.time_ax
         ax.clear()
         
-        execution_times = data.get('execution_times', [])
-        if not execution_times:
+        records = data.get('records')
+        if records is None or not records.timed().any():
             self._show_empty_chart(ax, "No execution time data")
             self.widget.time_canvas.draw()
             return
             
         try:
-            times = [float(t) for t in execution_times if isinstance(t, (int, float)) or str(t).replace('.', '').isdigit()]
-            if not times:
-                self._show_empty_chart(ax, "No valid time data")
-                self.widget.time_canvas.draw()
-                return
-                
-            times = np.array(times)
+            times = records.durations[records.timed()].astype(np.float64)
             q75, q25 = np.percentile(times, [75, 25])
             iqr = q75 - q25
             upper_bound = q75 + (1.5 * iqr)
@@ -260,6 +251,72 @@ class AnalyticsController(QObject):
         self.widget.time_fig.tight_layout()
         self.widget.time_canvas.draw()
 
+    def _update_duration_trends(self, data):
+        ax = self.widget.duration_ax
+        ax.clear()
+
+        # Durations of the slowest tests of the results in every recorded run (see RunHistory.durations)
+        trends = [(name, durations) for name, durations in data.get('duration_trends', []) if durations]
+        if not trends:
+            self._show_empty_chart(ax, "No duration history available")
+            self.widget.duration_canvas.draw()
+            return
+
+        try:
+            for name, durations in trends:
+                dates, seconds = zip(*durations)
+                label = name[:40] + ('...' if len(name) > 40 else '')
+                ax.plot(mdates.date2num(dates), seconds, marker='o', markersize=3, linewidth=1.5, label=label)
+
+            ax.set_title('Duration Trends of the Slowest Tests', pad=15, fontweight='bold')
+            ax.set_ylabel('Execution Time (seconds)')
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m/%Y'))
+            plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
+            ax.legend(loc='upper left', fontsize=8)
+            ax.grid(True, linestyle='--', alpha=0.3)
+
+        except Exception as e:
+            logging.error(f"Error drawing duration trends: {str(e)}")
+            self._show_empty_chart(ax, "Error displaying duration trends")
+
+        self.widget.duration_fig.tight_layout()
+        self.widget.duration_canvas.draw()
+
+    def _update_flaky_tests(self, data):
+        ax = self.widget.flaky_ax
+        ax.clear()
+
+        # (suite, name, switches, failures) of the tests switching between PASS and FAIL (see RunHistory.flaky_tests)
+        flaky_tests = data.get('flaky_tests', [])
+        if not flaky_tests:
+            self._show_empty_chart(ax, "No flaky test in the last runs")
+            self.widget.flaky_canvas.draw()
+            return
+
+        try:
+            names = [name[:30] + ('...' if len(name) > 30 else '') for _, name, _, _ in flaky_tests]
+            switches = [count for _, _, count, _ in flaky_tests]
+            y_pos = np.arange(len(names))
+            bars = ax.barh(y_pos, switches, color='#f39c12', height=0.6, alpha=0.7)
+
+            for bar, (_, _, _, failures) in zip(bars, flaky_tests):
+                ax.text(bar.get_width() + 0.1, bar.get_y() + bar.get_height()/2,
+                       f'{failures} fail(s)', ha='left', va='center', color='#333333', fontsize=8)
+
+            ax.set_yticks(y_pos)
+            ax.set_yticklabels(names, fontsize=8)
+            ax.invert_yaxis()
+            ax.set_xlabel('PASS/FAIL Switches', labelpad=5)
+            ax.set_title('Flaky Tests', pad=15, fontweight='bold')
+            ax.grid(True, alpha=0.3)
+
+        except Exception as e:
+            logging.error(f"Error drawing flaky tests: {str(e)}")
+            self._show_empty_chart(ax, "Error displaying flaky tests")
+
+        self.widget.flaky_fig.tight_layout()
+        self.widget.flaky_canvas.draw()
+
     def export_to_excel(self):
         """Export analytics data to Excel with robust error handling"""
         try:
@@ -287,8 +344,8 @@ class AnalyticsController(QObject):
                 return
                 
             # Parse test data with improved error handling
-            test_data = self._parse_test_data(output_xml)
-            if not test_data:
+            df = self._parse_test_data(output_xml)
+            if df is None:
                 QMessageBox.warning(self.widget, "Export Error",
                     "No valid test data found to export. Possible reasons:\n"
                     "1. Tests haven't been executed successfully\n"
@@ -296,9 +353,6 @@ class AnalyticsController(QObject):
                     "3. Test cases are missing status information")
                 return
                 
-            # Create DataFrame
-            df = pd.DataFrame(test_data)
-            
             # Export to Excel
             with pd.ExcelWriter(export_path, engine='xlsxwriter') as writer:
                 # Write test results
@@ -327,57 +381,17 @@ class AnalyticsController(QObject):
                               f"Failed to export report:\n{str(e)}")
 
     def _parse_test_data(self, xml_path):
-        """Robust XML parser with comprehensive error handling"""
-        test_data = []
-        
+        """DataFrame of the tests with a status and timing data, None when there are none"""
         try:
-            for event, elem in ET.iterparse(xml_path, events=('end',)):
-                if elem.tag == 'test':
-                    try:
-                        test_name = elem.get('name', 'Unnamed Test')
-                        status = elem.find('status')
-                        
-                        if status is None:
-                            logging.warning(f"Test '{test_name}' has no status element")
-                            continue
-                            
-                        start_str = status.get('starttime', '')
-                        end_str = status.get('endtime', '')
-                        
-                        if not start_str or not end_str:
-                            logging.warning(f"Test '{test_name}' has incomplete timing data")
-                            continue
-                            
-                        try:
-                            start = datetime.strptime(start_str, "%Y%m%d %H:%M:%S.%f")
-                            end = datetime.strptime(end_str, "%Y%m%d %H:%M:%S.%f")
-                            duration = (end - start).total_seconds()
-                            
-                            test_data.append({
-                                'Test Name': test_name,
-                                'Timestamp': start,
-                                'Status': status.get('status', 'UNKNOWN').upper(),
-                                'Duration (s)': duration,
-                                'Message': status.text.strip() if status.text else ""
-                            })
-                            
-                        except ValueError as e:
-                            logging.warning(f"Invalid timestamp format in test '{test_name}': {str(e)}")
-                            continue
-                            
-                    except Exception as e:
-                        logging.error(f"Error parsing test case: {str(e)}")
-                    finally:
-                        elem.clear()
-                        
-        except ET.ParseError as e:
-            logging.error(f"XML parsing error: {str(e)}")
-            return None
+            records = self.data_loader.results_model.snapshot(xml_path).tests
         except Exception as e:
             logging.error(f"Error reading XML file: {str(e)}")
             return None
-            
-        return test_data if test_data else None
+        df = records.to_frame(records.timed())
+        if df.empty:
+            return None
+        df['Status'] = df['Status'].str.upper()
+        return df
 
     def _add_analytics_sheets(self, workbook, df):
         """Add analytics summary sheets to Excel"""
@@ -478,13 +492,16 @@ class AnalyticsController(QObject):
     def _show_empty_state(self):
         """Show empty state for all charts"""
         for ax in [self.widget.trends_ax, self.widget.status_ax, 
-                  self.widget.failure_ax, self.widget.time_ax]:
+                  self.widget.failure_ax, self.widget.time_ax,
+                  self.widget.duration_ax, self.widget.flaky_ax]:
             self._show_empty_chart(ax, "No data available")
         
         self.widget.trends_canvas.draw()
         self.widget.status_canvas.draw()
         self.widget.failure_canvas.draw()
         self.widget.time_canvas.draw()
+        self.widget.duration_canvas.draw()
+        self.widget.flaky_canvas.draw()
 
     def _show_empty_chart(self, ax, message):
         """Display empty chart message"""
@@ -90,6 +90,8 @@ class AnalyticsWidget(QWidget):
         self._create_status_chart()
         self._create_failure_chart()
         self._create_time_chart()
+        self._create_duration_chart()
+        self._create_flaky_chart()
         
         scroll.setWidget(charts_container)
         self.analytics_layout.addWidget(scroll)
@@ -144,4 +146,30 @@ class AnalyticsWidget(QWidget):
         )
         self.time_canvas.setMinimumHeight(300)
         self.charts_layout.addWidget(QLabel("<b style='font-size: 12px;'>Execution Time Distribution</b>"), 2, 1)
-        self.charts_layout.addWidget(self.time_canvas, 3, 1)
\ No newline at end of file
+        self.charts_layout.addWidget(self.time_canvas, 3, 1)
+
+    def _create_duration_chart(self):
+        """Duration trends of the slowest tests (third row left)"""
+        self.duration_fig = Figure(figsize=(10, 4), tight_layout=True, dpi=100)
+        self.duration_ax = self.duration_fig.add_subplot(111)
+        self.duration_canvas = FigureCanvas(self.duration_fig)
+        self.duration_canvas.setSizePolicy(
+            QSizePolicy.Policy.Expanding,
+            QSizePolicy.Policy.Expanding
+        )
+        self.duration_canvas.setMinimumHeight(300)
+        self.charts_layout.addWidget(QLabel("<b style='font-size: 12px;'>Duration Trends</b>"), 4, 0)
+        self.charts_layout.addWidget(self.duration_canvas, 5, 0)
+
+    def _create_flaky_chart(self):
+        """Flaky tests of the last runs (third row right)"""
+        self.flaky_fig = Figure(figsize=(6, 4), tight_layout=True, dpi=100)
+        self.flaky_ax = self.flaky_fig.add_subplot(111)
+        self.flaky_canvas = FigureCanvas(self.flaky_fig)
+        self.flaky_canvas.setSizePolicy(
+            QSizePolicy.Policy.Expanding,
+            QSizePolicy.Policy.Expanding
+        )
+        self.flaky_canvas.setMinimumHeight(300)
+        self.charts_layout.addWidget(QLabel("<b style='font-size: 12px;'>Flaky Tests</b>"), 4, 1)
+        self.charts_layout.addWidget(self.flaky_canvas, 5, 1)
\ No newline at end of file
@@ -1,7 +1,6 @@
 import os
 import subprocess
 import platform
-import xml.etree.ElementTree as ET
 import pandas as pd
 from datetime import datetime
 import numpy as np
@@ -58,10 +57,16 @@ class DashboardController(QObject):
         self.widget.refresh_button.clicked.connect(lambda: self.data_loader.load_data(force=True))
         self.widget.export_button.clicked.connect(self.export_to_excel)
         self.data_loader.data_loaded.connect(self.update_dashboard)
+        self.data_loader.loading_progress.connect(self._show_loading_progress)
+        self.data_loader.data_loaded.connect(lambda data: self.widget.refresh_button.setText(" Refresh Dashboard"))
+        self.data_loader.live_result_added.connect(self.add_live_result)
         
+    def _show_loading_progress(self, percent):
+        self.widget.refresh_button.setText(f" Loading... {percent}%")
+
     def update_dashboard(self, data):
         try:
-            if not data or not data.get('test_details'):
+            if not data or not data['records'].timed().any():
                 self._show_empty_state()
                 return
                 
@@ -73,18 +78,28 @@ class DashboardController(QObject):
             self._update_bar_chart(data)
             
             # Update table with all tests
-            self._update_test_runs_table(data.get('test_details', []))
+            self._update_test_runs_table(data['records'])
             
         except Exception as e:
             print(f"Error updating dashboard: {e}")
             self._show_empty_state()
 
+    def add_live_result(self, test, data):
+        """Incrementally update counters, pie chart and table for one streamed test"""
+        try:
+            self._update_stats_cards(data)
+            self._update_pie_chart(data)
+            self._insert_test_row(0, test)
+        except Exception as e:
+            print(f"Error updating dashboard with live result: {e}")
+
     def _update_stats_cards(self, data):
         """Update the statistic cards"""
         total = data.get('total_tests', 0)
         passed = data.get('passed', 0)
         failed = data.get('failed', 0)
-        exec_times = data.get('execution_times', [])
+        records = data['records']
+        exec_times = records.durations[records.timed()]
 
         # Get references to the card widgets
         total_label = self.widget.total_tests_card.layout().itemAt(1).widget()
@@ -98,7 +113,7 @@ class DashboardController(QObject):
         failed_label.setText(str(failed))
         
         # Calculate average time
-        avg_time = np.mean(exec_times) if exec_times else 0
+        avg_time = float(np.mean(exec_times)) if len(exec_times) else 0
         avg_label.setText(f"{avg_time:.2f}s")
 
     def _update_pie_chart(self, data):
@@ -135,16 +150,14 @@ class DashboardController(QObject):
 
     def _update_bar_chart(self, data):
         """Improved bar chart for execution times"""
-        test_details = data.get('test_details', [])
+        records = data['records']
         self.bar_series.clear()
         self.bar_axis_x.clear()
 
-        if not test_details:
+        top_tests = [records[row] for row in records.top_k(10, mask=records.timed())]
+        if not top_tests:
             self.bar_chart.setTitle("No test runs")
             return
-
-        # Sort by duration and take top 10
-        top_tests = sorted(test_details, key=lambda x: x['duration'], reverse=True)[:10]
         
         bar_set = QBarSet("Execution Time")
         bar_set.setColor(QColor("#3498db"))
@@ -152,9 +165,9 @@ class DashboardController(QObject):
         categories = []
         
         for test in top_tests:
-            bar_set.append(test['duration'])
+            bar_set.append(test.duration)
             # Smart name truncation with ellipsis
-            name = test['name']
+            name = test.name
             if len(name) > 20:
                 name = name[:8] + "..." + name[-8:]
             categories.append(name)
@@ -163,54 +176,60 @@ class DashboardController(QObject):
         self.bar_axis_x.append(categories)
         
         # Configure Y axis with dynamic padding
-        max_duration = max(test['duration'] for test in top_tests)
+        max_duration = top_tests[0].duration
         self.bar_axis_y.setRange(0, max(1, max_duration * 1.15))
         
         # Chart styling
         self.bar_chart.setTitle("Top 10 Longest Running Tests")
         self.bar_chart.setTitleFont(QFont("Arial", 10, QFont.Weight.Bold))
 
-    def _update_test_runs_table(self, test_details):
+    def _update_test_runs_table(self, records):
         """Update the table to show all test runs"""
         self.widget.recent_runs_table.setRowCount(0)
         
-        if not test_details:
-            return
-            
         # Sort by most recent first
-        test_details_sorted = sorted(test_details, key=lambda x: x.get('timestamp', datetime.min), reverse=True)
-        self.widget.recent_runs_table.setRowCount(len(test_details_sorted))
+        rows = records.order('starts', descending=True, mask=records.timed())
+        self.widget.recent_runs_table.setRowCount(len(rows))
         
-        for row, test in enumerate(test_details_sorted):
-            # Test Name
-            name_item = QTableWidgetItem(test.get('name', 'Unnamed Test'))
-            self.widget.recent_runs_table.setItem(row, 0, name_item)
-            
-            # Timestamp
-            timestamp = test.get('timestamp', datetime.min)
-            if isinstance(timestamp, str):
-                time_item = QTableWidgetItem(timestamp)
-            else:
-                time_item = QTableWidgetItem(timestamp.strftime("%Y-%m-%d %H:%M:%S"))
-            self.widget.recent_runs_table.setItem(row, 1, time_item)
-            
-            # Status with color
-            status = test.get('status', 'UNKNOWN')
-            status_item = QTableWidgetItem(status)
-            if status == 'PASS':
-                status_item.setBackground(QColor("#2ecc71"))
-            elif status == 'FAIL':
-                status_item.setBackground(QColor("#e74c3c"))
-            else:
-                status_item.setBackground(QColor("#f39c12"))
-            status_item.setForeground(QColor("#ffffff"))
-            self.widget.recent_runs_table.setItem(row, 2, status_item)
-            
-            # Duration
-            duration = test.get('duration', 0)
-            duration_item = QTableWidgetItem(f"{duration:.2f}s")
-            duration_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
-            self.widget.recent_runs_table.setItem(row, 3, duration_item)
+        for row, index in enumerate(rows):
+            self._set_test_row(row, records.details(index))
+
+    def _insert_test_row(self, row, test):
+        """Insert a single test row without rebuilding the table"""
+        self.widget.recent_runs_table.insertRow(row)
+        self._set_test_row(row, test)
+
+    def _set_test_row(self, row, test):
+        """Fill one table row from a test details entry"""
+        # Test Name
+        name_item = QTableWidgetItem(test.get('name', 'Unnamed Test'))
+        self.widget.recent_runs_table.setItem(row, 0, name_item)
+        
+        # Timestamp
+        timestamp = test.get('timestamp', datetime.min)
+        if isinstance(timestamp, str):
+            time_item = QTableWidgetItem(timestamp)
+        else:
+            time_item = QTableWidgetItem(timestamp.strftime("%Y-%m-%d %H:%M:%S"))
+        self.widget.recent_runs_table.setItem(row, 1, time_item)
+        
+        # Status with color
+        status = test.get('status', 'UNKNOWN')
+        status_item = QTableWidgetItem(status)
+        if status == 'PASS':
+            status_item.setBackground(QColor("#2ecc71"))
+        elif status == 'FAIL':
+            status_item.setBackground(QColor("#e74c3c"))
+        else:
+            status_item.setBackground(QColor("#f39c12"))
+        status_item.setForeground(QColor("#ffffff"))
+        self.widget.recent_runs_table.setItem(row, 2, status_item)
+        
+        # Duration
+        duration = test.get('duration', 0)
+        duration_item = QTableWidgetItem(f"{duration:.2f}s")
+        duration_item.setTextAlignment(Qt.AlignmentFlag.AlignRight)
+        self.widget.recent_runs_table.setItem(row, 3, duration_item)
 
     def export_to_excel(self):
         """Export all test data to Excel and open it"""
@@ -245,45 +264,13 @@ class DashboardController(QObject):
                                   "Please close the previous report before exporting a new one")
                 return
             
-            # Parse XML data
-            tree = ET.parse(output_xml)
-            root = tree.getroot()
-            
             # Prepare data for export
-            test_data = []
-            for test in root.findall('.//test'):
-                test_name = test.get('name', 'Unnamed Test')
-                test_status = test.find('status')
-                
-                if test_status is not None:
-                    try:
-                        start = datetime.strptime(
-                            test_status.get('starttime', '19700101 00:00:00.000'), 
-                            "%Y%m%d %H:%M:%S.%f"
-                        )
-                        end = datetime.strptime(
-                            test_status.get('endtime', '19700101 00:00:00.000'), 
-                            "%Y%m%d %H:%M:%S.%f"
-                        )
-                        duration = (end - start).total_seconds()
-                        
-                        test_data.append({
-                            'Test Name': test_name,
-                            'Timestamp': start,
-                            'Status': test_status.get('status', 'UNKNOWN'),
-                            'Duration (s)': duration,
-                            'Message': test_status.text.strip() if test_status.text else ""
-                        })
-                        
-                    except ValueError as e:
-                        continue
+            records = self.data_loader.results_model.snapshot(output_xml).tests
+            df = records.to_frame(records.timed())
             
-            if not test_data:
+            if df.empty:
                 QMessageBox.warning(self.widget, "Export Error", "No test data found to export")
                 return
-                
-            # Create DataFrame
-            df = pd.DataFrame(test_data)
             
             # Create Excel writer
             with pd.ExcelWriter(export_path, engine='xlsxwriter') as writer:
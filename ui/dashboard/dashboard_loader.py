@@ -1,111 +1,164 @@
 import os
-import xml.etree.ElementTree as ET
+import sqlite3
+import threading
+from xml.parsers import expat
 from datetime import datetime
 from PyQt6.QtCore import QObject, pyqtSignal
+from utils.results_model import ResultsModel
+from utils.test_records import TestRecords, to_epoch_ms
+
+# Slowest tests of the loaded results whose durations across runs are charted
+DURATION_TREND_TESTS = 5
+
+
+def empty_stats():
+    return {
+        'total_tests': 0,
+        'passed': 0,
+        'failed': 0,
+        'records': TestRecords()
+    }
+
+
+def dashboard_stats(snapshot):
+    """Statistics of a results snapshot, as shown by the dashboard and analytics.
+
+    'records' holds the tests as TestRecords; the tests without readable
+    times (see TestRecords.timed) are left out of the charts and table.
+    """
+    return {
+        'total_tests': snapshot.passed + snapshot.failed,
+        'passed': snapshot.passed,
+        'failed': snapshot.failed,
+        'records': snapshot.tests
+    }
+
 
 class DashboardDataLoader(QObject):
     data_loaded = pyqtSignal(dict)
+    loading_progress = pyqtSignal(int)
+    live_result_added = pyqtSignal(dict, dict)
+    # Emitted from the loading thread, delivered in the GUI thread
+    _loaded = pyqtSignal(int, dict)
+    _progress = pyqtSignal(int, int)
     
-    def __init__(self, results_dir=None):
+    def __init__(self, results_dir=None, results_model=None, run_history=None):
         super().__init__()
+        self.results_model = results_model or ResultsModel()
+        self.run_history = run_history
         self.results_dir = None
         self.set_results_dir(results_dir)
-        self.is_loading = False
+        self.generation = 0
+        self.thread = None
+        self.live_stats = self._empty_stats()
+        self._loaded.connect(lambda generation, stats: self._relay(generation, self.data_loaded, stats))
+        self._progress.connect(lambda generation, percent: self._relay(generation, self.loading_progress, percent))
         
     def set_results_dir(self, results_dir):
         """Set the results directory"""
         self.results_dir = results_dir
         
+    def _empty_stats(self):
+        return empty_stats()
+
+    def begin_live_run(self):
+        """Reset the statistics accumulated from live listener events"""
+        # A load still in progress would overwrite the live statistics
+        self.cancel()
+        self.live_stats = self._empty_stats()
+        self.data_loaded.emit(self.live_stats)
+
+    def add_live_result(self, event):
+        """Fold one finished test streamed by the listener into the live statistics"""
+        status = event.get('status', 'UNKNOWN')
+        duration = float(event.get('duration', 0))
+        test = {
+            'name': event.get('name', 'Unnamed Test'),
+            'timestamp': datetime.fromtimestamp(event.get('start', 0)),
+            'status': status,
+            'duration': duration,
+            'message': event.get('message', '').strip()
+        }
+
+        stats = self.live_stats
+        stats['total_tests'] += 1
+        if status == 'PASS':
+            stats['passed'] += 1
+        elif status == 'FAIL':
+            stats['failed'] += 1
+        stats['records'].append(event.get('longname', '').rpartition('.')[0].rpartition('.')[2], test['name'],
+                                status, to_epoch_ms(test['timestamp']), duration, test['message'])
+
+        self.live_result_added.emit(test, stats)
+
+    def is_loading(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def cancel(self):
+        """Drop the load in progress, its thread stops at the next chunk"""
+        self.generation += 1
+
     def load_data(self, force=False):
-        if self.is_loading:
+        """Parse output.xml and read the run history in a worker thread; a newer request cancels the one in progress"""
+        self.cancel()
+        output_xml = None
+
+        if not self.results_dir:
+            print("No results directory configured")
+        elif not os.path.exists(self.results_dir):
+            print(f"Directory doesn't exist: {self.results_dir}")
+        elif not os.path.exists(os.path.join(self.results_dir, "output.xml")):
+            print(f"output.xml not found in: {self.results_dir}")
+        else:
+            output_xml = os.path.join(self.results_dir, "output.xml")
+
+        if output_xml is None and self.run_history is None:
+            self.data_loaded.emit(self._empty_stats())
             return
-            
-        self.is_loading = True
-        stats = {
-            'total_tests': 0,
-            'passed': 0,
-            'failed': 0,
-            'execution_times': [],
-            'test_details': []
-        }
-        
+
+        # Previous runs are shown even once the results folder has been cleared.
+        # A daemon thread like the discovery scanner's rather than a QThreadPool task: the
+        # pool is waited for when the application quits, a daemon thread is not, and the
+        # _loaded/_progress signals already deliver the results in the GUI thread
+        self.thread = threading.Thread(target=self._load, args=(self.generation, output_xml), daemon=True)
+        self.thread.start()
+
+    def _relay(self, generation, signal, *args):
+        """Forward a signal of the loading thread unless a newer request cancelled it"""
+        if generation == self.generation:
+            signal.emit(*args)
+
+    def _load(self, generation, output_xml):
+        stats = self._load_results(generation, output_xml)
+        if stats is None:
+            return
+        if self.run_history is not None:
+            try:
+                stats['recent_test_runs'] = self.run_history.runs()
+                stats['flaky_tests'] = self.run_history.flaky_tests()
+                stats['duration_trends'] = self._duration_trends(stats['records'])
+            except sqlite3.Error as e:
+                print(f"Error reading run history: {e}")
+        self._loaded.emit(generation, stats)
+
+    def _duration_trends(self, records):
+        """[(test name, [(run start, duration)])] of the slowest tests of the loaded results"""
+        trends = []
+        for row in records.top_k(DURATION_TREND_TESTS, mask=records.timed()):
+            test = records[row]
+            trends.append((test.name, self.run_history.durations(test.suite, test.name)))
+        return trends
+
+    def _load_results(self, generation, output_xml):
+        """Statistics of output.xml (empty without one), None when the load was cancelled"""
+        if output_xml is None:
+            return self._empty_stats()
         try:
-            if not self.results_dir:
-                print("No results directory configured")
-                self.data_loaded.emit(stats)
-                return
-                
-            if not os.path.exists(self.results_dir):
-                print(f"Directory doesn't exist: {self.results_dir}")
-                self.data_loaded.emit(stats)
-                return
-                
-            output_xml = os.path.join(self.results_dir, "output.xml")
-            if not os.path.exists(output_xml):
-                print(f"output.xml not found in: {self.results_dir}")
-                self.data_loaded.emit(stats)
-                return
-                
-            tree = ET.parse(output_xml)
-            root = tree.getroot()
-            
-            # Get statistics from statistics section
-            stat_node = root.find('.//statistics/total/stat[@name="All Tests"]')
-            if stat_node is not None:
-                stats['total_tests'] = int(stat_node.find('total').text)
-                stats['passed'] = int(stat_node.find('pass').text)
-                stats['failed'] = int(stat_node.find('fail').text)
-            
-            # Count individual tests if statistics not found
-            if stats['total_tests'] == 0:
-                pass_count = 0
-                fail_count = 0
-                for test in root.findall('.//test'):
-                    status = test.find('status').get('status', 'UNKNOWN')
-                    if status == 'PASS':
-                        pass_count += 1
-                    elif status == 'FAIL':
-                        fail_count += 1
-                stats['total_tests'] = pass_count + fail_count
-                stats['passed'] = pass_count
-                stats['failed'] = fail_count
-            
-            # Get all test details
-            for test in root.findall('.//test'):
-                test_name = test.get('name', 'Unnamed Test')
-                test_status = test.find('status')
-                
-                if test_status is not None:
-                    try:
-                        start = datetime.strptime(
-                            test_status.get('starttime', '19700101 00:00:00.000'), 
-                            "%Y%m%d %H:%M:%S.%f"
-                        )
-                        end = datetime.strptime(
-                            test_status.get('endtime', '19700101 00:00:00.000'), 
-                            "%Y%m%d %H:%M:%S.%f"
-                        )
-                        duration = (end - start).total_seconds()
-                        
-                        stats['execution_times'].append(duration)
-                        stats['test_details'].append({
-                            'name': test_name,
-                            'timestamp': start,
-                            'status': test_status.get('status', 'UNKNOWN'),
-                            'duration': duration,
-                            'message': test_status.text.strip() if test_status.text else ""
-                        })
-                        
-                    except ValueError as e:
-                        continue
-            
-            self.data_loaded.emit(stats)
-            
-        except ET.ParseError as e:
+            snapshot = self.results_model.snapshot(output_xml, lambda percent: self._progress.emit(generation, percent),
+                                                   lambda: generation != self.generation)
+            return None if snapshot is None else dashboard_stats(snapshot)
+        except expat.ExpatError as e:
             print(f"XML parsing error: {e}")
-            self.data_loaded.emit(stats)
         except Exception as e:
             print(f"Error loading dashboard data: {e}")
-            self.data_loaded.emit(stats)
-        finally:
-            self.is_loading = False
\ No newline at end of file
+        return self._empty_stats()
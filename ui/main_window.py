@@ -1,11 +1,13 @@
 # ui/main_window.py
 import os
 import sys
+import time
+from datetime import datetime
 import xml.etree.ElementTree as ET
 import matplotlib
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
-    QListWidget, QCheckBox, QSpinBox, QScrollArea, 
+    QTreeView, QCheckBox, QSpinBox, QScrollArea, 
     QStackedWidget, QMessageBox, QLineEdit, QGroupBox, 
     QFormLayout, QSizePolicy
 )
@@ -16,14 +18,36 @@ from PyQt6.QtGui import QFont
 from ui.logo_splash import LogoSplash
 from ui.styles import apply_styles
 from utils.file_utils import clear_results_directory, select_directory, select_output_directory
-from utils.test_utils import export_results, load_tests, open_log, open_report, run_tests
+from utils.test_utils import (
+    continue_run, enqueue_selection, select_affected_tests, export_results, load_tests, open_log, open_report, restore_first_run_output,
+    run_tests, show_results, update_predicted_duration, update_folder, rescan_folders, show_discovery_progress,
+    finish_discovery, fail_discovery, update_tag_matches, apply_search
+)
+from utils.scheduling import TimingHistory
+from utils.concurrency import ConcurrencyHistory, cpu_count
+from utils.run_queue import RunQueue
+from utils.impact import ImpactIndex
+from utils.result_cache import DEFAULT_MAX_AGE_HOURS, DEFAULT_MAX_SIZE_MB, ResultCache
+from utils.distributed import DistributedRunner
+from utils.discovery import DEFAULT_IGNORE_PATTERNS, DiscoveryIndex, SuiteWatcher, TestDiscovery
+from utils.tags import TagIndex
+from utils.search import SearchIndex
+from utils.results_model import ResultsModel, SnapshotCache
+from utils.run_history import RunHistory
+from utils.test_records import to_epoch_ms
+from utils.execution_engine import TestExecutionEngine
+from utils.live_results import LiveResultServer
+from utils.watchdog import RunWatchdog
 from widgets.sidebar import SideBar
 from widgets.title_bar import TitleBar
+from widgets.test_tree_model import TestTreeModel
 from ui.dashboard.dashboard_loader import DashboardDataLoader
 from ui.dashboard.dashboard_widget import DashboardWidget
 from ui.dashboard.dashboard_controller import DashboardController
 from ui.analytics.analytics_widget import AnalyticsWidget
 from ui.analytics.analytics_controller import AnalyticsController
+from ui.queue.queue_widget import QueueWidget
+from ui.queue.queue_controller import QueueController
 from ui.help.help_widget import HelpWidget
 from ui.help.help_controller import HelpController
 
@@ -38,8 +62,21 @@ class RobotTestRunner(QWidget):
         self.version_label = ""
         self.test_directory = ""
         self.output_directory = ""
+        self.run_context = {}
+        self.scanned_folders = {}
+        self.restore_checks = {}
+        self.tag_index = TagIndex()
+        self.search_index = SearchIndex()
         self.drag_position = QPoint()
         self.settings = QSettings("RobotTestRunner", "RobotTestRunner")
+        self.timing_history = TimingHistory()
+        self.concurrency_history = ConcurrencyHistory()
+        self.impact_index = ImpactIndex()
+        self.result_cache = ResultCache(
+            max_age_hours=self.settings.value("result_cache_max_age", DEFAULT_MAX_AGE_HOURS, type=int),
+            max_size_mb=self.settings.value("result_cache_max_size", DEFAULT_MAX_SIZE_MB, type=int))
+        self.results_model = ResultsModel(SnapshotCache(keep_days=self.settings.value("keep_history", 5, type=int)))
+        self.run_history = RunHistory()
         self._load_config()
         self.init_ui()
         self.show_splash()
@@ -113,6 +150,7 @@ class RobotTestRunner(QWidget):
         self._init_components()
         self._init_dashboard_page()
         self._init_analytics_page()
+        self._init_queue_page()
         self._init_settings_page()
         self._init_help_page()
         self._connect_signals()
@@ -146,11 +184,43 @@ class RobotTestRunner(QWidget):
         self.loadingLabel.setFixedSize(30, 30)
         self.loadingLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.refreshLayout.addWidget(self.loadingLabel)
+
+        self.test_discovery = TestDiscovery(self, DiscoveryIndex())
+        self.test_discovery.found.connect(lambda folder, suites, subfolders: update_folder(self, folder, suites, subfolders))
+        self.test_discovery.progress.connect(lambda folders, suites: show_discovery_progress(self, folders, suites))
+        self.test_discovery.finished.connect(lambda _: finish_discovery(self))
+        self.test_discovery.failed.connect(lambda message: fail_discovery(self, message))
+        # Suites added, edited or removed on disk show up without a refresh
+        self.suite_watcher = SuiteWatcher(self, busy=self.test_discovery.is_running)
+        self.suite_watcher.changed.connect(lambda folders: rescan_folders(self, folders))
         self.layout_horizontal.addLayout(self.refreshLayout)
         self.content_layout.addLayout(self.layout_horizontal)
 
+        # Search filtering the list as you type, and a tag expression narrowing
+        # the checked tests, e.g. "smoke AND NOT slow"
+        tagLayout = QHBoxLayout()
+        self.searchInput = QLineEdit()
+        self.searchInput.setPlaceholderText("Search suites, tests and documentation")
+        self.searchInput.setClearButtonEnabled(True)
+        self.searchInput.textChanged.connect(lambda: apply_search(self))
+        tagLayout.addWidget(self.searchInput)
+        self.tagExpressionInput = QLineEdit()
+        self.tagExpressionInput.setPlaceholderText("Tag expression, e.g. smoke AND NOT slow")
+        self.tagExpressionInput.setToolTip("Runs only the checked tests whose [Tags] match, using Robot Framework's "
+                                           "AND, OR, NOT and * ? wildcards (forwarded as --include/--exclude)")
+        self.tagMatchLabel = QLabel("")
+        tagLayout.addWidget(self.tagExpressionInput)
+        tagLayout.addWidget(self.tagMatchLabel)
+        self.content_layout.addLayout(tagLayout)
+
         # Test list
-        self.testList = QListWidget()
+        # Suite files with their test cases as checkable children, backed by a model
+        # keeping check states in a bitset so the list stays fast with 100k+ tests
+        self.test_model = TestTreeModel(self)
+        self.testList = QTreeView()
+        self.testList.setModel(self.test_model)
+        self.testList.setHeaderHidden(True)
+        self.testList.setUniformRowHeights(True)
         self.content_layout.addWidget(self.testList)
 
         # Parameters
@@ -161,14 +231,63 @@ class RobotTestRunner(QWidget):
         self.processInput.setFixedWidth(50)
         self.processInput.setMinimum(1)
         self.processInput.setMaximum(50)
+        # Auto mode sizes the run from CPU cores, free memory and past runs
+        self.autoProcessCheckBox = QCheckBox("Auto")
+        self.autoProcessCheckBox.setChecked(self.settings.value("auto_processes", False, type=bool))
+        self.processInput.setEnabled(not self.autoProcessCheckBox.isChecked())
+        self.autoProcessCheckBox.toggled.connect(self._on_auto_processes_toggled)
+        self.predictionLabel = QLabel("")
+        # Coalesce bursts of check state changes (e.g. "Select all") into one prediction
+        self.prediction_timer = QTimer(self)
+        self.prediction_timer.setSingleShot(True)
+        self.prediction_timer.setInterval(200)
+        self.prediction_timer.timeout.connect(lambda: update_predicted_duration(self))
+        self.prediction_timer.timeout.connect(lambda: update_tag_matches(self))
+        self.tagExpressionInput.textChanged.connect(lambda: update_tag_matches(self))
+        self.tagExpressionInput.textChanged.connect(self.prediction_timer.start)
+        self.processInput.valueChanged.connect(self.prediction_timer.start)
+        self.test_model.dataChanged.connect(lambda *_: self.prediction_timer.start())
         paramLayout.addWidget(self.processLabel)
         paramLayout.addWidget(self.processInput)
+        paramLayout.addWidget(self.autoProcessCheckBox)
+        paramLayout.addWidget(self.predictionLabel)
         self.content_layout.addLayout(paramLayout)
 
         # Run button
+        self.execution_engine = TestExecutionEngine(self)
+        self.live_results = LiveResultServer(self)
+        self.watchdog = RunWatchdog(self)
+        self.distributed_runner = DistributedRunner(self)
         self.runButton = QPushButton("Run selected tests")
         self.runButton.clicked.connect(self.run_tests_with_update)
-        self.content_layout.addWidget(self.runButton)
+        self.runAffectedButton = QPushButton("Run affected")
+        self.runAffectedButton.setToolTip("Run only the suites whose files or imported resources, "
+                                          "libraries and variable files changed since they last passed")
+        self.runAffectedButton.clicked.connect(self.run_affected_tests)
+        runLayout = QHBoxLayout()
+        runLayout.addWidget(self.runButton)
+        runLayout.addWidget(self.runAffectedButton)
+        self.forceRunCheckBox = QCheckBox("Force run")
+        self.forceRunCheckBox.setToolTip("Run every selected suite, even those with a cached passing result")
+        runLayout.addWidget(self.forceRunCheckBox)
+        self.content_layout.addLayout(runLayout)
+
+        # Run queue controls
+        queueLayout = QHBoxLayout()
+        self.priorityLabel = QLabel("Priority:")
+        self.priorityInput = QSpinBox()
+        self.priorityInput.setRange(-10, 10)
+        self.priorityInput.setFixedWidth(50)
+        self.variablesInput = QLineEdit()
+        self.variablesInput.setPlaceholderText("Variables, e.g. BROWSER:firefox; ENV:staging")
+        self.run_queue = RunQueue(self, self.settings.value("queue_worker_budget", cpu_count(), type=int))
+        self.queueButton = QPushButton("Add to queue")
+        self.queueButton.clicked.connect(lambda: enqueue_selection(self))
+        queueLayout.addWidget(self.priorityLabel)
+        queueLayout.addWidget(self.priorityInput)
+        queueLayout.addWidget(self.variablesInput)
+        queueLayout.addWidget(self.queueButton)
+        self.content_layout.addLayout(queueLayout)
 
         # Results controls
         self.fileLabel = QLabel("Select result storage location:")
@@ -211,7 +330,7 @@ class RobotTestRunner(QWidget):
 
     def _init_dashboard_page(self):
         """Initialize the dashboard page"""
-        self.dashboard_loader = DashboardDataLoader(self.output_directory)
+        self.dashboard_loader = DashboardDataLoader(self.output_directory, self.results_model, self.run_history)
         self.dashboard_page = DashboardWidget()
         self.dashboard_controller = DashboardController(self.dashboard_page, self.dashboard_loader)
         self.stacked_widget.addWidget(self.dashboard_page)
@@ -222,6 +341,12 @@ class RobotTestRunner(QWidget):
         self.analytics_controller = AnalyticsController(self.analytics_page, self.dashboard_loader)
         self.stacked_widget.addWidget(self.analytics_page)
 
+    def _init_queue_page(self):
+        """Initialize the run queue page"""
+        self.queue_page = QueueWidget()
+        self.queue_controller = QueueController(self.queue_page, self.run_queue, self.settings)
+        self.stacked_widget.addWidget(self.queue_page)
+
     def _init_settings_page(self):
         """Initialize settings page with working options"""
         self.settings_page = QWidget()
@@ -245,14 +370,86 @@ class RobotTestRunner(QWidget):
         self.default_timeout.setSuffix(" seconds")
         execution_layout.addRow("Default Test Timeout:", self.default_timeout)
         
+        # Run Timeout
+        self.run_timeout = QSpinBox()
+        self.run_timeout.setRange(0, 1440)
+        self.run_timeout.setValue(self.settings.value("run_timeout", 0, type=int))
+        self.run_timeout.setSuffix(" minutes")
+        self.run_timeout.setSpecialValueText("No limit")
+        execution_layout.addRow("Run Timeout:", self.run_timeout)
+        
         # Retry Failed Tests
         self.retry_failed = QCheckBox("Automatically retry failed tests")
         self.retry_failed.setChecked(self.settings.value("retry_failed", False, type=bool))
         execution_layout.addRow(self.retry_failed)
         
+        # Test Level Split
+        self.test_level_split = QCheckBox("Split parallel runs by test instead of by suite")
+        self.test_level_split.setChecked(self.settings.value("test_level_split", False, type=bool))
+        execution_layout.addRow(self.test_level_split)
+        
         execution_group.setLayout(execution_layout)
         self.settings_layout.addWidget(execution_group)
         
+        # Test Discovery Group
+        discovery_group = QGroupBox("Test Discovery")
+        discovery_layout = QFormLayout()
+        
+        self.discovery_ignore_patterns = QLineEdit(
+            self.settings.value("discovery_ignore_patterns", DEFAULT_IGNORE_PATTERNS, type=str))
+        self.discovery_ignore_patterns.setToolTip("Comma separated names or relative paths, wildcards allowed, "
+                                                  "of folders and files skipped while looking for suites")
+        discovery_layout.addRow("Ignore patterns:", self.discovery_ignore_patterns)
+        
+        discovery_group.setLayout(discovery_layout)
+        self.settings_layout.addWidget(discovery_group)
+        
+        # Result Cache Group
+        cache_group = QGroupBox("Result Cache")
+        cache_layout = QFormLayout()
+        
+        self.result_cache_enabled = QCheckBox("Skip suites that recently passed with unchanged inputs")
+        self.result_cache_enabled.setChecked(self.settings.value("result_cache_enabled", False, type=bool))
+        cache_layout.addRow(self.result_cache_enabled)
+        
+        self.result_cache_max_age = QSpinBox()
+        self.result_cache_max_age.setRange(1, 720)
+        self.result_cache_max_age.setValue(self.settings.value("result_cache_max_age", DEFAULT_MAX_AGE_HOURS, type=int))
+        self.result_cache_max_age.setSuffix(" hours")
+        cache_layout.addRow("Reuse results for:", self.result_cache_max_age)
+        
+        self.result_cache_max_size = QSpinBox()
+        self.result_cache_max_size.setRange(10, 100000)
+        self.result_cache_max_size.setValue(self.settings.value("result_cache_max_size", DEFAULT_MAX_SIZE_MB, type=int))
+        self.result_cache_max_size.setSuffix(" MB")
+        cache_layout.addRow("Maximum cache size:", self.result_cache_max_size)
+        
+        self.clear_cache_button = QPushButton("Clear result cache")
+        self.clear_cache_button.clicked.connect(self._clear_result_cache)
+        cache_layout.addRow(self.clear_cache_button)
+        
+        cache_group.setLayout(cache_layout)
+        self.settings_layout.addWidget(cache_group)
+        
+        # Distributed Execution Group
+        distributed_group = QGroupBox("Distributed Execution")
+        distributed_layout = QFormLayout()
+        
+        self.distributed_enabled = QCheckBox("Run selected tests on remote workers")
+        self.distributed_enabled.setChecked(self.settings.value("distributed_enabled", False, type=bool))
+        distributed_layout.addRow(self.distributed_enabled)
+        
+        self.distributed_workers = QLineEdit(self.settings.value("distributed_workers", "", type=str))
+        self.distributed_workers.setPlaceholderText("host1:8270, host2:8270")
+        distributed_layout.addRow("Workers:", self.distributed_workers)
+        
+        self.distributed_token = QLineEdit(self.settings.value("distributed_token", "", type=str))
+        self.distributed_token.setEchoMode(QLineEdit.EchoMode.Password)
+        distributed_layout.addRow("Token:", self.distributed_token)
+        
+        distributed_group.setLayout(distributed_layout)
+        self.settings_layout.addWidget(distributed_group)
+        
         # UI Settings Group
         ui_group = QGroupBox("Interface Settings")
         ui_layout = QFormLayout()
@@ -287,6 +484,11 @@ class RobotTestRunner(QWidget):
         self.keep_history.setSuffix(" days")
         results_layout.addRow("Keep results history:", self.keep_history)
         
+        self.clear_history_button = QPushButton("Clear run history")
+        self.clear_history_button.setToolTip("Forget the previous runs shown by the analytics trends")
+        self.clear_history_button.clicked.connect(self._clear_run_history)
+        results_layout.addRow(self.clear_history_button)
+        
         results_group.setLayout(results_layout)
         self.settings_layout.addWidget(results_group)
         
@@ -322,7 +524,19 @@ class RobotTestRunner(QWidget):
         # Execution Settings
         self.settings.setValue("subprocess_count", self.default_process_count.value())
         self.settings.setValue("default_timeout", self.default_timeout.value())
+        self.settings.setValue("run_timeout", self.run_timeout.value())
         self.settings.setValue("retry_failed", self.retry_failed.isChecked())
+        self.settings.setValue("test_level_split", self.test_level_split.isChecked())
+        self.settings.setValue("discovery_ignore_patterns", self.discovery_ignore_patterns.text().strip())
+        self.settings.setValue("result_cache_enabled", self.result_cache_enabled.isChecked())
+        self.settings.setValue("result_cache_max_age", self.result_cache_max_age.value())
+        self.settings.setValue("result_cache_max_size", self.result_cache_max_size.value())
+        self.result_cache.max_age_hours = self.result_cache_max_age.value()
+        self.result_cache.max_size_mb = self.result_cache_max_size.value()
+        self.result_cache.evict()
+        self.settings.setValue("distributed_enabled", self.distributed_enabled.isChecked())
+        self.settings.setValue("distributed_workers", self.distributed_workers.text().strip())
+        self.settings.setValue("distributed_token", self.distributed_token.text())
         
         # UI Settings
         self.settings.setValue("font_size", self.font_size.value())
@@ -331,9 +545,12 @@ class RobotTestRunner(QWidget):
         # Results Settings
         self.settings.setValue("auto_open_report", self.auto_open_report.isChecked())
         self.settings.setValue("keep_history", self.keep_history.value())
+        self.results_model.cache.keep_days = self.keep_history.value()
+        self.results_model.cache.evict()
         
         # Update current values in the main interface
-        self.processInput.setValue(self.default_process_count.value())
+        if not self.autoProcessCheckBox.isChecked():
+            self.processInput.setValue(self.default_process_count.value())
         
         # Apply font size changes
         font = QFont()
@@ -342,6 +559,16 @@ class RobotTestRunner(QWidget):
         
         QMessageBox.information(self, "Settings Saved", "Settings have been saved successfully.")
 
+    def _clear_result_cache(self):
+        """Delete every cached suite result"""
+        self.result_cache.clear()
+        QMessageBox.information(self, "Result Cache", "The result cache has been cleared.")
+
+    def _clear_run_history(self):
+        """Delete the recorded runs and their tests"""
+        self.run_history.clear()
+        QMessageBox.information(self, "Run History", "The run history has been cleared.")
+
     def _reset_settings(self):
         """Reset settings to default values"""
         reply = QMessageBox.question(
@@ -357,7 +584,16 @@ class RobotTestRunner(QWidget):
             # Execution Settings
             self.default_process_count.setValue(2)
             self.default_timeout.setValue(300)
+            self.run_timeout.setValue(0)
             self.retry_failed.setChecked(False)
+            self.test_level_split.setChecked(False)
+            self.discovery_ignore_patterns.setText(DEFAULT_IGNORE_PATTERNS)
+            self.result_cache_enabled.setChecked(False)
+            self.result_cache_max_age.setValue(DEFAULT_MAX_AGE_HOURS)
+            self.result_cache_max_size.setValue(DEFAULT_MAX_SIZE_MB)
+            self.distributed_enabled.setChecked(False)
+            self.distributed_workers.clear()
+            self.distributed_token.clear()
             
             # UI Settings
             self.font_size.setValue(10)
@@ -368,6 +604,7 @@ class RobotTestRunner(QWidget):
             self.keep_history.setValue(5)
             
             # Update main interface
+            self.autoProcessCheckBox.setChecked(False)
             self.processInput.setValue(2)
             
             # Reset font size
@@ -378,26 +615,122 @@ class RobotTestRunner(QWidget):
             QMessageBox.information(self, "Settings Reset", "Settings have been reset to default values.")
 
     def run_tests_with_update(self):
-        """Run tests and then update dashboard"""
+        """Start the tests, the dashboard is updated once the run completes"""
         try:
-            # Save process count to settings
-            self.settings.setValue("subprocess_count", self.processInput.value())
+            # Save process count to settings, auto mode recomputes it for every run
+            if not self.autoProcessCheckBox.isChecked():
+                self.settings.setValue("subprocess_count", self.processInput.value())
             
             # Clear old results first
             clear_results_directory(self)
             # Run new tests
             run_tests(self)
-            
-            # Auto-open report if enabled
-            if self.settings.value("auto_open_report", False, type=bool):
-                QTimer.singleShot(1000, lambda: open_report(self))
-            
-            # Only refresh if we're on dashboard or analytics page
-            if not self.content_scroll.isVisible():
-                QTimer.singleShot(2000, self.force_refresh_current_page)
         except Exception as e:
             QMessageBox.warning(self, "Test Execution Error", f"Failed to run tests: {str(e)}")
 
+    def run_affected_tests(self):
+        """Select the suites affected by changes since their last green run and run them"""
+        try:
+            if not select_affected_tests(self):
+                self.resultLabel.setText("No suite affected since the last green run")
+                self.resultLabel.setStyleSheet("color: green")
+                return
+        except OSError as e:
+            QMessageBox.warning(self, "Impact Analysis Error", f"Failed to analyze changes: {str(e)}")
+            return
+        self.run_tests_with_update()
+
+    def _on_tests_started(self):
+        """Lock the run button while tests execute"""
+        self.runButton.setEnabled(False)
+        self.runAffectedButton.setEnabled(False)
+        if self.run_context.get('stage') == 'run':
+            self.resultLabel.setText("Running tests...")
+        self.resultLabel.setStyleSheet("color: none")
+        # Wall-clock start of the run for its history, set by its first stage
+        self.run_context.setdefault('started_at', to_epoch_ms(datetime.now()))
+        # Reruns and merges are follow-up stages of the same run
+        if self.run_context.get('stage') == 'run':
+            self.run_context['started'] = time.monotonic()
+            if not self.run_context.get('distributed'):
+                self.run_queue.set_reserved_workers(int(self.run_context['processes']))
+            self.dashboard_loader.begin_live_run()
+        # The run timeout covers all the stages of a run, not each of them; once it
+        # aborted the run, the merge of the salvaged results is left to finish
+        if self.run_context.get('watched'):
+            if not self.run_context.get('aborted'):
+                self.watchdog.resume()
+        else:
+            self.run_context['watched'] = True
+            self.watchdog.start(
+                self.settings.value("default_timeout", 300, type=int),
+                self.settings.value("run_timeout", 0, type=int) * 60
+            )
+
+    def _on_run_timed_out(self, reason):
+        """Kill the run when the watchdog reports a timeout"""
+        self.resultLabel.setText(f"{reason}, stopping the run...")
+        self.resultLabel.setStyleSheet("color: #ad402a; font: bold")
+        # The salvaged results are shown without retrying their failures
+        self.run_context['aborted'] = reason
+        if self.distributed_runner.is_running():
+            self.distributed_runner.abort(reason)
+        else:
+            self.execution_engine.abort(reason)
+
+    def _on_live_test_started(self, event):
+        """Show which test is currently executing"""
+        stats = self.dashboard_loader.live_stats
+        self.resultLabel.setText(
+            f"Running: {event.get('name', '')} | Passed: {stats['passed']} | Failed: {stats['failed']}"
+        )
+
+    def _on_worker_finished(self, event):
+        """Collect the peak memory of each robot worker for auto concurrency"""
+        if event.get('peak_rss') and 'worker_peaks' in self.run_context:
+            self.run_context['worker_peaks'].append(event['peak_rss'])
+
+    def _on_auto_processes_toggled(self, checked):
+        """Switch between the manual process count and auto mode"""
+        self.settings.setValue("auto_processes", checked)
+        self.processInput.setEnabled(not checked)
+        if not checked:
+            self.processInput.setValue(self.settings.value("subprocess_count", 2, type=int))
+        self.prediction_timer.start()
+
+    def _on_tests_finished(self, output_path):
+        """Show results and refresh pages once output.xml is available"""
+        self.watchdog.stop()
+        if self.run_context.get('stage') == 'run' and 'started' in self.run_context:
+            self.run_context['wall_seconds'] = time.monotonic() - self.run_context.pop('started')
+        if continue_run(self, output_path):
+            return
+        self.run_queue.set_reserved_workers(0)
+        self.runButton.setEnabled(True)
+        self.runAffectedButton.setEnabled(True)
+        show_results(self, output_path)
+        update_predicted_duration(self)
+        
+        # Auto-open report if enabled
+        if self.settings.value("auto_open_report", False, type=bool):
+            open_report(self)
+        
+        # Only refresh if we're on dashboard or analytics page
+        if not self.content_scroll.isVisible():
+            self.force_refresh_current_page()
+
+    def _on_tests_failed(self, message):
+        """Report an execution error"""
+        self.watchdog.stop()
+        if restore_first_run_output(self):
+            print(f"Retrying failed tests aborted: {message}")
+            self._on_tests_finished(os.path.join(self.output_directory, "output.xml"))
+            return
+        self.run_queue.set_reserved_workers(0)
+        self.runButton.setEnabled(True)
+        self.runAffectedButton.setEnabled(True)
+        QMessageBox.critical(self, "Test Execution Error", f"Failed to run tests: {message}")
+
     def force_refresh_current_page(self):
         """Force refresh of the current page"""
         current_widget = self.stacked_widget.currentWidget()
@@ -418,8 +751,21 @@ class RobotTestRunner(QWidget):
         self.sidebar.testSelectionClicked.connect(self.show_main_content)
         self.sidebar.dashboardClicked.connect(self.show_dashboard)
         self.sidebar.analyticsClicked.connect(self.show_analytics)
+        self.sidebar.queueClicked.connect(lambda: self.show_page(self.queue_page))
         self.sidebar.settingsClicked.connect(lambda: self.show_page(self.settings_page))
         self.sidebar.helpClicked.connect(lambda: self.show_page(self.help_page))
+        self.execution_engine.started.connect(self._on_tests_started)
+        self.execution_engine.finished.connect(self._on_tests_finished)
+        self.execution_engine.failed.connect(self._on_tests_failed)
+        self.distributed_runner.started.connect(self._on_tests_started)
+        self.distributed_runner.finished.connect(self._on_tests_finished)
+        self.distributed_runner.failed.connect(self._on_tests_failed)
+        self.live_results.test_started.connect(self._on_live_test_started)
+        self.live_results.test_ended.connect(self.dashboard_loader.add_live_result)
+        self.live_results.test_started.connect(self.watchdog.test_started)
+        self.live_results.test_ended.connect(self.watchdog.test_ended)
+        self.live_results.worker_finished.connect(self._on_worker_finished)
+        self.watchdog.timed_out.connect(self._on_run_timed_out)
 
     def show_dashboard(self):
         """Show dashboard"""
@@ -438,9 +784,7 @@ class RobotTestRunner(QWidget):
         self.stacked_widget.setCurrentWidget(page)
 
     def toggle_select_all_tests(self, state):
-        check_state = Qt.CheckState.Checked if state else Qt.CheckState.Unchecked
-        for i in range(self.testList.count()):
-            self.testList.item(i).setCheckState(check_state)
+        self.test_model.set_all_checked(bool(state))
 
     def show_splash(self):
         self.splash = LogoSplash(self)
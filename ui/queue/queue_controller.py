@@ -0,0 +1,89 @@
+import os
+from PyQt6.QtCore import QObject, Qt
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import QTableWidgetItem
+from utils.run_queue import FAILED, ERROR, PASSED, RUNNING
+from utils.scheduling import format_duration
+
+STATE_COLORS = {
+    PASSED: "#2ecc71",
+    FAILED: "#e74c3c",
+    ERROR: "#e74c3c",
+    RUNNING: "#3498db",
+}
+
+
+class QueueController(QObject):
+    def __init__(self, widget, run_queue, settings):
+        super().__init__()
+        self.widget = widget
+        self.run_queue = run_queue
+        self.settings = settings
+        self.widget.budget_input.setValue(run_queue.worker_budget)
+        self._connect_signals()
+
+    def _connect_signals(self):
+        self.run_queue.job_added.connect(self._refresh)
+        self.run_queue.job_changed.connect(self._refresh)
+        self.widget.budget_input.valueChanged.connect(self._on_budget_changed)
+        self.widget.pause_button.toggled.connect(self._on_pause_toggled)
+        self.widget.cancel_button.clicked.connect(self._cancel_selected)
+        self.widget.report_button.clicked.connect(self._open_selected_report)
+        self.widget.clear_button.clicked.connect(self._clear_finished)
+
+    def _on_budget_changed(self, value):
+        self.settings.setValue("queue_worker_budget", value)
+        self.run_queue.set_worker_budget(value)
+
+    def _on_pause_toggled(self, paused):
+        self.widget.pause_button.setText("Resume queue" if paused else "Pause queue")
+        if paused:
+            self.run_queue.pause()
+        else:
+            self.run_queue.resume()
+        self._refresh()
+
+    def _selected_jobs(self):
+        rows = {index.row() for index in self.widget.jobs_table.selectionModel().selectedRows()}
+        return [self.run_queue.jobs[row] for row in sorted(rows) if row < len(self.run_queue.jobs)]
+
+    def _cancel_selected(self):
+        for job in self._selected_jobs():
+            self.run_queue.cancel(job)
+
+    def _open_selected_report(self):
+        for job in self._selected_jobs():
+            report_path = os.path.join(job.output_directory, "report.html")
+            if os.path.exists(report_path):
+                os.system(f'start "" "{report_path}"')
+
+    def _clear_finished(self):
+        self.run_queue.clear_finished()
+        self._refresh()
+
+    def _refresh(self, _job=None):
+        """Rebuild the jobs table and the queue status line"""
+        table = self.widget.jobs_table
+        table.setRowCount(len(self.run_queue.jobs))
+        for row, job in enumerate(self.run_queue.jobs):
+            duration = format_duration(job.duration) if job.duration else ""
+            values = [job.name, str(job.priority), str(job.processes), job.variables,
+                      job.state, duration, job.summary]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column in (1, 2):
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+                if column == 4 and job.state in STATE_COLORS:
+                    item.setForeground(QColor(STATE_COLORS[job.state]))
+                table.setItem(row, column, item)
+
+        running = len(self.run_queue.running_jobs())
+        waiting = self.run_queue.pending_count()
+        if not running and not waiting:
+            status = "Queue empty"
+        else:
+            status = (f"{running} running, {waiting} waiting | "
+                      f"{self.run_queue.busy_workers()}/{self.run_queue.worker_budget} workers busy")
+        if self.run_queue.paused:
+            status += " | paused"
+        self.widget.status_label.setText(status)
@@ -0,0 +1,53 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, QSpinBox,
+    QTableWidget, QHeaderView, QAbstractItemView
+)
+
+
+class QueueWidget(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.queue_layout = QVBoxLayout()
+        self.setLayout(self.queue_layout)
+        self._init_ui()
+
+    def _init_ui(self):
+        # Queue controls
+        controls_layout = QHBoxLayout()
+        controls_layout.addWidget(QLabel("Worker budget:"))
+        self.budget_input = QSpinBox()
+        self.budget_input.setRange(1, 200)
+        self.budget_input.setToolTip("Maximum number of robot processes running at the same time, "
+                                     "including the run started from Test Selection")
+        controls_layout.addWidget(self.budget_input)
+
+        self.pause_button = QPushButton("Pause queue")
+        self.pause_button.setCheckable(True)
+        controls_layout.addWidget(self.pause_button)
+
+        self.cancel_button = QPushButton("Cancel selected")
+        controls_layout.addWidget(self.cancel_button)
+
+        self.report_button = QPushButton("Open report")
+        controls_layout.addWidget(self.report_button)
+
+        self.clear_button = QPushButton("Clear finished")
+        controls_layout.addWidget(self.clear_button)
+        controls_layout.addStretch()
+        self.queue_layout.addLayout(controls_layout)
+
+        self.status_label = QLabel("Queue empty")
+        self.queue_layout.addWidget(self.status_label)
+
+        # Jobs table
+        self.jobs_table = QTableWidget()
+        self.jobs_table.setColumnCount(7)
+        self.jobs_table.setHorizontalHeaderLabels(
+            ["Name", "Priority", "Processes", "Variables", "Status", "Duration", "Result"])
+        self.jobs_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.jobs_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        header = self.jobs_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        for column in range(1, 7):
+            header.setSectionResizeMode(column, QHeaderView.ResizeMode.ResizeToContents)
+        self.queue_layout.addWidget(self.jobs_table)
@@ -0,0 +1,142 @@
+import ctypes
+import json
+import os
+import sys
+import time
+from utils.resource_utils import app_data_path
+from utils.scheduling import elapsed_seconds, lpt_schedule
+
+MAX_PROCESSES = 50
+# Fraction of the available memory the workers may use, the rest is left to the system
+MEMORY_HEADROOM = 0.8
+# Used until a run reported the peak memory of its workers
+DEFAULT_WORKER_MEMORY = 200 * 1024 * 1024
+# Wall-clock cost of one more worker (robot start-up, output merging)
+WORKER_OVERHEAD_SECONDS = 0.5
+MAX_RECORDED_RUNS = 200
+
+
+def cpu_count():
+    """Number of CPU cores this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0)) or 1
+    return os.cpu_count() or 1
+
+
+def available_memory():
+    """Memory in bytes that can be used without swapping, or None when unknown"""
+    if sys.platform == "win32":
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys
+        return None
+
+    try:
+        with open("/proc/meminfo", "r") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def choose_process_count(durations, cpus, free_memory=None, worker_memory=DEFAULT_WORKER_MEMORY,
+                         max_processes=MAX_PROCESSES):
+    """Pick the worker count with the shortest predicted wall-clock time.
+
+    ``durations`` maps pabot execution items to their expected duration. The
+    count is bounded by the CPU cores, by the number of workers fitting in
+    ``free_memory`` and by the number of items. Returns the count and its
+    predicted makespan.
+    """
+    limit = min(max_processes, cpus, max(1, len(durations)))
+    if free_memory:
+        limit = min(limit, int(free_memory * MEMORY_HEADROOM // max(1, worker_memory)))
+    limit = max(1, limit)
+
+    best_count, best_makespan, best_cost = 1, 0.0, None
+    for count in range(1, limit + 1):
+        _, makespan = lpt_schedule(durations, count)
+        cost = makespan + count * WORKER_OVERHEAD_SECONDS
+        if best_cost is None or cost < best_cost:
+            best_count, best_makespan, best_cost = count, makespan, cost
+    return best_count, best_makespan
+
+
+def serial_seconds(suite):
+    """Sum of the durations of the file based suites, i.e. the time of a serial run"""
+    if suite.source and os.path.isfile(str(suite.source)):
+        return elapsed_seconds(suite)
+    return sum(serial_seconds(child) for child in suite.suites)
+
+
+class ConcurrencyHistory:
+    """Peak worker memory and the process count and speedup of every run"""
+
+    SMOOTHING = 0.5
+
+    def __init__(self, path=None):
+        self.path = path or app_data_path("concurrency.json")
+        self.worker_peak = 0
+        self.runs = []
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as history_file:
+                data = json.load(history_file)
+            self.worker_peak = data.get('worker_peak', 0)
+            self.runs = data.get('runs', [])
+        except (OSError, ValueError):
+            self.worker_peak = 0
+            self.runs = []
+
+    def save(self):
+        try:
+            with open(self.path, "w", encoding="utf-8") as history_file:
+                json.dump({'worker_peak': self.worker_peak, 'runs': self.runs}, history_file)
+        except OSError as e:
+            print(f"Error saving concurrency history: {e}")
+
+    def worker_memory(self):
+        """Expected peak memory in bytes of one robot worker"""
+        return self.worker_peak or DEFAULT_WORKER_MEMORY
+
+    def record_worker_peaks(self, peaks):
+        """Record the peak RSS reported by the workers of one run"""
+        if not peaks:
+            return
+        peak = max(peaks)
+        if self.worker_peak:
+            # Follow growth at once but forget an unusually heavy run slowly
+            peak = max(peak, self.SMOOTHING * peak + (1 - self.SMOOTHING) * self.worker_peak)
+        self.worker_peak = int(peak)
+
+    def record_run(self, processes, auto, wall_seconds, serial):
+        """Record the process count of a run and the speedup it achieved"""
+        speedup = serial / wall_seconds if wall_seconds > 0 else 0.0
+        self.runs.append({
+            'time': time.time(),
+            'processes': int(processes),
+            'auto': bool(auto),
+            'duration': round(wall_seconds, 3),
+            'serial': round(serial, 3),
+            'speedup': round(speedup, 2),
+        })
+        del self.runs[:-MAX_RECORDED_RUNS]
+        self.save()
+        return speedup
+
+    def last_run(self):
+        return self.runs[-1] if self.runs else None
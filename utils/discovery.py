@@ -0,0 +1,406 @@
+import fnmatch
+import json
+import os
+import sqlite3
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+from robot.running import TestSuite
+from utils.impact import SECTION_HEADER, split_cells
+from utils.resource_utils import app_data_path
+from utils.scheduling import source_key
+
+# Robot Framework itself skips names starting with "." or "_" when running a directory
+DEFAULT_IGNORE_PATTERNS = ".*, _*, __pycache__, Results, pabot_results, node_modules, venv"
+SUITE_EXTENSIONS = (".robot",)
+INDEX_VERSION = 2
+# Reading files dominates on network drives, parsing overlaps it in a few threads
+PARSE_WORKERS = 8
+# Folders whose files are still being parsed, waiting to be reported in order
+MAX_PENDING_FOLDERS = 64
+# Kept well below the usual inotify limit (8192 per user on older systems) and Windows handle limits
+MAX_WATCHES = 4000
+# Parsed files are written to the index in batches of this size
+COMMIT_EVERY = 500
+
+
+def parse_patterns(text):
+    """Turn "pattern, pattern; pattern" into a list of glob patterns"""
+    return [pattern.strip() for pattern in text.replace(";", ",").split(",") if pattern.strip()]
+
+
+def is_ignored(name, relative, patterns):
+    """True when the file name or its path relative to the root matches a pattern"""
+    relative = relative.replace(os.sep, "/")
+    return any(fnmatch.fnmatch(name, pattern) or fnmatch.fnmatch(relative, pattern) for pattern in patterns)
+
+
+def scan_suites(root, patterns=(), excluded=(), cancelled=lambda: False, folders=("",), known=None):
+    """Walk folders depth first and yield (folder, [(suite file, stat)], [sub folder]) per folder.
+
+    Paths are relative to the root and come out in sorted order, files of a
+    folder before its sub folders. Sub folders in ``known`` are listed but
+    not entered, so changed folders can be rescanned without walking the
+    whole tree. Symlinked folders are not followed so link loops cannot
+    hang the scan.
+    """
+    excluded = {os.path.normcase(os.path.abspath(path)) for path in excluded if path}
+    pending = list(reversed(folders))
+    while pending and not cancelled():
+        relative_dir = pending.pop()
+        directory = os.path.join(root, relative_dir)
+        try:
+            with os.scandir(directory) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name.lower())
+        except OSError as e:
+            if not relative_dir:
+                raise
+            # A folder removed since it was reported changed is dropped by its parent's rescan
+            if not isinstance(e, FileNotFoundError):
+                print(f"Cannot scan {directory}: {e}")
+            continue
+
+        files, subfolders = [], []
+        for entry in entries:
+            relative = os.path.join(relative_dir, entry.name)
+            if is_ignored(entry.name, relative, patterns):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if os.path.normcase(os.path.abspath(entry.path)) not in excluded:
+                        subfolders.append(relative)
+                elif entry.name.lower().endswith(SUITE_EXTENSIONS) and entry.is_file():
+                    files.append((relative, entry.stat()))
+            except OSError:
+                continue
+        # Reversed so the stack pops the folders in sorted order
+        pending.extend(reversed([folder for folder in subfolders if known is None or folder not in known]))
+        yield relative_dir, files, subfolders
+
+
+def parse_suite_file(path):
+    """Return the suite name, documentation and tests (name, tags, documentation) of a suite file.
+
+    A line scanner rather than the Robot Framework parser, several times
+    faster on large trees. Tags are taken as written, variables in them
+    are not resolved.
+    """
+    with open(path, "rb") as data_file:
+        text = data_file.read().decode("utf-8", errors="replace")
+
+    info = {'name': TestSuite.name_from_source(path), 'documentation': "", 'tests': []}
+    test_tags, default_tags = [], []
+    section, test = "", None
+    # Where the values of a "..." continuation line go: ("tags", list) or ("documentation", dict)
+    target = None
+    for line in text.splitlines():
+        header = SECTION_HEADER.match(line)
+        if header:
+            section, test, target = header.group(1).lower(), None, None
+            continue
+        if not line.strip():
+            continue
+        indented, cells = split_cells(line)
+        if not cells:
+            continue
+
+        if cells[0] == "...":
+            if target and target[0] == "tags":
+                target[1].extend(cells[1:])
+            elif target:
+                target[1]['documentation'] += "\n" + " ".join(cells[1:])
+            continue
+        target = None
+        setting = cells[0].lower()
+
+        if section.startswith("setting") and not indented:
+            if setting == "documentation":
+                info['documentation'] = " ".join(cells[1:])
+                target = ("documentation", info)
+            elif setting in ("test tags", "force tags", "task tags"):
+                test_tags.extend(cells[1:])
+                target = ("tags", test_tags)
+            elif setting == "default tags":
+                default_tags.extend(cells[1:])
+                target = ("tags", default_tags)
+        elif section.startswith(("test case", "task")):
+            if not indented:
+                test = {'name': cells[0], 'tags': None, 'documentation': ""}
+                info['tests'].append(test)
+            elif test is not None and setting == "[tags]":
+                test['tags'] = cells[1:]
+                target = ("tags", test['tags'])
+            elif test is not None and setting == "[documentation]":
+                test['documentation'] = " ".join(cells[1:])
+                target = ("documentation", test)
+
+    for test in info['tests']:
+        tags = test_tags + (test['tags'] if test['tags'] is not None else default_tags)
+        test['tags'] = list(dict.fromkeys(tag for tag in tags if tag != "NONE"))
+    return info
+
+
+class DiscoveryIndex:
+    """SQLite index of parsed suite files, reused while a file's size and mtime are unchanged.
+
+    A connection must only be used by the thread that opened it.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or app_data_path("discovery_index.sqlite")
+
+    def open(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        if connection.execute("PRAGMA user_version").fetchone()[0] != INDEX_VERSION:
+            connection.executescript(f"""
+                DROP TABLE IF EXISTS files;
+                DROP TABLE IF EXISTS tests;
+                CREATE TABLE files (path TEXT PRIMARY KEY, mtime INTEGER, size INTEGER,
+                                    name TEXT, documentation TEXT);
+                CREATE TABLE tests (path TEXT, position INTEGER, name TEXT, tags TEXT, documentation TEXT,
+                                    PRIMARY KEY (path, position));
+                PRAGMA user_version = {INDEX_VERSION};
+            """)
+        return connection
+
+    def load(self, connection, root):
+        """Return {path: (mtime, size, info)} of the indexed files under root"""
+        prefix = os.path.join(source_key(root), "")
+        arguments = (len(prefix), prefix)
+        files = {}
+        for path, mtime, size, name, documentation in connection.execute(
+                "SELECT path, mtime, size, name, documentation FROM files WHERE substr(path, 1, ?) = ?", arguments):
+            files[path] = (mtime, size, {'name': name, 'documentation': documentation, 'tests': []})
+        for path, name, tags, documentation in connection.execute(
+                "SELECT path, name, tags, documentation FROM tests WHERE substr(path, 1, ?) = ? "
+                "ORDER BY path, position", arguments):
+            if path in files:
+                files[path][2]['tests'].append({'name': name, 'tags': json.loads(tags), 'documentation': documentation})
+        return files
+
+    def store(self, connection, path, mtime, size, info):
+        connection.execute("DELETE FROM tests WHERE path = ?", (path,))
+        connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                           (path, mtime, size, info['name'], info['documentation']))
+        connection.executemany("INSERT INTO tests VALUES (?, ?, ?, ?, ?)", [
+            (path, position, test['name'], json.dumps(test['tags']), test['documentation'])
+            for position, test in enumerate(info['tests'])])
+
+    def remove(self, connection, paths):
+        for path in paths:
+            connection.execute("DELETE FROM tests WHERE path = ?", (path,))
+            connection.execute("DELETE FROM files WHERE path = ?", (path,))
+
+
+class TestDiscovery(QObject):
+    """Scans a test directory in a worker thread and reports suites as they are found.
+
+    ``found`` is emitted once per scanned folder with the folder, its
+    (relative path, suite info) pairs and its sub folders. With an index
+    only the files whose size or mtime changed since the last scan are
+    parsed.
+    """
+    found = pyqtSignal(str, list, list)
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(int)
+    failed = pyqtSignal(str)
+
+    # Emitted from the worker thread, delivered in the GUI thread
+    _found = pyqtSignal(int, str, list, list)
+    _progress = pyqtSignal(int, int, int)
+    _finished = pyqtSignal(int, int)
+    _failed = pyqtSignal(int, str)
+
+    def __init__(self, parent=None, index=None):
+        super().__init__(parent)
+        self.index = index
+        self.generation = 0
+        self.thread = None
+        self._found.connect(lambda generation, folder, suites, subfolders:
+                            self._relay(generation, self.found, folder, suites, subfolders))
+        self._progress.connect(lambda generation, folders, suites: self._relay(generation, self.progress, folders, suites))
+        self._finished.connect(lambda generation, count: self._relay(generation, self.finished, count))
+        self._failed.connect(lambda generation, message: self._relay(generation, self.failed, message))
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, root, patterns=(), excluded=(), folders=None, known=None):
+        """Scan root, or only the given folders, abandoning any scan still running"""
+        self.generation += 1
+        self.thread = threading.Thread(target=self._scan, args=(
+            self.generation, root, list(patterns), list(excluded), folders, known), daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.generation += 1
+
+    def _relay(self, generation, signal, *args):
+        # Results of a scan that was restarted or cancelled are dropped
+        if generation == self.generation:
+            signal.emit(*args)
+
+    def _scan(self, generation, root, patterns, excluded, folders, known):
+        cancelled = lambda: generation != self.generation
+        full = folders is None
+        folders = [""] if full else folders
+        counts = {'folders': 0, 'suites': 0, 'parsed': 0}
+        connection = self.index.open() if self.index else None
+        try:
+            indexed = {}
+            for folder in folders if connection else ():
+                indexed.update(self.index.load(connection, os.path.join(root, folder)))
+            seen = set()
+            with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+                pending = deque()
+                for folder, files, subfolders in scan_suites(root, patterns, excluded, cancelled, folders, known):
+                    entries = []
+                    for relative, stat in files:
+                        path = os.path.join(root, relative)
+                        key = source_key(path)
+                        seen.add(key)
+                        cached = indexed.get(key)
+                        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                            entries.append((relative, key, stat, cached[2]))
+                        else:
+                            entries.append((relative, key, stat, executor.submit(self._parse, path)))
+                    pending.append((folder, entries, subfolders))
+                    # Folders are reported in scan order once their files are parsed
+                    while pending and (len(pending) > MAX_PENDING_FOLDERS or self._parsed_all(pending[0][1])):
+                        self._report(generation, connection, pending.popleft(), counts)
+                while pending:
+                    self._report(generation, connection, pending.popleft(), counts)
+            if connection:
+                if full and not cancelled():
+                    self.index.remove(connection, set(indexed) - seen)
+                connection.commit()
+        except (OSError, sqlite3.Error) as e:
+            self._failed.emit(generation, f"Cannot scan {root}: {e}")
+            return
+        finally:
+            if connection:
+                connection.close()
+        self._finished.emit(generation, counts['suites'])
+
+    def _parsed_all(self, entries):
+        return all(not isinstance(info, Future) or info.done() for _, _, _, info in entries)
+
+    def _report(self, generation, connection, pending_folder, counts):
+        folder, entries, subfolders = pending_folder
+        found = []
+        for relative, key, stat, info in entries:
+            if isinstance(info, Future):
+                info = info.result()
+                if connection:
+                    self.index.store(connection, key, stat.st_mtime_ns, stat.st_size, info)
+                    counts['parsed'] += 1
+                    if counts['parsed'] % COMMIT_EVERY == 0:
+                        connection.commit()
+            found.append((relative, info))
+        counts['folders'] += 1
+        counts['suites'] += len(found)
+        self._found.emit(generation, folder, found, subfolders)
+        self._progress.emit(generation, counts['folders'], counts['suites'])
+
+    def _parse(self, path):
+        try:
+            return parse_suite_file(path)
+        except Exception as e:
+            print(f"Cannot parse {path}: {e}")
+            return {'name': TestSuite.name_from_source(path), 'documentation': "", 'tests': []}
+
+
+class SuiteWatcher(QObject):
+    """Reports the folders of the test directory whose suites changed, debounced.
+
+    Folders and their suite files are watched (a folder watch alone misses
+    files edited in place on Linux) until ``max_watches`` paths are used.
+    Folders that did not fit in the budget are rescanned periodically.
+    """
+    changed = pyqtSignal(list)
+
+    DEBOUNCE_MS = 500
+    POLL_MS = 30000
+
+    def __init__(self, parent=None, max_watches=MAX_WATCHES, busy=lambda: False):
+        super().__init__(parent)
+        self.max_watches = max_watches
+        self.busy = busy
+        self.root = ""
+        self.watched = {}
+        self.polled = set()
+        self.dirty = set()
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(lambda path: self._on_changed(path))
+        self.watcher.fileChanged.connect(lambda path: self._on_changed(os.path.dirname(path)))
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.setInterval(self.DEBOUNCE_MS)
+        self.debounce.timeout.connect(self._flush)
+        self.poll = QTimer(self)
+        self.poll.setInterval(self.POLL_MS)
+        self.poll.timeout.connect(lambda: self._mark(self.polled))
+
+    def watch(self, root):
+        """Forget every watch and start over on root"""
+        paths = self.watcher.files() + self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
+        self.root = root
+        self.watched = {}
+        self.polled = set()
+        self.dirty = set()
+        self.debounce.stop()
+        self.poll.stop()
+
+    def watch_count(self):
+        return sum(len(paths) for paths in self.watched.values())
+
+    def add_folder(self, folder, files):
+        """Watch a scanned folder and its suite files, replacing the watches of its previous scan"""
+        wanted = [os.path.join(self.root, folder)] + [os.path.join(self.root, path) for path in files]
+        previous = self.watched.pop(folder, set())
+        stale = previous - set(wanted)
+        if stale:
+            # Qt already dropped the watches of deleted files
+            stale &= self._watched_paths()
+            if stale:
+                self.watcher.removePaths(list(stale))
+        budget = self.max_watches - self.watch_count()
+        kept = previous & set(wanted)
+        added = [path for path in wanted if path not in kept][:max(0, budget - len(kept))]
+        failed = set(self.watcher.addPaths(added)) if added else set()
+        self.watched[folder] = kept | (set(added) - failed)
+        if len(self.watched[folder]) < len(wanted):
+            self.polled.add(folder)
+            if not self.poll.isActive():
+                self.poll.start()
+        else:
+            self.polled.discard(folder)
+
+    def remove_folder(self, folder):
+        paths = [path for path in self.watched.pop(folder, ()) if path in self._watched_paths()]
+        if paths:
+            self.watcher.removePaths(paths)
+        self.polled.discard(folder)
+
+    def _watched_paths(self):
+        return set(self.watcher.files()) | set(self.watcher.directories())
+
+    def _on_changed(self, path):
+        folder = os.path.relpath(path, self.root)
+        self._mark([] if folder.startswith("..") else ["" if folder == "." else folder])
+
+    def _mark(self, folders):
+        self.dirty.update(folders)
+        if self.dirty:
+            self.debounce.start()
+
+    def _flush(self):
+        # A scan in progress would be abandoned, report once it is done
+        if self.busy():
+            self.debounce.start()
+            return
+        folders, self.dirty = sorted(self.dirty), set()
+        self.changed.emit(folders)
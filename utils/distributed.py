@@ -0,0 +1,474 @@
+"""Coordinator/worker execution of suites across several hosts.
+
+Workers listen on TCP (see ``distributed.py worker``). The coordinator
+sends each worker a zip of the test directory and the suites it must run,
+the worker runs them with robot or pabot and sends back its output.xml,
+and the coordinator combines the outputs into one output.xml, log and
+report. Every request is one JSON header line, optionally followed by a
+binary payload of ``size`` bytes.
+"""
+import hmac
+import io
+import ipaddress
+import json
+import os
+import select
+import socket
+import socketserver
+import subprocess
+import tempfile
+import threading
+import time
+import weakref
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QObject, pyqtSignal
+from robot.api import ExecutionResult
+from utils.concurrency import cpu_count
+from utils.output_watcher import is_output_finalized
+from utils.process_utils import kill_process_tree
+from utils.resource_utils import resource_path
+from utils.scheduling import PABOT_MULTI_SOURCE_NAME, lpt_partition
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 8270
+CONNECT_TIMEOUT = 5
+CHUNK_SIZE = 1024 * 1024
+# Limits of a received message, checked before anything is read into memory
+MAX_HEADER_BYTES = 64 * 1024
+MAX_PAYLOAD_BYTES = 1024 * 1024 * 1024
+# Time a worker gets past the run budget to send its output back
+RESULT_GRACE_SECONDS = 60
+# How often a worker checks its run against its budget and its coordinator
+WAIT_POLL_SECONDS = 1
+# Never shipped to the workers
+EXCLUDED_DIRS = {"__pycache__", "Results", "pabot_results"}
+# The only options a worker passes on to robot/pabot, each followed by its value: listeners,
+# modifiers or a python path sent by a coordinator would run arbitrary code on the worker
+WORKER_OPTIONS = {"--variable", "--test", "--include", "--exclude", "--loglevel"}
+
+
+class DistributedError(Exception):
+    pass
+
+
+def parse_workers(text):
+    """Turn "host:port, host" into (host, port) tuples"""
+    workers = []
+    for entry in text.replace(";", ",").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        host, _, port = entry.rpartition(":") if ":" in entry else (entry, "", str(DEFAULT_PORT))
+        try:
+            workers.append((host or "127.0.0.1", int(port)))
+        except ValueError:
+            raise DistributedError(f"Invalid worker address '{entry}', expected host:port")
+    return workers
+
+
+def worker_options(options):
+    """Check that the options sent to a worker only select tests or set variables"""
+    options = [str(option) for option in options]
+    if len(options) % 2:
+        raise DistributedError("Worker options must be option and value pairs")
+    for option in options[::2]:
+        if option not in WORKER_OPTIONS:
+            raise DistributedError(f"Option {option!r} is not allowed on workers")
+    return options
+
+
+def header_seconds(header, key):
+    """A duration of a request header, in seconds; 0 when absent"""
+    value = header.get(key) or 0
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise DistributedError(f"{key} must be a whole number of seconds, got {value!r}")
+    return value
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def send_message(connection, header, payload=b""):
+    header = dict(header, size=len(payload))
+    connection.sendall((json.dumps(header) + "\n").encode("utf-8"))
+    if payload:
+        connection.sendall(payload)
+
+
+def receive_header(stream):
+    """Read one header line from a binary file-like stream, checking the size of its payload"""
+    line = stream.readline(MAX_HEADER_BYTES + 1)
+    if not line:
+        raise DistributedError("Connection closed by peer")
+    if len(line) > MAX_HEADER_BYTES:
+        raise DistributedError(f"Message header exceeds {MAX_HEADER_BYTES} bytes")
+    header = json.loads(line.decode("utf-8"))
+    if not isinstance(header, dict):
+        raise DistributedError("Message header must be a JSON object")
+    size = header.get('size', 0)
+    if isinstance(size, bool) or not isinstance(size, int) or not 0 <= size <= MAX_PAYLOAD_BYTES:
+        raise DistributedError(f"Invalid message size {size!r}, at most {MAX_PAYLOAD_BYTES} bytes are accepted")
+    return header
+
+
+def receive_payload(stream, header):
+    """Read the payload announced by a header"""
+    size = header.get('size', 0)
+    chunks = []
+    while size > 0:
+        chunk = stream.read(min(size, CHUNK_SIZE))
+        if not chunk:
+            raise DistributedError("Connection closed while receiving data")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def receive_message(stream):
+    """Read one header line and its payload from a binary file-like stream"""
+    header = receive_header(stream)
+    return header, receive_payload(stream, header)
+
+
+def archive_directory(root, excluded=()):
+    """Zip the test directory, skipping outputs and hidden folders"""
+    excluded = {os.path.normcase(os.path.abspath(path)) for path in excluded if path}
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for directory, dirnames, filenames in os.walk(root):
+            dirnames[:] = [
+                name for name in dirnames
+                if not name.startswith(".") and name not in EXCLUDED_DIRS
+                and os.path.normcase(os.path.abspath(os.path.join(directory, name))) not in excluded
+            ]
+            for filename in filenames:
+                path = os.path.join(directory, filename)
+                archive.write(path, os.path.relpath(path, root).replace(os.sep, "/"))
+    return buffer.getvalue()
+
+
+# Worker
+
+class WorkerServer(socketserver.ThreadingTCPServer):
+    """Runs the suites sent by a coordinator, one share at a time.
+
+    Coordinators run code on the worker through the suites they send, so a
+    worker listening on anything but a loopback address requires a token.
+    """
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, processes=None, token="", log=print):
+        if not token and not is_loopback(address[0]):
+            raise DistributedError(f"A token is required to listen on {address[0]}")
+        super().__init__(address, _WorkerHandler)
+        self.processes = processes or cpu_count()
+        self.token = token
+        self.log = log
+        self.run_lock = threading.Lock()
+
+
+class _WorkerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            header = receive_header(self.rfile)
+            if not hmac.compare_digest(str(header.get('token', "")), self.server.token):
+                raise DistributedError("Invalid token")
+            # Only read once the peer is known
+            payload = receive_payload(self.rfile, header)
+            if header.get('command') == 'info':
+                send_message(self.connection, {
+                    'status': 'ok', 'version': PROTOCOL_VERSION,
+                    'host': socket.gethostname(), 'processes': self.server.processes,
+                })
+            elif header.get('command') == 'run':
+                with self.server.run_lock:
+                    self._run(header, payload)
+            else:
+                raise DistributedError(f"Unknown command {header.get('command')!r}")
+        except Exception as e:
+            self.server.log(f"Request from {self.client_address[0]} failed: {e}")
+            try:
+                send_message(self.connection, {'status': 'error', 'message': str(e)})
+            except OSError:
+                pass
+
+    def _run(self, header, archive):
+        with tempfile.TemporaryDirectory(prefix="robot_runner_worker_") as workdir:
+            tests_dir = os.path.join(workdir, "tests")
+            output_dir = os.path.join(workdir, "results")
+            with zipfile.ZipFile(io.BytesIO(archive)) as zipped:
+                zipped.extractall(tests_dir)
+
+            suites = [os.path.join(tests_dir, *suite.split("/")) for suite in header['suites']]
+            processes = min(int(header.get('processes') or self.server.processes), len(suites))
+            options = worker_options(header.get('options', []))
+            test_timeout = header_seconds(header, 'test_timeout')
+            run_timeout = header_seconds(header, 'run_timeout')
+            if test_timeout:
+                listener = resource_path("listeners/TestTimeoutListener.py")
+                options += ["--listener", f"{listener}:{test_timeout}"]
+            if processes > 1:
+                command = ["pabot", "--processes", str(processes), "--outputdir", output_dir] + options + suites
+            else:
+                command = ["robot", "--outputdir", output_dir] + options + suites
+
+            self.server.log(f"Running {len(suites)} suite(s) for {self.client_address[0]} "
+                            f"with {processes} process(es)")
+            exit_code = self._wait(subprocess.Popen(command, cwd=tests_dir), run_timeout)
+            output_path = os.path.join(output_dir, "output.xml")
+            if not is_output_finalized(output_path):
+                raise DistributedError(f"{command[0]} exited with code {exit_code} without output.xml")
+
+            with open(output_path, "rb") as output_file:
+                output = output_file.read()
+            send_message(self.connection, {
+                'status': 'ok', 'exit_code': exit_code, 'root': tests_dir,
+            }, output)
+
+    def _wait(self, process, run_timeout):
+        """Exit code of the run, killed once over its budget or when the coordinator went away"""
+        deadline = time.monotonic() + run_timeout if run_timeout else None
+        while True:
+            try:
+                return process.wait(timeout=WAIT_POLL_SECONDS)
+            except subprocess.TimeoutExpired:
+                pass
+            if deadline is not None and time.monotonic() > deadline:
+                reason = f"Run exceeded its {run_timeout} second timeout"
+            elif self._coordinator_left():
+                reason = "Coordinator closed the connection"
+            else:
+                continue
+            kill_process_tree(process.pid)
+            process.wait()
+            raise DistributedError(reason)
+
+    def _coordinator_left(self):
+        readable, _, _ = select.select([self.connection], [], [], 0)
+        try:
+            return bool(readable) and not self.connection.recv(1, socket.MSG_PEEK)
+        except OSError:
+            return True
+
+
+# Coordinator
+
+def _request(worker, header, payload=b"", timeout=None, opened=None):
+    """Send a request and return the reply; ``opened`` is given the connection first"""
+    with socket.create_connection(worker, timeout=CONNECT_TIMEOUT) as connection:
+        if opened is not None:
+            opened(connection)
+        connection.settimeout(timeout)
+        send_message(connection, header, payload)
+        reply, data = receive_message(connection.makefile("rb"))
+    if reply.get('status') != 'ok':
+        raise DistributedError(reply.get('message', "Worker error"))
+    return reply, data
+
+
+def query_worker(worker, token=""):
+    """Return the info reply of a worker (host name and process capacity)"""
+    reply, _ = _request(worker, {'command': 'info', 'token': token}, timeout=CONNECT_TIMEOUT)
+    if reply.get('version') != PROTOCOL_VERSION:
+        raise DistributedError(f"Protocol version {reply.get('version')} is not supported")
+    return reply
+
+
+def _remap_sources(suite, worker_root, root):
+    """Point the suite sources of a worker output back to the coordinator's files"""
+    if suite.source:
+        relative = os.path.relpath(str(suite.source), worker_root)
+        if not relative.startswith(".."):
+            suite.source = os.path.join(root, relative)
+    for child in suite.suites:
+        _remap_sources(child, worker_root, root)
+
+
+def combine_outputs(worker_outputs, output_path):
+    """Combine the worker outputs like pabot combines its process outputs"""
+    result = ExecutionResult(*worker_outputs)
+    if len(worker_outputs) > 1:
+        # Workers running several suites have a "Suites" top suite of their own
+        suites = []
+        for worker_suite in list(result.suite.suites):
+            if worker_suite.source and os.path.isfile(str(worker_suite.source)):
+                suites.append(worker_suite)
+            else:
+                suites.extend(worker_suite.suites)
+        result.suite.suites = suites
+        result.suite.name = PABOT_MULTI_SOURCE_NAME
+    result.save(output_path)
+    return result
+
+
+class DistributedRun:
+    """Splits suites across workers, collects and combines their outputs.
+
+    ``run_timeout`` is the budget of the whole run in seconds: workers kill
+    their run once it is spent, and the coordinator stops waiting for a
+    worker RESULT_GRACE_SECONDS later. abort() closes the connections of
+    the shares still running; the outputs of the finished ones are combined.
+    """
+
+    def __init__(self, workers, token="", log=print):
+        self.workers = workers
+        self.token = token
+        self.log = log
+        self.abort_reason = ""
+        self._connections = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def abort(self, reason):
+        with self._lock:
+            self.abort_reason = reason
+            connections = list(self._connections)
+        for connection in connections:
+            self._close(connection)
+
+    def _opened(self, connection):
+        with self._lock:
+            self._connections.add(connection)
+            aborted = bool(self.abort_reason)
+        if aborted:
+            self._close(connection)
+
+    def _close(self, connection):
+        try:
+            connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def run(self, sources, root, output_dir, options=(), test_timeout=0, timing_history=None,
+            report_options=(), run_timeout=0):
+        root = os.path.abspath(root)
+        relative = {}
+        for source in sources:
+            path = os.path.relpath(os.path.abspath(source), root)
+            if path.startswith(".."):
+                raise DistributedError(f"{source} is outside of the test directory {root}")
+            relative[source] = path.replace(os.sep, "/")
+
+        available = self._available_workers()
+        durations = {source: self._estimate(timing_history, source) for source in sources}
+        shares = lpt_partition(durations, [info['processes'] for _, info in available])
+        archive = archive_directory(root, excluded=[output_dir])
+
+        request = {'command': 'run', 'token': self.token, 'options': list(options),
+                   'test_timeout': test_timeout, 'run_timeout': run_timeout}
+        for key in ('test_timeout', 'run_timeout'):
+            header_seconds(request, key)
+        reply_timeout = run_timeout + RESULT_GRACE_SECONDS if run_timeout else None
+        jobs = [(worker, [relative[source] for source in share])
+                for (worker, _), share in zip(available, shares) if share]
+
+        results_dir = os.path.join(output_dir, "workers")
+        os.makedirs(results_dir, exist_ok=True)
+        outputs, failed, healthy = [], [], []
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            futures = [executor.submit(self._run_share, worker, suites, request, archive, root, results_dir, index,
+                                       reply_timeout)
+                       for index, (worker, suites) in enumerate(jobs)]
+            for (worker, suites), future in zip(jobs, futures):
+                try:
+                    outputs.append(future.result())
+                    healthy.append(worker)
+                except (OSError, ValueError, DistributedError) as e:
+                    self.log(f"Worker {worker[0]}:{worker[1]} failed: {e}")
+                    failed.append(suites)
+
+        # Give the shares of failed workers to a worker that completed its own
+        for index, suites in enumerate(failed, start=len(jobs)):
+            if not healthy or self.abort_reason:
+                break
+            self.log(f"Retrying {len(suites)} suite(s) on {healthy[0][0]}:{healthy[0][1]}")
+            try:
+                outputs.append(self._run_share(healthy[0], suites, request, archive, root, results_dir, index,
+                                               reply_timeout))
+            except (OSError, ValueError, DistributedError) as e:
+                self.log(f"Retry failed: {e}")
+
+        if self.abort_reason:
+            if not outputs:
+                raise DistributedError(f"{self.abort_reason}. No finished results could be salvaged.")
+            self.log(f"{self.abort_reason}. Salvaging {len(outputs)} finished worker output(s).")
+        if not outputs:
+            raise DistributedError("No worker returned results")
+        output_path = os.path.join(output_dir, "output.xml")
+        combine_outputs(outputs, output_path)
+        subprocess.run(["rebot", "--outputdir", output_dir, "--output", "NONE"] + list(report_options) + [output_path])
+        return output_path
+
+    def _available_workers(self):
+        available = []
+        for worker in self.workers:
+            try:
+                available.append((worker, query_worker(worker, self.token)))
+            except (OSError, ValueError, DistributedError) as e:
+                self.log(f"Worker {worker[0]}:{worker[1]} unavailable: {e}")
+        if not available:
+            raise DistributedError("No worker is reachable")
+        return available
+
+    def _estimate(self, timing_history, source):
+        if timing_history is None:
+            return 1.0
+        duration = timing_history.suite_duration(source)
+        return duration if duration is not None else timing_history.default_duration()
+
+    def _run_share(self, worker, suites, request, archive, root, results_dir, index, timeout=None):
+        self.log(f"Sending {len(suites)} suite(s) to {worker[0]}:{worker[1]}")
+        reply, output = _request(worker, dict(request, suites=suites), archive, timeout, opened=self._opened)
+        worker_dir = os.path.join(results_dir, f"{index}_{worker[0]}_{worker[1]}".replace(":", "_"))
+        os.makedirs(worker_dir, exist_ok=True)
+        output_path = os.path.join(worker_dir, "output.xml")
+        with open(output_path, "wb") as output_file:
+            output_file.write(output)
+        result = ExecutionResult(output_path)
+        _remap_sources(result.suite, reply['root'], root)
+        result.save(output_path)
+        self.log(f"Worker {worker[0]}:{worker[1]} finished (exit code {reply['exit_code']})")
+        return output_path
+
+
+class DistributedRunner(QObject):
+    """Runs a DistributedRun in a background thread for the GUI"""
+    started = pyqtSignal()
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.thread = None
+        self.distributed_run = None
+
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def abort(self, reason):
+        """Stop waiting for the running shares; the run ends with the outputs of the finished ones"""
+        if self.is_running():
+            self.distributed_run.abort(reason)
+
+    def start(self, distributed_run, *args, **kwargs):
+        if self.is_running():
+            self.failed.emit("A distributed run is already in progress")
+            return False
+        self.distributed_run = distributed_run
+        self.thread = threading.Thread(target=self._run, args=(distributed_run,) + args, kwargs=kwargs, daemon=True)
+        self.started.emit()
+        self.thread.start()
+        return True
+
+    def _run(self, distributed_run, *args, **kwargs):
+        try:
+            self.finished.emit(distributed_run.run(*args, **kwargs))
+        except Exception as e:
+            self.failed.emit(f"Distributed run failed: {e}")
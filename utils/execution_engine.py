@@ -0,0 +1,114 @@
+import glob
+import os
+from PyQt6.QtCore import QObject, QProcess, pyqtSignal
+from utils.output_watcher import OutputWatcher, is_output_finalized
+from utils.process_utils import kill_process_tree
+
+# robot/pabot exit codes after which no output.xml will be written
+NO_OUTPUT_EXIT_CODES = (251, 252, 255)
+
+
+class TestExecutionEngine(QObject):
+    """Runs robot/pabot in a QProcess so the GUI thread stays responsive"""
+    started = pyqtSignal()
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    OUTPUT_MAX_WAIT_MS = 15000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.process = None
+        self.output_path = ""
+        self.abort_reason = ""
+        self.output_watcher = OutputWatcher(self, self.OUTPUT_MAX_WAIT_MS)
+        self.output_watcher.ready.connect(self.finished)
+        self.output_watcher.timed_out.connect(self._on_output_timed_out)
+
+    def is_running(self):
+        """Return True while a run (process or output wait) is in progress"""
+        if self.output_watcher.is_watching():
+            return True
+        return self.process is not None and self.process.state() != QProcess.ProcessState.NotRunning
+
+    def start(self, command, cwd, output_path):
+        """Start the command asynchronously; completion is reported through signals"""
+        if self.is_running():
+            self.failed.emit("A test run is already in progress")
+            return False
+
+        self.output_path = output_path
+        self.abort_reason = ""
+        self._start_process(command, cwd, notify_started=True)
+        return True
+
+    def _start_process(self, command, cwd, notify_started=False):
+        if self.process is not None:
+            self.process.deleteLater()
+        self.process = QProcess(self)
+        if notify_started:
+            self.process.started.connect(self.started)
+        # Keep robot/pabot console output visible like the former subprocess call
+        self.process.setProcessChannelMode(QProcess.ProcessChannelMode.ForwardedChannels)
+        self.process.setWorkingDirectory(cwd)
+        self.process.finished.connect(self._on_process_finished)
+        self.process.errorOccurred.connect(self._on_process_error)
+        self.process.start(command[0], command[1:])
+
+    def stop(self):
+        """Abort the current run, including the pabot workers; failed is emitted once it has stopped"""
+        if self.process is not None and self.process.state() != QProcess.ProcessState.NotRunning:
+            self.output_watcher.stop()
+            kill_process_tree(int(self.process.processId()))
+        elif self.output_watcher.is_watching():
+            # The process already exited, nothing will report the end of the run
+            self.output_watcher.stop()
+            self.failed.emit("Cancelled")
+
+    def abort(self, reason):
+        """Kill the whole process tree and salvage the outputs of finished pabot workers"""
+        if self.process is None or self.process.state() == QProcess.ProcessState.NotRunning:
+            return
+        self.abort_reason = reason
+        kill_process_tree(int(self.process.processId()))
+
+    def _salvage_outputs(self):
+        reason, self.abort_reason = self.abort_reason, ""
+        output_dir = os.path.dirname(self.output_path)
+        worker_outputs = sorted(
+            path for path in glob.glob(os.path.join(output_dir, "pabot_results", "*", "output.xml"))
+            if is_output_finalized(path)
+        )
+        if not worker_outputs:
+            self.failed.emit(f"{reason}. No finished results could be salvaged.")
+            return
+
+        print(f"{reason}. Salvaging {len(worker_outputs)} finished worker output(s).")
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+        command = ["rebot", "--merge", "--outputdir", output_dir,
+                   "--output", os.path.basename(self.output_path)] + worker_outputs
+        self._start_process(command, output_dir)
+
+    def _on_process_finished(self, exit_code, exit_status):
+        if self.abort_reason:
+            self._salvage_outputs()
+            return
+
+        if exit_status == QProcess.ExitStatus.CrashExit:
+            self.failed.emit(f"Test process crashed (exit code {exit_code})")
+            return
+
+        # robot/pabot return the number of failed tests, so a non-zero code is not an error here
+        if exit_code in NO_OUTPUT_EXIT_CODES and not is_output_finalized(self.output_path):
+            self.failed.emit(f"Test process exited with code {exit_code} without producing output.xml")
+            return
+        self.output_watcher.watch(self.output_path)
+
+    def _on_process_error(self, error):
+        # Crashes are reported by _on_process_finished
+        if error == QProcess.ProcessError.FailedToStart:
+            self.failed.emit(f"Failed to start '{self.process.program()}': {self.process.errorString()}")
+
+    def _on_output_timed_out(self, output_path):
+        self.failed.emit(f"output.xml not finalized after {self.OUTPUT_MAX_WAIT_MS // 1000} seconds: {output_path}")
@@ -1,6 +1,7 @@
 import os
 import shutil
 from PyQt6.QtWidgets import QFileDialog
+from utils.run_queue import QUEUE_DIR_NAME
 
 def select_directory(window):
     dir_path = QFileDialog.getExistingDirectory(window, "Select a folder")
@@ -8,7 +9,7 @@ def select_directory(window):
         window.test_directory = dir_path
         window.label.setText(f"Selected: {dir_path}")
         os.makedirs(os.path.join(dir_path, "Results"), exist_ok=True)
-        window.testList.clear()
+        window.test_model.clear()
         from utils.test_utils import load_tests
         load_tests(window)
     else:
@@ -31,6 +32,9 @@ def select_output_directory(window):
 def clear_results_directory(window):
     if window.output_directory and os.path.exists(window.output_directory):
         for file in os.listdir(window.output_directory):
+            # Reports of queued runs stay until their jobs are cleared from the Run Queue page
+            if file == QUEUE_DIR_NAME:
+                continue
             file_path = os.path.join(window.output_directory, file)
             try:
                 if os.path.isfile(file_path) or os.path.islink(file_path):
@@ -0,0 +1,282 @@
+import hashlib
+import json
+import os
+import re
+from utils.resource_utils import app_data_path
+from utils.scheduling import source_key
+
+SECTION_HEADER = re.compile(r"^\*+\s*([^*]+?)\s*\**\s*$")
+CELL_SEPARATOR = re.compile(r" {2,}|\t+")
+IMPORT_SETTINGS = ("resource", "library", "variables")
+BDD_PREFIXES = ("given ", "when ", "then ", "and ", "but ")
+INDEX_VERSION = 1
+
+
+def normalize_name(name):
+    """Normalize a keyword name the way Robot Framework matches it"""
+    return name.lower().replace(" ", "").replace("_", "")
+
+
+def split_cells(line):
+    """Return whether a data line is indented and its cells, comments removed"""
+    if line.startswith("|"):
+        cells = [cell.strip() for cell in line.strip().strip("|").split(" | ")]
+        indented = not cells or not cells[0]
+    else:
+        indented = line[:1] in (" ", "\t")
+        cells = CELL_SEPARATOR.split(line.strip())
+    cells = [cell for cell in cells if cell]
+    for index, cell in enumerate(cells):
+        if cell.startswith("#"):
+            return indented, cells[:index]
+    return indented, cells
+
+
+def _call_names(cells):
+    """Names a line may call: every cell could be a keyword given to Run Keyword & co"""
+    names = set()
+    for cell in cells:
+        if cell[:1] in "$@&%[" or cell == "...":
+            continue
+        lowered = cell.lower()
+        for prefix in BDD_PREFIXES:
+            if lowered.startswith(prefix):
+                names.add(normalize_name(cell[len(prefix):]))
+        names.add(normalize_name(cell))
+        if "." in cell:
+            names.add(normalize_name(cell.rsplit(".", 1)[1]))
+    return names
+
+
+def scan_file(path):
+    """Extract imports, keyword definitions and keyword usage of a robot data file.
+
+    A fast line scanner rather than the Robot Framework parser, so thousands
+    of files can be indexed in a few seconds. ``rest_hash`` covers everything
+    but the keyword bodies, which are hashed one by one in ``keywords``.
+    """
+    with open(path, "rb") as data_file:
+        content = data_file.read()
+    text = content.decode("utf-8", errors="replace")
+
+    section = ""
+    imports, uses, keywords = [], set(), {}
+    rest = hashlib.sha1()
+    current_keyword, body = None, []
+
+    def close_keyword():
+        if current_keyword is not None:
+            body_text = "\n".join(line for line, _ in body)
+            keyword_uses = set().union(*(names for _, names in body)) if body else set()
+            keywords[current_keyword] = {
+                'hash': hashlib.sha1(body_text.encode("utf-8")).hexdigest(),
+                'uses': sorted(keyword_uses),
+                'embedded': "${" in current_keyword,
+            }
+
+    for line in text.splitlines():
+        header = SECTION_HEADER.match(line)
+        if header:
+            close_keyword()
+            current_keyword, body = None, []
+            section = header.group(1).lower()
+            rest.update(line.encode("utf-8"))
+            continue
+        if not line.strip():
+            continue
+        indented, cells = split_cells(line)
+        if not cells:
+            continue
+
+        if section.startswith("keyword"):
+            if not indented:
+                close_keyword()
+                current_keyword, body = cells[0], []
+                rest.update(cells[0].encode("utf-8"))
+                cells = cells[1:]
+            names = _call_names(cells)
+            uses |= names
+            if current_keyword is not None:
+                body.append(("  ".join(cells), names))
+            continue
+
+        rest.update(line.encode("utf-8"))
+        if section.startswith("setting") and not indented and cells[0].lower() in IMPORT_SETTINGS:
+            if len(cells) > 1:
+                imports.append((cells[0].lower(), cells[1]))
+        elif not section.startswith(("variable", "comment")):
+            uses |= _call_names(cells[1:] if section.startswith("setting") else cells)
+    close_keyword()
+
+    return {
+        'hash': hashlib.sha1(content).hexdigest(),
+        'rest_hash': rest.hexdigest(),
+        'imports': imports,
+        'keywords': {normalize_name(name): info for name, info in keywords.items()},
+        'uses': sorted(uses),
+    }
+
+
+def resolve_import(kind, value, importer, root):
+    """Return the local file an import refers to, or None for installed libraries"""
+    value = (value.replace("${CURDIR}", os.path.dirname(importer))
+                  .replace("${EXECDIR}", root).replace("${/}", os.sep))
+    if "${" in value:
+        return None
+    candidates = [value]
+    if kind == "library" and not value.lower().endswith(".py") and "/" not in value and os.sep not in value:
+        module = value.replace(".", os.sep)
+        candidates = [module + ".py", os.path.join(module, "__init__.py")]
+    for candidate in candidates:
+        for base in (os.path.dirname(importer), root):
+            path = os.path.normpath(os.path.join(base, candidate))
+            if os.path.isfile(path):
+                return path
+    return None
+
+
+class ImpactIndex:
+    """Dependency index of robot files and the state of each suite's last green run"""
+
+    def __init__(self, path=None):
+        self.path = path or app_data_path("impact_index.json")
+        self.files = {}
+        self.green = {}
+        self.states = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as index_file:
+                data = json.load(index_file)
+            if data.get('version') == INDEX_VERSION:
+                self.files = data.get('files', {})
+                self.green = data.get('green', {})
+                self.states = data.get('states', {})
+        except (OSError, ValueError):
+            self.files = {}
+            self.green = {}
+            self.states = {}
+
+    def save(self):
+        try:
+            with open(self.path, "w", encoding="utf-8") as index_file:
+                json.dump({'version': INDEX_VERSION, 'files': self.files, 'green': self.green,
+                           'states': self.states}, index_file)
+        except OSError as e:
+            print(f"Error saving impact index: {e}")
+
+    def entry(self, path):
+        """Index entry of a file, rescanned only when its size or mtime changed"""
+        key = source_key(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.files.pop(key, None)
+            return None
+        entry = self.files.get(key)
+        if entry is None or entry['mtime'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+            if path.lower().endswith((".robot", ".resource", ".txt", ".tsv")):
+                entry = scan_file(path)
+            else:
+                # Python libraries and variable files are tracked as a whole
+                with open(path, "rb") as data_file:
+                    digest = hashlib.sha1(data_file.read()).hexdigest()
+                entry = {'hash': digest, 'rest_hash': digest, 'imports': [], 'keywords': {}, 'uses': []}
+            entry.update(mtime=stat.st_mtime_ns, size=stat.st_size)
+            self.files[key] = entry
+        return entry
+
+    def dependencies(self, source, root):
+        """Return {path: entry} of the suite and every file it imports, transitively"""
+        closure = {}
+        pending = [os.path.abspath(source)]
+        while pending:
+            path = pending.pop()
+            key = source_key(path)
+            if key in closure:
+                continue
+            entry = self.entry(path)
+            if entry is None:
+                continue
+            closure[key] = entry
+            for kind, value in entry['imports']:
+                dependency = resolve_import(kind, value, path, root)
+                if dependency:
+                    pending.append(dependency)
+        return closure
+
+    def snapshot(self, sources, root):
+        """State of the suites' inputs, taken when a run starts"""
+        snapshot = {'suites': {}, 'files': {}}
+        for source in sources:
+            closure = self.dependencies(source, root)
+            snapshot['suites'][source_key(source)] = {key: entry['hash'] for key, entry in closure.items()}
+            for key, entry in closure.items():
+                snapshot['files'].setdefault(key, {}).setdefault(entry['hash'], {
+                    'rest_hash': entry['rest_hash'], 'keywords': entry['keywords']})
+        return snapshot
+
+    def record_green(self, snapshot, passed_sources):
+        """Remember the inputs of suites that passed in the run the snapshot was taken for"""
+        for source in passed_sources:
+            key = source_key(source)
+            if key in snapshot['suites']:
+                self.green[key] = snapshot['suites'][key]
+                for path, digest in self.green[key].items():
+                    self.states.setdefault(path, {})[digest] = snapshot['files'][path][digest]
+
+        # Forget file states no green run refers to anymore
+        referenced = {}
+        for files in self.green.values():
+            for path, digest in files.items():
+                referenced.setdefault(path, set()).add(digest)
+        self.states = {path: {digest: state for digest, state in states.items() if digest in referenced[path]}
+                       for path, states in self.states.items() if path in referenced}
+        self.save()
+
+    def is_affected(self, source, root):
+        """True when the suite never passed or one of its inputs changed since it last did"""
+        green = self.green.get(source_key(source))
+        if not green:
+            return True
+        suite_key = source_key(source)
+        closure = self.dependencies(source, root)
+        if suite_key not in closure:
+            return True
+        changed_keywords = set()
+        for key, entry in closure.items():
+            previous_hash = green.get(key)
+            if previous_hash == entry['hash']:
+                continue
+            if previous_hash is None or key == suite_key:
+                return True
+            previous = self.states[key][previous_hash]
+            if previous['rest_hash'] != entry['rest_hash']:
+                return True
+            names = set(previous['keywords']) | set(entry['keywords'])
+            for name in names:
+                before, after = previous['keywords'].get(name), entry['keywords'].get(name)
+                if before is None or after is None or before['hash'] != after['hash']:
+                    if (before or after).get('embedded'):
+                        # Embedded arguments cannot be matched by name
+                        return True
+                    changed_keywords.add(name)
+        if not changed_keywords:
+            return False
+
+        # Keywords calling a changed keyword are changed as well
+        keywords = [(name, set(info['uses'])) for entry in closure.values() for name, info in entry['keywords'].items()]
+        grew = True
+        while grew:
+            grew = False
+            for name, uses in keywords:
+                if name not in changed_keywords and uses & changed_keywords:
+                    changed_keywords.add(name)
+                    grew = True
+        return bool(set(closure[suite_key]['uses']) & changed_keywords)
+
+    def affected(self, sources, root):
+        affected = [source for source in sources if self.is_affected(source, root)]
+        self.save()
+        return affected
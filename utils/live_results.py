@@ -0,0 +1,63 @@
+import json
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QHostAddress, QTcpServer
+from utils.resource_utils import resource_path
+
+
+class LiveResultServer(QObject):
+    """Receives per-test events from the bundled LiveResultsListener"""
+    test_started = pyqtSignal(dict)
+    test_ended = pyqtSignal(dict)
+    worker_finished = pyqtSignal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.server = QTcpServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}
+
+    def listen(self):
+        """Start listening on an ephemeral localhost port and return it"""
+        if not self.server.isListening():
+            if not self.server.listen(QHostAddress(QHostAddress.SpecialAddress.LocalHost), 0):
+                raise RuntimeError(f"Cannot start live results server: {self.server.errorString()}")
+        return self.server.serverPort()
+
+    def listener_arguments(self):
+        """Return the robot/pabot options injecting the live listener"""
+        listener = resource_path("listeners/LiveResultsListener.py")
+        return ["--listener", f"{listener}:{self.listen()}"]
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            # pabot opens one connection per worker process
+            socket = self.server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self._read(s))
+            socket.disconnected.connect(lambda s=socket: self._close(s))
+
+    def _read(self, socket):
+        data = self._buffers.get(socket, b"") + bytes(socket.readAll())
+        *lines, self._buffers[socket] = data.split(b"\n")
+        for line in lines:
+            if line.strip():
+                self._dispatch(line)
+
+    def _close(self, socket):
+        self._read(socket)
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
+
+    def _dispatch(self, line):
+        try:
+            event = json.loads(line.decode("utf-8"))
+        except ValueError as e:
+            print(f"Invalid live result event: {e}")
+            return
+
+        if event.get('event') == 'start_test':
+            self.test_started.emit(event)
+        elif event.get('event') == 'end_test':
+            self.test_ended.emit(event)
+        elif event.get('event') == 'worker_stats':
+            self.worker_finished.emit(event)
@@ -0,0 +1,81 @@
+import os
+from PyQt6.QtCore import QFileSystemWatcher, QObject, QTimer, pyqtSignal
+
+OUTPUT_CLOSING_TAG = b"</robot>"
+
+
+def is_output_finalized(output_path):
+    """Return True once output.xml has been completely written.
+
+    Robot Framework writes the closing </robot> tag last, so a file whose
+    tail does not end with it is still being flushed (or was truncated).
+    """
+    try:
+        size = os.path.getsize(output_path)
+        if size < len(OUTPUT_CLOSING_TAG):
+            return False
+        with open(output_path, "rb") as output_file:
+            output_file.seek(max(0, size - 256))
+            return output_file.read().rstrip().endswith(OUTPUT_CLOSING_TAG)
+    except OSError:
+        return False
+
+
+class OutputWatcher(QObject):
+    """Signals when an output.xml file is finalized, using file system notifications"""
+    ready = pyqtSignal(str)
+    timed_out = pyqtSignal(str)
+
+    def __init__(self, parent=None, timeout_ms=15000):
+        super().__init__(parent)
+        self.output_path = ""
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._check)
+        self.watcher.fileChanged.connect(self._check)
+        self.deadline = QTimer(self)
+        self.deadline.setSingleShot(True)
+        self.deadline.setInterval(timeout_ms)
+        self.deadline.timeout.connect(self._on_deadline)
+
+    def is_watching(self):
+        return self.deadline.isActive()
+
+    def watch(self, output_path):
+        """Emit ready as soon as output_path is finalized, or timed_out after the deadline"""
+        self.stop()
+        self.output_path = output_path
+        if is_output_finalized(output_path):
+            self.ready.emit(output_path)
+            return
+
+        output_dir = os.path.dirname(output_path) or "."
+        if os.path.isdir(output_dir):
+            self.watcher.addPath(output_dir)
+        if os.path.exists(output_path):
+            self.watcher.addPath(output_path)
+        self.deadline.start()
+
+    def stop(self):
+        self.deadline.stop()
+        paths = self.watcher.files() + self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
+
+    def _check(self, _path=None):
+        if not self.deadline.isActive():
+            return
+        if is_output_finalized(self.output_path):
+            self.stop()
+            self.ready.emit(self.output_path)
+        elif os.path.exists(self.output_path) and self.output_path not in self.watcher.files():
+            # The file appeared after watching started, follow its writes as well
+            self.watcher.addPath(self.output_path)
+
+    def _on_deadline(self):
+        # Notifications are unreliable on some network shares, check one last time
+        output_path = self.output_path
+        self.stop()
+        if is_output_finalized(output_path):
+            self.ready.emit(output_path)
+        else:
+            self.timed_out.emit(output_path)
@@ -0,0 +1,44 @@
+import os
+import signal
+import subprocess
+import sys
+
+
+def child_process_ids(pid):
+    """Return the ids of all descendants of a process (POSIX)"""
+    try:
+        output = subprocess.run(["ps", "-A", "-o", "pid=,ppid="],
+                                capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return []
+
+    children = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            children.setdefault(int(parts[1]), []).append(int(parts[0]))
+
+    descendants = []
+    pending = [pid]
+    while pending:
+        for child in children.get(pending.pop(), []):
+            descendants.append(child)
+            pending.append(child)
+    return descendants
+
+def kill_process_tree(pid):
+    """Kill a process and every process it spawned (e.g. pabot and its robot workers)"""
+    if not pid:
+        return
+
+    if sys.platform == "win32":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)],
+                       capture_output=True, creationflags=subprocess.CREATE_NO_WINDOW)
+        return
+
+    # Collect the whole tree first, children get re-parented once their parent dies
+    for process_id in [pid] + child_process_ids(pid):
+        try:
+            os.kill(process_id, signal.SIGKILL)
+        except OSError:
+            pass
@@ -10,4 +10,17 @@ def resource_path(relative_path):
     
     full_path = os.path.join(base_path, relative_path)
     print(f"Looking for resource at: {full_path}") 
-    return full_path
\ No newline at end of file
+    return full_path
+
+def app_data_path(*parts):
+    """Get a path inside the per-user application data directory, creating it if needed"""
+    if sys.platform == "win32":
+        base_path = os.environ.get("LOCALAPPDATA") or os.environ.get("APPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base_path = os.path.expanduser("~/Library/Application Support")
+    else:
+        base_path = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+
+    data_dir = os.path.join(base_path, "RobotTestRunner")
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, *parts)
@@ -0,0 +1,146 @@
+import hashlib
+import importlib
+import json
+import os
+import shutil
+import time
+from functools import lru_cache
+from importlib import metadata
+import robot
+from robot.libraries import STDLIBS
+from robot.result import Result
+from utils.impact import resolve_import
+from utils.resource_utils import app_data_path
+from utils.scheduling import source_key
+
+DEFAULT_MAX_AGE_HOURS = 24
+DEFAULT_MAX_SIZE_MB = 500
+
+
+@lru_cache(maxsize=None)
+def library_version(name):
+    """Version of an installed library, Robot Framework's own for the standard libraries.
+
+    Libraries whose module is not named after their distribution (SeleniumLibrary
+    of robotframework-seleniumlibrary) are looked up by module, which needs
+    Python 3.10; before, or when no distribution has it, their __version__ is
+    used. None when the library has no known version.
+    """
+    module = name.split(".")[0]
+    if module in STDLIBS:
+        return robot.__version__
+    try:
+        return metadata.version(module)
+    except metadata.PackageNotFoundError:
+        pass
+    packages_distributions = getattr(metadata, 'packages_distributions', None)
+    distributions = packages_distributions().get(module) if packages_distributions else None
+    if distributions:
+        return metadata.version(distributions[0])
+    try:
+        return getattr(importlib.import_module(module), '__version__', None)
+    except Exception:
+        return None
+
+
+def cache_key(impact_index, source, root, options=()):
+    """Key of a suite result: its files, imported resources, library versions and run options.
+
+    ``options`` are the --variable and tag --include/--exclude options of
+    the run: a suite run with a tag selection only has some of its tests.
+    """
+    digest = hashlib.sha1()
+    digest.update(f"robot {robot.__version__}\n".encode("utf-8"))
+    closure = impact_index.dependencies(source, root)
+    libraries = set()
+    for path, entry in sorted(closure.items()):
+        digest.update(f"{os.path.relpath(path, root)} {entry['hash']}\n".encode("utf-8"))
+        for kind, value in entry['imports']:
+            if kind == "library" and not resolve_import(kind, value, path, root):
+                libraries.add(value)
+    for library in sorted(libraries):
+        digest.update(f"library {library} {library_version(library)}\n".encode("utf-8"))
+    for option in options:
+        digest.update(f"option {option}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Outputs of suites that passed, reused while their inputs are unchanged"""
+
+    def __init__(self, directory=None, max_age_hours=DEFAULT_MAX_AGE_HOURS, max_size_mb=DEFAULT_MAX_SIZE_MB):
+        self.directory = directory or app_data_path("result_cache")
+        os.makedirs(self.directory, exist_ok=True)
+        self.index_path = os.path.join(self.directory, "index.json")
+        self.max_age_hours = max_age_hours
+        self.max_size_mb = max_size_mb
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as index_file:
+                self.entries = json.load(index_file)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        try:
+            with open(self.index_path, "w", encoding="utf-8") as index_file:
+                json.dump(self.entries, index_file)
+        except OSError as e:
+            print(f"Error saving result cache: {e}")
+
+    def lookup(self, key):
+        """Path of the cached output for the key, None when missing or too old"""
+        entry = self.entries.get(key)
+        if entry is None or time.time() - entry['created'] > self.max_age_hours * 3600:
+            return None
+        path = os.path.join(self.directory, entry['output'])
+        return path if os.path.exists(path) else None
+
+    def store(self, key, suite):
+        """Cache the output of a passed file suite of a robot.api result"""
+        filename = f"{key}.xml"
+        path = os.path.join(self.directory, filename)
+        Result(root_suite=suite).save(path)
+        self.entries[key] = {
+            'source': source_key(suite.source),
+            'output': filename,
+            'created': time.time(),
+            'size': os.path.getsize(path),
+        }
+
+    def evict(self):
+        """Drop expired outputs, then the oldest ones until the cache fits its size limit"""
+        now = time.time()
+        for key, entry in list(self.entries.items()):
+            if now - entry['created'] > self.max_age_hours * 3600:
+                self._remove(key)
+        total = sum(entry['size'] for entry in self.entries.values())
+        for key, entry in sorted(self.entries.items(), key=lambda item: item[1]['created']):
+            if total <= self.max_size_mb * 1024 * 1024:
+                break
+            total -= entry['size']
+            self._remove(key)
+        self.save()
+
+    def clear(self):
+        for key in list(self.entries):
+            self._remove(key)
+        self.save()
+
+    def _remove(self, key):
+        entry = self.entries.pop(key)
+        try:
+            os.remove(os.path.join(self.directory, entry['output']))
+        except OSError:
+            pass
+
+
+def copy_cached_output(path, destination_dir, index):
+    """Copy a cached output next to the run results so the report can be rebuilt later"""
+    os.makedirs(destination_dir, exist_ok=True)
+    destination = os.path.join(destination_dir, f"cached_{index}.xml")
+    shutil.copyfile(path, destination)
+    return destination
@@ -0,0 +1,366 @@
+import hashlib
+import os
+import threading
+import time
+from collections import namedtuple
+from xml.parsers import expat
+import numpy as np
+from robot.api import ExecutionResult
+from utils.resource_utils import app_data_path
+from utils.test_records import COLUMNS, DAY_MS, NO_START, TestRecords, to_epoch_ms
+
+READ_CHUNK_BYTES = 1024 * 1024
+DEFAULT_KEEP_DAYS = 5
+
+# The parsed content of one version of an output.xml: its tests in file order, as frozen TestRecords, and their counts
+ResultsSnapshot = namedtuple('ResultsSnapshot', 'path version tests passed failed')
+
+
+def file_version(path):
+    """Size and modification time identifying the content of a file"""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _make_snapshot(path, version, tests):
+    tests.freeze()
+    return ResultsSnapshot(path, version, tests, tests.count('PASS'), tests.count('FAIL'))
+
+
+def _byte_matrix(values, width):
+    """ASCII strings of at most width characters as rows of width + 1 bytes, 0 past their end"""
+    try:
+        raw = np.array(values, dtype=f'S{width + 1}')
+    except UnicodeEncodeError:
+        raw = np.array([value if isinstance(value, str) and value.isascii() else "" for value in values],
+                       dtype=f'S{width + 1}')
+    return raw.view(np.uint8).reshape(len(values), width + 1)
+
+
+def _number(matrix, first, last):
+    """Integer written in the columns first..last, -1 where one of them is not a digit"""
+    digits = matrix[:, first:last + 1]
+    values = np.zeros(len(matrix), np.int64)
+    for column in range(digits.shape[1]):
+        values = values * 10 + digits[:, column] - ord('0')
+    return np.where(np.all((digits >= ord('0')) & (digits <= ord('9')), axis=1), values, -1)
+
+
+def _separators(matrix, separators):
+    return np.all([matrix[:, column] == ord(char) for column, char in separators.items()], axis=0)
+
+
+def _epoch_ms(valid, year, month, day, hour, minute, second, millisecond):
+    """Milliseconds since EPOCH of the date and time fields, NO_START where invalid"""
+    valid = (valid & (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= 31)
+             & (hour >= 0) & (hour <= 23) & (minute >= 0) & (minute <= 59) & (second >= 0) & (second <= 61)
+             & (millisecond >= 0))
+    # Days since 1970-01-01 of a proleptic Gregorian date (civil calendar algorithm)
+    year = year - (month <= 2)
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * np.where(month > 2, month - 3, month + 9) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    days = era * 146097 + day_of_era - 719468
+    times = days * DAY_MS + hour * 3600000 + minute * 60000 + second * 1000 + millisecond
+    return np.where(valid, times, NO_START)
+
+
+def legacy_times(values):
+    """Milliseconds since EPOCH of Robot Framework 6 timestamps like '20240131 10:00:00.123'.
+
+    All values are converted at once from a matrix of their bytes instead
+    of one strptime call each; malformed ones give NO_START.
+    """
+    matrix = _byte_matrix(values, 21)
+    valid = _separators(matrix, {8: ' ', 11: ':', 14: ':', 17: '.'}) & (matrix[:, 20] != 0) & (matrix[:, 21] == 0)
+    return _epoch_ms(valid, _number(matrix, 0, 3), _number(matrix, 4, 5), _number(matrix, 6, 7),
+                     _number(matrix, 9, 10), _number(matrix, 12, 13), _number(matrix, 15, 16), _number(matrix, 18, 20))
+
+
+def iso_times(values):
+    """Milliseconds since EPOCH of Robot Framework 7 timestamps like '2024-01-31T10:00:00.123456'"""
+    matrix = _byte_matrix(values, 26)
+    valid = _separators(matrix, {4: '-', 7: '-', 10: 'T', 13: ':', 16: ':'}) & (matrix[:, 26] == 0)
+    # The fraction is left out when it is zero
+    fraction = np.where(matrix[:, 20:23] == 0, ord('0'), matrix[:, 20:23])
+    millisecond = np.where(matrix[:, 19] == 0, 0, np.where(matrix[:, 19] == ord('.'), _number(fraction, 0, 2), -1))
+    return _epoch_ms(valid, _number(matrix, 0, 3), _number(matrix, 5, 6), _number(matrix, 8, 9),
+                     _number(matrix, 11, 12), _number(matrix, 14, 15), _number(matrix, 17, 18), millisecond)
+
+
+def _seconds(values):
+    """Floats of the given strings, NaN where malformed"""
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        seconds = np.full(len(values), np.nan)
+        for index, value in enumerate(values):
+            try:
+                seconds[index] = float(value)
+            except (TypeError, ValueError):
+                pass
+        return seconds
+
+
+class _OutputReader:
+    """Expat handlers collecting the status of each test of an output.xml.
+
+    Everything but suites, tests and the status of tests (keywords, loops,
+    doc, tags, statistics, ...) is skipped by depth, so no element is ever
+    built and memory only grows with the number of tests.
+
+    The schema version of the root element tells how times are written:
+    starttime/endtime up to Robot Framework 6, start/elapsed (schema 5)
+    since Robot Framework 7. Their text is only collected while reading
+    and converted for all tests at once by finish().
+    """
+
+    def __init__(self):
+        self.iso = False
+        self.times = ([], [])
+        self.tests = TestRecords()
+        self.suites = []
+        self.skipped = 0
+        self.name = None
+        self.status = None
+        self.message = None
+
+    def start(self, tag, attrs):
+        if self.skipped:
+            self.skipped += 1
+        elif tag == 'test':
+            self.name = attrs.get('name', 'Unnamed Test')
+        elif tag == 'suite':
+            self.suites.append(attrs.get('name', ''))
+        elif tag == 'status' and self.name is not None:
+            self.status = attrs
+            self.message = []
+        elif tag == 'robot':
+            version = attrs.get('schemaversion', '')
+            self.iso = version.isdigit() and int(version) >= 5
+        else:
+            self.skipped = 1
+
+    def end(self, tag):
+        if self.skipped:
+            self.skipped -= 1
+        elif tag == 'status':
+            self.message = "".join(self.message)
+        elif tag == 'test':
+            if self.status is not None:
+                first, second = ('start', 'elapsed') if self.iso else ('starttime', 'endtime')
+                self.times[0].append(self.status.get(first))
+                self.times[1].append(self.status.get(second))
+                self.tests.append(self.suites[-1] if self.suites else "", self.name,
+                                  self.status.get('status', 'UNKNOWN'), NO_START, 0.0, (self.message or "").strip())
+            self.name = self.status = self.message = None
+        elif tag == 'suite':
+            self.suites.pop()
+
+    def text(self, data):
+        if isinstance(self.message, list) and not self.skipped:
+            self.message.append(data)
+
+    def finish(self):
+        """Fill the start and duration columns from the collected times; return the tests"""
+        if self.iso:
+            starts, durations = iso_times(self.times[0]), _seconds(self.times[1])
+        else:
+            starts, ends = legacy_times(self.times[0]), legacy_times(self.times[1])
+            durations = (ends - starts) / 1000
+            starts = np.where(ends == NO_START, NO_START, starts)
+        timed = (starts != NO_START) & ~np.isnan(durations)
+        self.tests.column('starts')[:] = np.where(timed, starts, NO_START)
+        self.tests.column('durations')[:] = np.where(timed, durations, 0.0)
+        return self.tests
+
+
+def read_output(path, progress=lambda percent: None, cancelled=lambda: False):
+    """Read the tests of an output.xml in one streaming pass; None once cancelled.
+
+    The file is fed to expat chunk by chunk, reporting the percentage read
+    through progress and checking cancelled between chunks.
+    """
+    version = file_version(path)
+    reader = _OutputReader()
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = reader.start
+    parser.EndElementHandler = reader.end
+    parser.CharacterDataHandler = reader.text
+    size = max(1, version[0])
+    read = 0
+    with open(path, 'rb') as output:
+        while True:
+            chunk = output.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            if cancelled():
+                return None
+            parser.Parse(chunk, False)
+            read += len(chunk)
+            progress(min(100, read * 100 // size))
+    parser.Parse(b"", True)
+    return _make_snapshot(path, version, reader.finish())
+
+
+def root_suite_name(path):
+    """Name of the root suite of an output.xml, read only up to its start tag"""
+    names = []
+
+    def start(tag, attrs):
+        if tag == 'suite' and not names:
+            names.append(attrs.get('name', ''))
+
+    parser = expat.ParserCreate()
+    parser.StartElementHandler = start
+    with open(path, 'rb') as output:
+        while not names:
+            chunk = output.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            parser.Parse(chunk, False)
+    return names[0] if names else None
+
+
+def snapshot_from_result(path, version, result):
+    """The snapshot of an output.xml already loaded as a robot.api ExecutionResult"""
+    tests = TestRecords()
+    for test in result.suite.all_tests:
+        start = test.start_time
+        duration = (test.end_time - start).total_seconds() if start and test.end_time else 0.0
+        tests.append(test.parent.name if test.parent else "", test.name, test.status, to_epoch_ms(start), duration,
+                     test.message.strip())
+    return _make_snapshot(path, version, tests)
+
+
+def _pack_strings(strings):
+    # XML text cannot contain NUL characters, so they separate the strings
+    return np.frombuffer("\0".join(strings).encode("utf-8"), dtype=np.uint8)
+
+
+def _unpack_strings(packed):
+    return packed.tobytes().decode("utf-8").split("\0")
+
+
+class SnapshotCache:
+    """Snapshots of output.xml files saved as numpy .npz files, one per output path.
+
+    An entry holds the size and modification time of the file it was read
+    from and is only used while they match. It stores the columns of the
+    snapshot's TestRecords as they are, with its string and status tables
+    packed as NUL separated text. Entries not used for ``keep_days`` days
+    are evicted.
+    """
+
+    def __init__(self, directory=None, keep_days=DEFAULT_KEEP_DAYS):
+        self.directory = directory or app_data_path("results_snapshots")
+        os.makedirs(self.directory, exist_ok=True)
+        self.keep_days = keep_days
+
+    def _entry_path(self, path):
+        return os.path.join(self.directory, hashlib.sha1(path.encode("utf-8")).hexdigest() + ".npz")
+
+    def load(self, path, version):
+        """Cached snapshot of that version of an output.xml, None when missing or stale"""
+        entry_path = self._entry_path(path)
+        try:
+            with np.load(entry_path, allow_pickle=False) as entry:
+                if str(entry['path']) != path or tuple(int(value) for value in entry['version']) != version:
+                    return None
+                tests = TestRecords.from_columns(_unpack_strings(entry['strings']),
+                                                 _unpack_strings(entry['statuses']),
+                                                 {name: entry[name] for name in COLUMNS})
+            os.utime(entry_path)
+        except (OSError, KeyError, ValueError) as e:
+            if not isinstance(e, FileNotFoundError):
+                print(f"Error loading cached results of {path}: {e}")
+            return None
+        return _make_snapshot(path, version, tests)
+
+    def store(self, snapshot):
+        """Save a snapshot, replacing the entry of its path, then evict old entries"""
+        tests = snapshot.tests
+        entry_path = self._entry_path(snapshot.path)
+        temporary_path = entry_path + ".tmp"
+        try:
+            with open(temporary_path, 'wb') as entry:
+                np.savez_compressed(entry, path=np.array(snapshot.path),
+                                    version=np.array(snapshot.version, dtype=np.int64),
+                                    strings=_pack_strings(tests.strings), statuses=_pack_strings(tests.statuses),
+                                    **{name: tests.column(name) for name in COLUMNS})
+            os.replace(temporary_path, entry_path)
+        except OSError as e:
+            print(f"Error caching results of {snapshot.path}: {e}")
+        self.evict()
+
+    def evict(self):
+        """Remove the entries not used for keep_days days"""
+        limit = time.time() - self.keep_days * 24 * 3600
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < limit:
+                    os.remove(path)
+            except OSError:
+                pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+class ResultsModel:
+    """Parsed output.xml files shared by the result label, the dashboard, analytics and the exporters.
+
+    Each version of a file (path, size and modification time) is parsed
+    once; every consumer then gets the same immutable snapshot. Parsing
+    holds a lock, so a request for a file being read waits for that read
+    instead of starting another one. With a SnapshotCache, snapshots also
+    outlive the application.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self._lock = threading.Lock()
+        self._snapshots = {}
+
+    def snapshot(self, path, progress=lambda percent: None, cancelled=lambda: False):
+        """Snapshot of the current version of an output.xml; None when cancelled while reading"""
+        path = os.path.abspath(path)
+        with self._lock:
+            version = file_version(path)
+            snapshot = self._snapshots.get(path)
+            if snapshot is not None and snapshot.version == version:
+                progress(100)
+                return snapshot
+            snapshot = self.cache.load(path, version) if self.cache else None
+            if snapshot is None:
+                snapshot = read_output(path, progress, cancelled)
+                if snapshot is None:
+                    return None
+                if self.cache:
+                    self.cache.store(snapshot)
+            progress(100)
+            self._snapshots[path] = snapshot
+            return snapshot
+
+    def execution_result(self, path):
+        """robot.api result of an output.xml, for the recorders needing the full model.
+
+        The snapshot of that version is taken from it rather than read again.
+        """
+        path = os.path.abspath(path)
+        with self._lock:
+            version = file_version(path)
+            result = ExecutionResult(path)
+            snapshot = self._snapshots.get(path)
+            if snapshot is None or snapshot.version != version:
+                snapshot = self._snapshots[path] = snapshot_from_result(path, version, result)
+                if self.cache:
+                    self.cache.store(snapshot)
+            return result
@@ -0,0 +1,169 @@
+import socket
+import sqlite3
+import uuid
+from datetime import datetime
+import numpy as np
+from utils.resource_utils import app_data_path
+from utils.test_records import DAY_MS, NO_START, from_epoch_ms, to_epoch_ms
+
+HISTORY_VERSION = 1
+# Runs shown by the analytics trends, and looked at for flaky tests
+TREND_DAYS = 365
+FLAKY_RUNS = 30
+
+SCHEMA = f"""
+    PRAGMA journal_mode = WAL;
+    CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, run_id TEXT UNIQUE, started INTEGER, host TEXT,
+                                     processes INTEGER, total INTEGER, passed INTEGER, failed INTEGER);
+    CREATE TABLE IF NOT EXISTS tests (id INTEGER PRIMARY KEY, suite TEXT, name TEXT, last_status TEXT,
+                                      UNIQUE (suite, name));
+    CREATE TABLE IF NOT EXISTS results (run INTEGER, test INTEGER, status TEXT, start INTEGER, duration REAL,
+                                        message TEXT, switched INTEGER);
+    CREATE INDEX IF NOT EXISTS runs_started ON runs (started);
+    CREATE INDEX IF NOT EXISTS results_test ON results (test, run, status, duration);
+    CREATE INDEX IF NOT EXISTS results_switched ON results (test, run) WHERE switched;
+    PRAGMA user_version = {HISTORY_VERSION};
+"""
+
+
+class RunHistory:
+    """SQLite history of the completed runs and their tests, kept across result folder clears.
+
+    Runs get their start time, host and process count, tests one row per
+    run. The indexes cover the queries below: trends read the runs table
+    by start time and the durations of a test its entries of results_test.
+    A result is marked ``switched`` when it is a PASS after a FAIL of the
+    same test or the reverse (the last one is kept in tests), so finding
+    flaky tests only reads the few switched rows of a partial index instead
+    of ordering a year of results by test.
+
+    The database is in WAL mode so the dashboard loader can read it while a
+    run is ingested. Connections are opened per call, each in its thread.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or app_data_path("run_history.sqlite")
+        connection = self.open()
+        connection.close()
+
+    def open(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        if connection.execute("PRAGMA user_version").fetchone()[0] != HISTORY_VERSION:
+            connection.executescript(SCHEMA)
+        return connection
+
+    # Ingesting
+
+    def record_run(self, tests, processes=1, host=None, started=None, run_id=None):
+        """Store a run with its tests (TestRecords); returns the run id.
+
+        ``started`` is in milliseconds since EPOCH (naive local time, like
+        test start times), defaulting to the start of the first timed test,
+        or to now when no test has times.
+        """
+        if started is None:
+            timed = tests.timed()
+            started = int(tests.starts[timed].min()) if timed.any() else to_epoch_ms(datetime.now())
+        run_id = run_id or uuid.uuid4().hex
+        passed, failed = tests.count('PASS'), tests.count('FAIL')
+        connection = self.open()
+        try:
+            with connection:
+                run = connection.execute(
+                    "INSERT INTO runs (run_id, started, host, processes, total, passed, failed) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, started, host or socket.gethostname(), int(processes), len(tests), passed, failed)
+                ).lastrowid
+                test_ids, last_statuses = self._tests(connection, tests)
+                strings, statuses = tests.strings, tests.statuses
+                test_statuses = [statuses[code] for code in tests.status_codes.tolist()]
+                switched, updated = [], {}
+                for test, status in zip(test_ids, test_statuses):
+                    last_status = updated.get(test, last_statuses[test])
+                    switched.append(status in ('PASS', 'FAIL') and last_status not in (None, status))
+                    if status in ('PASS', 'FAIL') and status != last_status:
+                        updated[test] = status
+                connection.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)", zip(
+                    [run] * len(tests), test_ids, test_statuses,
+                    [None if start == NO_START else start for start in tests.starts.tolist()],
+                    np.round(tests.durations.astype(np.float64), 3).tolist(),
+                    [strings[message] for message in tests.column('message_ids').tolist()], switched))
+                connection.executemany("UPDATE tests SET last_status = ? WHERE id = ?",
+                                       [(status, test) for test, status in updated.items()])
+        finally:
+            connection.close()
+        return run_id
+
+    def _tests(self, connection, tests):
+        """Ids of the (suite, name) of every test, adding the new ones, and {id: last PASS or FAIL status}"""
+        strings = tests.strings
+        keys = list(zip([strings[suite] for suite in tests.column('suite_ids').tolist()],
+                        [strings[name] for name in tests.column('name_ids').tolist()]))
+        known = {(suite, name): (test, status)
+                 for suite, name, test, status in connection.execute("SELECT suite, name, id, last_status FROM tests")}
+        for key in dict.fromkeys(keys):
+            if key not in known:
+                known[key] = connection.execute("INSERT INTO tests (suite, name) VALUES (?, ?)", key).lastrowid, None
+        return [known[key][0] for key in keys], dict(known[key] for key in keys)
+
+    def clear(self):
+        connection = self.open()
+        try:
+            with connection:
+                connection.executescript("DELETE FROM results; DELETE FROM runs; DELETE FROM tests;")
+            connection.execute("VACUUM")
+        finally:
+            connection.close()
+
+    # Queries
+
+    def runs(self, days=TREND_DAYS):
+        """Runs of the last days, oldest first, as dicts with their start time as 'timestamp'"""
+        since = to_epoch_ms(datetime.now()) - days * DAY_MS
+        connection = self.open()
+        try:
+            rows = connection.execute(
+                "SELECT run_id, started, host, processes, total, passed, failed FROM runs "
+                "WHERE started >= ? ORDER BY started", (since,)).fetchall()
+        finally:
+            connection.close()
+        return [{'run_id': run_id, 'timestamp': from_epoch_ms(started), 'host': host, 'processes': processes,
+                 'total': total, 'passed': passed, 'failed': failed}
+                for run_id, started, host, processes, total, passed, failed in rows]
+
+    def flaky_tests(self, runs=FLAKY_RUNS, limit=10):
+        """Tests switching between PASS and FAIL in the last runs, most switches first.
+
+        Returns (suite, name, switches, failures) tuples.
+        """
+        connection = self.open()
+        try:
+            # By start time: imported runs or a changed clock do not get ids in start order
+            since = connection.execute(
+                "SELECT MIN(started) FROM (SELECT started FROM runs ORDER BY started DESC LIMIT ?)", (runs,)).fetchone()[0]
+            return connection.execute("""
+                SELECT suite, name, switches,
+                       (SELECT COUNT(*) FROM results JOIN runs ON runs.id = results.run
+                        WHERE test = flaky.test AND status = 'FAIL' AND runs.started >= ?)
+                FROM (SELECT test, COUNT(*) AS switches FROM results JOIN runs ON runs.id = results.run
+                      WHERE switched AND runs.started >= ? GROUP BY test) AS flaky
+                JOIN tests ON tests.id = flaky.test
+                ORDER BY switches DESC, suite, name LIMIT ?
+            """, (since, since, limit)).fetchall()
+        finally:
+            connection.close()
+
+    def durations(self, suite, name, days=TREND_DAYS):
+        """(start of the run, duration) of a test in the runs of the last days, oldest first"""
+        since = to_epoch_ms(datetime.now()) - days * DAY_MS
+        connection = self.open()
+        try:
+            rows = connection.execute("""
+                SELECT runs.started, results.duration FROM tests
+                JOIN results ON results.test = tests.id JOIN runs ON runs.id = results.run
+                WHERE tests.suite = ? AND tests.name = ? AND runs.started >= ? AND results.start IS NOT NULL
+                ORDER BY runs.started
+            """, (suite, name, since)).fetchall()
+        finally:
+            connection.close()
+        return [(from_epoch_ms(started), duration) for started, duration in rows]
@@ -0,0 +1,185 @@
+import heapq
+import itertools
+import os
+import shutil
+import time
+from PyQt6.QtCore import QObject, pyqtSignal
+from robot.api import ExecutionResult
+from utils.execution_engine import TestExecutionEngine
+
+# Sub folder of the results directory holding one output folder per queued run
+QUEUE_DIR_NAME = "queue"
+
+QUEUED = "Queued"
+RUNNING = "Running"
+PASSED = "Passed"
+FAILED = "Failed"
+ERROR = "Error"
+CANCELLED = "Cancelled"
+
+
+def parse_variables(text):
+    """Turn "NAME:value; OTHER:value" into robot --variable options"""
+    args = []
+    for entry in text.split(";"):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, separator, _ = entry.partition(":")
+        if not separator or not name.strip():
+            raise ValueError(f"Invalid variable '{entry}', expected NAME:value")
+        args += ["--variable", entry]
+    return args
+
+
+class RunJob:
+    """One queued selection with its own output folder, variables and process count"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name, command, cwd, output_directory, processes, priority=0, variables=""):
+        self.id = next(self._ids)
+        self.name = name
+        self.command = command
+        self.cwd = cwd
+        self.output_directory = output_directory
+        self.processes = max(1, int(processes))
+        self.priority = priority
+        self.variables = variables
+        self.state = QUEUED
+        self.cancel_requested = False
+        self.summary = ""
+        self.started = 0
+        self.duration = 0
+
+    @property
+    def output_path(self):
+        return os.path.join(self.output_directory, "output.xml")
+
+    def is_finished(self):
+        return self.state in (PASSED, FAILED, ERROR, CANCELLED)
+
+
+class RunQueue(QObject):
+    """Runs queued jobs by priority, concurrently while they fit in the worker budget.
+
+    Higher priorities start first, equal priorities in the order they were
+    added. A job that does not fit next to the running ones waits for them,
+    lower priority jobs are not started ahead of it. A job larger than the
+    whole budget still runs, alone.
+    """
+    job_added = pyqtSignal(object)
+    job_changed = pyqtSignal(object)
+    queue_finished = pyqtSignal()
+
+    def __init__(self, parent=None, worker_budget=2):
+        super().__init__(parent)
+        self.worker_budget = worker_budget
+        self.reserved_workers = 0
+        self.paused = False
+        self.jobs = []
+        self._pending = []
+        self._order = itertools.count()
+        self._engines = {}
+
+    def add(self, job):
+        self.jobs.append(job)
+        heapq.heappush(self._pending, (-job.priority, next(self._order), job))
+        self.job_added.emit(job)
+        self._dispatch()
+
+    def cancel(self, job):
+        """Remove a queued job or stop a running one"""
+        if job.state == QUEUED:
+            self._pending = [entry for entry in self._pending if entry[2] is not job]
+            heapq.heapify(self._pending)
+            self._set_state(job, CANCELLED)
+        elif job.state == RUNNING:
+            job.cancel_requested = True
+            self._engines[job.id].stop()
+
+    def clear_finished(self):
+        """Forget the finished jobs and delete their output folders"""
+        for job in self.jobs:
+            # Only the folders created for queued runs, inside the queue folder
+            folder = os.path.abspath(job.output_directory)
+            if job.is_finished() and os.path.basename(os.path.dirname(folder)) == QUEUE_DIR_NAME:
+                shutil.rmtree(folder, ignore_errors=True)
+        self.jobs = [job for job in self.jobs if not job.is_finished()]
+
+    def set_worker_budget(self, workers):
+        self.worker_budget = max(1, workers)
+        self._dispatch()
+
+    def set_reserved_workers(self, workers):
+        """Workers used outside the queue (the interactive run) count against the budget"""
+        self.reserved_workers = workers
+        self._dispatch()
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        self._dispatch()
+
+    def running_jobs(self):
+        return [job for job in self.jobs if job.state == RUNNING]
+
+    def pending_count(self):
+        return len(self._pending)
+
+    def busy_workers(self):
+        return self.reserved_workers + sum(job.processes for job in self.running_jobs())
+
+    def is_active(self):
+        return bool(self._pending or self._engines)
+
+    def _dispatch(self):
+        while self._pending and not self.paused:
+            job = self._pending[0][2]
+            busy = self.busy_workers()
+            if busy and busy + job.processes > self.worker_budget:
+                return
+            heapq.heappop(self._pending)
+            self._start(job)
+
+    def _start(self, job):
+        engine = TestExecutionEngine(self)
+        engine.finished.connect(lambda output_path, job=job: self._on_job_finished(job, output_path))
+        engine.failed.connect(lambda message, job=job: self._on_job_failed(job, message))
+        self._engines[job.id] = engine
+        job.started = time.time()
+        self._set_state(job, RUNNING)
+        os.makedirs(job.output_directory, exist_ok=True)
+        engine.start(job.command, job.cwd, job.output_path)
+
+    def _on_job_finished(self, job, output_path):
+        try:
+            statistics = ExecutionResult(output_path).suite.statistics
+            job.summary = f"Total: {statistics.total} | Passed: {statistics.passed} | Failed: {statistics.failed}"
+            state = FAILED if statistics.failed else PASSED
+        except Exception as e:
+            job.summary = f"Cannot read results: {e}"
+            state = ERROR
+        self._finish(job, state)
+
+    def _on_job_failed(self, job, message):
+        if job.cancel_requested:
+            job.summary = "Cancelled while running"
+            self._finish(job, CANCELLED)
+        else:
+            job.summary = message
+            self._finish(job, ERROR)
+
+    def _finish(self, job, state):
+        job.duration = time.time() - job.started
+        self._engines.pop(job.id).deleteLater()
+        self._set_state(job, state)
+        self._dispatch()
+        if not self.is_active():
+            self.queue_finished.emit()
+
+    def _set_state(self, job, state):
+        job.state = state
+        self.job_changed.emit(job)
@@ -0,0 +1,161 @@
+import heapq
+import json
+import os
+from robot.api import TestSuite
+from utils.resource_utils import app_data_path
+
+# Top-level suite name pabot gives to runs with several data sources
+PABOT_MULTI_SOURCE_NAME = "Suites"
+DEFAULT_DURATION = 1.0
+
+
+def source_key(path):
+    """Normalize a suite source path so it can be used as a history key"""
+    return os.path.normcase(os.path.abspath(str(path)))
+
+
+def pabot_suite_name(source, source_count):
+    """Return the long name pabot uses for a suite file given on the command line"""
+    name = TestSuite.name_from_source(source)
+    if source_count > 1:
+        return f"{PABOT_MULTI_SOURCE_NAME}.{name}"
+    return name
+
+
+def elapsed_seconds(item):
+    """Elapsed time in seconds of a result suite or test, for RF 6 and RF 7 models"""
+    elapsed = getattr(item, 'elapsed_time', None)
+    if elapsed is not None:
+        return elapsed.total_seconds()
+    return item.elapsedtime / 1000.0
+
+
+def lpt_schedule(durations, processes):
+    """Schedule jobs longest-processing-time-first.
+
+    ``durations`` maps a job to its expected duration. Returns the jobs in
+    dispatch order and the predicted makespan when they are handed to
+    ``processes`` workers in that order.
+    """
+    order = sorted(durations, key=lambda job: durations[job], reverse=True)
+    workers = [0.0] * max(1, min(int(processes), len(order) or 1))
+    for job in order:
+        heapq.heapreplace(workers, workers[0] + durations[job])
+    return order, max(workers)
+
+
+def lpt_partition(durations, capacities):
+    """Split jobs between workers of different capacities, longest jobs first.
+
+    Each job goes to the worker that would finish it earliest, assuming a
+    worker with capacity ``n`` gets through work ``n`` times faster. Returns
+    one list of jobs per worker.
+    """
+    shares = [[] for _ in capacities]
+    loads = [0.0] * len(capacities)
+    for job in sorted(durations, key=lambda job: durations[job], reverse=True):
+        worker = min(range(len(capacities)),
+                     key=lambda index: (loads[index] + durations[job]) / max(1, capacities[index]))
+        shares[worker].append(job)
+        loads[worker] += durations[job]
+    return shares
+
+
+class TimingHistory:
+    """Per-suite and per-test durations recorded from every parsed output.xml"""
+
+    SMOOTHING = 0.5
+
+    def __init__(self, path=None):
+        self.path = path or app_data_path("timings.json")
+        self.suites = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as history_file:
+                self.suites = json.load(history_file).get('suites', {})
+        except (OSError, ValueError):
+            self.suites = {}
+
+    def save(self):
+        try:
+            with open(self.path, "w", encoding="utf-8") as history_file:
+                json.dump({'suites': self.suites}, history_file)
+        except OSError as e:
+            print(f"Error saving timing history: {e}")
+
+    def record_result(self, result):
+        """Record durations of all file based suites of a robot.api ExecutionResult"""
+        self._record_suite(result.suite)
+        self.save()
+
+    def _record_suite(self, suite):
+        if suite.source and os.path.isfile(str(suite.source)):
+            entry = self.suites.setdefault(source_key(suite.source), {'duration': 0.0, 'tests': {}})
+            entry['duration'] = self._smooth(entry['duration'], elapsed_seconds(suite))
+            for test in suite.tests:
+                entry['tests'][test.name] = self._smooth(entry['tests'].get(test.name, 0.0), elapsed_seconds(test))
+        for child in suite.suites:
+            self._record_suite(child)
+
+    def _smooth(self, previous, current):
+        if not previous:
+            return current
+        return self.SMOOTHING * current + (1 - self.SMOOTHING) * previous
+
+    def suite_duration(self, source):
+        entry = self.suites.get(source_key(source))
+        return entry['duration'] if entry else None
+
+    def test_durations(self, source):
+        entry = self.suites.get(source_key(source))
+        return dict(entry['tests']) if entry else {}
+
+    def default_duration(self):
+        """Estimate used for suites that never ran: the mean known suite duration"""
+        known = [entry['duration'] for entry in self.suites.values() if entry['duration'] > 0]
+        return sum(known) / len(known) if known else DEFAULT_DURATION
+
+    def estimate_jobs(self, sources, test_level=False):
+        """Return a mapping of pabot execution item line to expected duration"""
+        default = self.default_duration()
+        jobs = {}
+        for source in sources:
+            suite_name = pabot_suite_name(source, len(sources))
+            tests = self.test_durations(source) if test_level else {}
+            if tests:
+                for test_name, duration in tests.items():
+                    jobs[f"--test {suite_name}.{test_name}"] = duration
+            else:
+                duration = self.suite_duration(source)
+                jobs[f"--suite {suite_name}"] = duration if duration is not None else default
+        return jobs
+
+    def has_history(self, sources):
+        return any(source_key(source) in self.suites for source in sources)
+
+    def predict_makespan(self, sources, processes, test_level=False):
+        """Predicted wall-clock seconds for running the sources with pabot"""
+        _, makespan = lpt_schedule(self.estimate_jobs(sources, test_level), processes)
+        return makespan
+
+    def write_ordering_file(self, sources, processes, test_level=False, path=None):
+        """Write a pabot --ordering file dispatching the longest jobs first"""
+        path = path or app_data_path("pabot_ordering.txt")
+        order, _ = lpt_schedule(self.estimate_jobs(sources, test_level), processes)
+        with open(path, "w", encoding="utf-8") as ordering_file:
+            ordering_file.writelines(line + "\n" for line in order)
+        return path
+
+
+def format_duration(seconds):
+    """Format seconds as a short human readable duration"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds}s"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes}m {seconds:02d}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes:02d}m"
@@ -0,0 +1,133 @@
+from bisect import bisect_left
+
+MAX_CACHED_WORDS = 256
+MAX_SHORT_WORDS = 32
+
+
+def word_grams(word):
+    """The substrings of one to three characters of a word"""
+    return {word[i:i + size] for size in (1, 2, 3) for i in range(len(word) - size + 1)}
+
+
+class SearchIndex:
+    """N-gram index answering as-you-type searches over discovered suites and tests.
+
+    A test matches when every query word (case-insensitive, in any order) is
+    part of a word of its name or documentation, or of its suite's path,
+    name or documentation. Words are indexed once in a vocabulary whose
+    1-, 2- and 3-grams point to the vocabulary words containing them, so a
+    query word only checks the vocabulary words sharing all its trigrams
+    instead of scanning every test. A suite and its tests get consecutive
+    entry ids, which keeps matching and intersecting query words to set
+    operations on ints and grouping the result to one step per suite.
+
+    Every search starts with one or two characters, which match words all
+    over the vocabulary: their entries are kept up to date as suites change
+    once computed, where the matches of longer words are simply dropped.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._word_ids = {}
+        self._words = []
+        self._grams = {}
+        # Vocabulary word id -> ids of the entries (suites and tests) using it
+        self._postings = []
+        self._entry_words = []
+        self._entry_suites = []
+        self._suite_entries = set()
+        # Suite path -> (entry id of the suite, number of tests)
+        self._suites = {}
+        self._cache = {}
+        self._short = {}
+
+    def set_suite(self, path, info):
+        """Index a suite, given as discovery info, and its tests"""
+        self.remove_suite(path)
+        first = len(self._entry_words)
+        self._add_entry(path, " ".join([path, info['name'], info['documentation']]))
+        for test in info['tests']:
+            self._add_entry(path, f"{test['name']} {test['documentation']}")
+        self._suites[path] = first, len(info['tests'])
+        self._suite_entries.add(first)
+        self._cache.clear()
+
+    def remove_suite(self, path):
+        if path not in self._suites:
+            return
+        first, count = self._suites.pop(path)
+        self._suite_entries.discard(first)
+        for entry in range(first, first + count + 1):
+            for word in self._entry_words[entry]:
+                self._postings[word].discard(entry)
+            self._entry_words[entry] = ()
+        for entries in self._short.values():
+            entries.difference_update(range(first, first + count + 1))
+        self._cache.clear()
+
+    def _add_entry(self, path, text):
+        entry = len(self._entry_words)
+        words = []
+        for word in set(text.lower().split()):
+            word_id = self._word_ids.get(word)
+            if word_id is None:
+                word_id = self._word_ids[word] = len(self._words)
+                self._words.append(word)
+                self._postings.append(set())
+                for gram in word_grams(word):
+                    self._grams.setdefault(gram, set()).add(word_id)
+            self._postings[word_id].add(entry)
+            words.append(word_id)
+        self._entry_words.append(words)
+        self._entry_suites.append(path)
+        for short_word, entries in self._short.items():
+            if any(short_word in self._words[word_id] for word_id in words):
+                entries.add(entry)
+
+    def search(self, query):
+        """Return {suite path: positions of the matching tests, or None when all of them match}"""
+        words = set(query.lower().split())
+        if not words:
+            return {}
+        matches = sorted((self._match_word(word) for word in words), key=len)
+        entries = sorted(matches[0].intersection(*matches[1:]))
+        result = {}
+        start = 0
+        while start < len(entries):
+            path = self._entry_suites[entries[start]]
+            first, count = self._suites[path]
+            end = bisect_left(entries, first + count + 1, start)
+            tests = entries[start + 1 if entries[start] == first else start:end]
+            result[path] = None if len(tests) == count else [entry - first - 1 for entry in tests]
+            start = end
+        return result
+
+    def _match_word(self, word):
+        """Return the ids of the suites and tests matching one query word, with the tests of matching suites"""
+        cached = self._cache.get(word)
+        if cached is not None:
+            return cached
+        if len(word) <= 2:
+            if word not in self._short:
+                if len(self._short) >= MAX_SHORT_WORDS:
+                    self._short.clear()
+                self._short[word] = self._word_entries(self._grams.get(word, ()))
+            entries = set(self._short[word])
+        elif len(word) == 3:
+            entries = self._word_entries(self._grams.get(word, ()))
+        else:
+            grams = sorted((self._grams.get(word[i:i + 3], set()) for i in range(len(word) - 2)), key=len)
+            entries = self._word_entries(word_id for word_id in grams[0].intersection(*grams[1:])
+                                         if word in self._words[word_id])
+        for suite_entry in entries & self._suite_entries:
+            first, count = self._suites[self._entry_suites[suite_entry]]
+            entries.update(range(first + 1, first + count + 1))
+        if len(self._cache) >= MAX_CACHED_WORDS:
+            self._cache.clear()
+        self._cache[word] = entries
+        return entries
+
+    def _word_entries(self, word_ids):
+        return set().union(*(self._postings[word_id] for word_id in word_ids))
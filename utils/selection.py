@@ -0,0 +1,30 @@
+from robot.running import TestSuite
+from utils.scheduling import source_key
+
+
+def escape_pattern(name):
+    """Escape the wildcard characters of a name used in a --test pattern"""
+    return "".join(f"[{char}]" if char in "*?[" else char for char in name)
+
+
+def filter_arguments(sources, filters):
+    """--test options running only the checked tests of partially selected suites.
+
+    ``filters`` maps the source of a partially selected suite to the names
+    of its checked tests. Robot Framework 6.1 runs a test only when it
+    matches both --suite and --test, so the fully selected suites of a run
+    with filters get a "Suite.*" --test pattern instead of a --suite one.
+    A test long name starts with the top suite name, which depends on how
+    many sources a run, pabot process or remote worker gets: each test has
+    a pattern for a single source and one for several.
+    """
+    filters = {source_key(source): names for source, names in filters.items()}
+    if not filters:
+        return []
+    args = []
+    for source in sources:
+        suite = escape_pattern(TestSuite.name_from_source(source))
+        names = filters.get(source_key(source))
+        for name in [escape_pattern(name) for name in names] if names else ["*"]:
+            args += ["--test", f"{suite}.{name}", "--test", f"*.{suite}.{name}"]
+    return args
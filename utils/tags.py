@@ -0,0 +1,106 @@
+import fnmatch
+import re
+
+
+def normalize_tag(tag):
+    """Normalize a tag the way Robot Framework compares them"""
+    return tag.lower().replace(" ", "").replace("_", "")
+
+
+def _clean(expression):
+    # "a AND NOT b" reads as "a NOT b"; Robot Framework would match nothing
+    return expression.replace(" ", "").replace("ANDNOT", "NOT").replace("&NOT", "NOT")
+
+
+def parse_tag_expression(expression):
+    """Parse a tag pattern with Robot Framework's precedence: NOT, then OR, then AND.
+
+    Returns nested tuples: ("not", first, [rest]), ("or", [parts]),
+    ("and", [parts]) or ("tag", normalized pattern).
+    """
+    return _parse(_clean(expression))
+
+
+def _parse(pattern):
+    if "NOT" in pattern:
+        first, *rest = pattern.split("NOT")
+        return ("not", _parse(first), [_parse(part) for part in rest])
+    if "OR" in pattern:
+        return ("or", [_parse(part) for part in pattern.split("OR")])
+    if "AND" in pattern or "&" in pattern:
+        return ("and", [_parse(part) for part in pattern.replace("&", "AND").split("AND")])
+    return ("tag", normalize_tag(pattern))
+
+
+def tag_arguments(expression):
+    """--include/--exclude options for a tag expression, empty for a blank one"""
+    if not expression.strip():
+        return []
+    include, *excludes = _clean(expression).split("NOT")
+    args = ["--include", include] if include else []
+    for exclude in excludes:
+        args += ["--exclude", exclude]
+    return args
+
+
+class TagIndex:
+    """Inverted tag -> tests index answering tag expressions with set operations"""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.by_tag = {}
+        self.suites = {}
+
+    def set_suite(self, path, tests):
+        """Index the tests of a suite, given as dicts with 'name' and 'tags'"""
+        self.remove_suite(path)
+        ids = []
+        for test in tests:
+            test_id = (path, test['name'])
+            ids.append((test_id, {normalize_tag(tag) for tag in test['tags']}))
+            for tag in ids[-1][1]:
+                self.by_tag.setdefault(tag, set()).add(test_id)
+        self.suites[path] = ids
+
+    def remove_suite(self, path):
+        for test_id, tags in self.suites.pop(path, ()):
+            for tag in tags:
+                tests = self.by_tag[tag]
+                tests.discard(test_id)
+                if not tests:
+                    del self.by_tag[tag]
+
+    def all_tests(self):
+        return {test_id for ids in self.suites.values() for test_id, _ in ids}
+
+    def match(self, expression):
+        """Return the (suite path, test name) pairs matching a tag expression"""
+        return self._evaluate(parse_tag_expression(expression))
+
+    def _evaluate(self, node):
+        kind = node[0]
+        if kind == "tag":
+            return self._tagged(node[1])
+        if kind == "and":
+            matches = self._evaluate(node[1][0])
+            for part in node[1][1:]:
+                matches = matches & self._evaluate(part)
+            return matches
+        if kind == "or":
+            return set().union(*(self._evaluate(part) for part in node[1]))
+        first, rest = node[1], node[2]
+        # An empty first part, as in "NOT slow", stands for every test
+        matches = self.all_tests() if first == ("tag", "") else self._evaluate(first)
+        for part in rest:
+            matches = matches - self._evaluate(part)
+        return matches
+
+    def _tagged(self, pattern):
+        if not pattern:
+            return set()
+        if not any(char in pattern for char in "*?["):
+            return set(self.by_tag.get(pattern, ()))
+        matcher = re.compile(fnmatch.translate(pattern), re.DOTALL)
+        return set().union(*(tests for tag, tests in self.by_tag.items() if matcher.match(tag)))
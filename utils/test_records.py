@@ -0,0 +1,221 @@
+from collections import namedtuple
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+# Status codes stored as int8; other statuses get the next codes of their store
+STATUSES = ('PASS', 'FAIL', 'SKIP', 'NOT RUN')
+PASS, FAIL, SKIP, NOT_RUN = range(len(STATUSES))
+# Start times are milliseconds since this naive epoch, NO_START when unknown
+EPOCH = datetime(1970, 1, 1)
+NO_START = np.iinfo(np.int64).min
+DAY_MS = 24 * 3600 * 1000
+INITIAL_CAPACITY = 64
+
+# One test of a store; start is None (and duration 0) when the status has no readable times
+TestRecord = namedtuple('TestRecord', 'suite name status start duration message')
+
+COLUMNS = {
+    'suite_ids': np.int32,
+    'name_ids': np.int32,
+    'status_codes': np.int8,
+    'starts': np.int64,
+    'durations': np.float32,
+    'message_ids': np.int32,
+}
+
+
+def to_epoch_ms(value):
+    """Milliseconds since EPOCH of a naive datetime, NO_START for None"""
+    return NO_START if value is None else (value - EPOCH) // timedelta(milliseconds=1)
+
+
+def from_epoch_ms(value):
+    return None if value == NO_START else EPOCH + timedelta(milliseconds=int(value))
+
+
+class TestRecords:
+    """Test results held as numpy columns instead of one dict per test.
+
+    Suite names, test names and messages are interned into a string table
+    and stored as int32 ids, statuses as int8 codes, start times as int64
+    milliseconds and durations as float32: about 25 bytes per test plus
+    the distinct strings. Sorting, top-k and grouping run on the columns;
+    only the rows actually shown are turned back into Python objects.
+
+    Columns grow by doubling while tests are appended; freeze() trims them
+    and makes them read-only for stores shared between threads.
+    """
+
+    def __init__(self):
+        self._strings = []
+        self._string_ids = {}
+        self._statuses = list(STATUSES)
+        self._status_codes = {status: code for code, status in enumerate(STATUSES)}
+        self._size = 0
+        self._columns = {name: np.empty(INITIAL_CAPACITY, dtype) for name, dtype in COLUMNS.items()}
+
+    @classmethod
+    def from_columns(cls, strings, statuses, columns):
+        """Rebuild a frozen store from its string table, status names and columns"""
+        records = cls()
+        records._strings = list(strings)
+        records._string_ids = {string: index for index, string in enumerate(records._strings)}
+        records._statuses = list(statuses)
+        records._status_codes = {status: code for code, status in enumerate(records._statuses)}
+        records._columns = {name: np.asarray(columns[name], dtype) for name, dtype in COLUMNS.items()}
+        records._size = len(records._columns['starts'])
+        records.freeze()
+        return records
+
+    # Building
+
+    def _intern(self, string):
+        index = self._string_ids.get(string)
+        if index is None:
+            index = self._string_ids[string] = len(self._strings)
+            self._strings.append(string)
+        return index
+
+    def status_code(self, status):
+        code = self._status_codes.get(status)
+        if code is None:
+            code = self._status_codes[status] = len(self._statuses)
+            self._statuses.append(status)
+        return code
+
+    def append(self, suite, name, status, start_ms, duration, message):
+        """Add a test; start_ms is in milliseconds since EPOCH, NO_START when unknown"""
+        if self._size == len(self._columns['starts']):
+            for column, values in self._columns.items():
+                grown = np.empty(max(INITIAL_CAPACITY, 2 * len(values)), values.dtype)
+                grown[:self._size] = values[:self._size]
+                self._columns[column] = grown
+        row = self._size
+        self._columns['suite_ids'][row] = self._intern(suite)
+        self._columns['name_ids'][row] = self._intern(name)
+        self._columns['status_codes'][row] = self.status_code(status)
+        self._columns['starts'][row] = start_ms
+        self._columns['durations'][row] = duration
+        self._columns['message_ids'][row] = self._intern(message)
+        self._size += 1
+
+    def freeze(self):
+        for column, values in self._columns.items():
+            values = values[:self._size].copy()
+            values.flags.writeable = False
+            self._columns[column] = values
+        return self
+
+    # Columns
+
+    def __len__(self):
+        return self._size
+
+    def column(self, name):
+        return self._columns[name][:self._size]
+
+    @property
+    def status_codes(self):
+        return self.column('status_codes')
+
+    @property
+    def starts(self):
+        return self.column('starts')
+
+    @property
+    def durations(self):
+        return self.column('durations')
+
+    @property
+    def strings(self):
+        return self._strings
+
+    @property
+    def statuses(self):
+        return self._statuses
+
+    def string(self, index):
+        return self._strings[index]
+
+    def count(self, status):
+        code = self._status_codes.get(status)
+        return 0 if code is None else int(np.count_nonzero(self.status_codes == code))
+
+    def timed(self):
+        """Mask of the tests with readable start and end times"""
+        return self.starts != NO_START
+
+    # Rows
+
+    def __getitem__(self, row):
+        columns = self._columns
+        return TestRecord(self._strings[columns['suite_ids'][row]], self._strings[columns['name_ids'][row]],
+                          self._statuses[columns['status_codes'][row]], from_epoch_ms(columns['starts'][row]),
+                          round(float(columns['durations'][row]), 3), self._strings[columns['message_ids'][row]])
+
+    def __iter__(self):
+        return (self[row] for row in range(self._size))
+
+    def details(self, row):
+        """One test as the dict used by the dashboard table"""
+        test = self[row]
+        return {'name': test.name, 'timestamp': test.start, 'status': test.status,
+                'duration': test.duration, 'message': test.message}
+
+    # Queries
+
+    def _rows(self, mask):
+        return np.arange(self._size) if mask is None else np.flatnonzero(mask)
+
+    def order(self, column='starts', descending=False, mask=None):
+        """Rows sorted by a column (stable, so ties keep the file order)"""
+        rows = self._rows(mask)
+        values = self.column(column)[rows]
+        if descending:
+            # Sorted backwards then reversed, so ties stay in file order
+            return rows[::-1][np.argsort(values[::-1], kind='stable')][::-1]
+        return rows[np.argsort(values, kind='stable')]
+
+    def top_k(self, k, column='durations', mask=None):
+        """The k rows with the largest values of a column, largest first and ties in file order"""
+        rows = self._rows(mask)
+        values = self.column(column)[rows]
+        if k <= 0:
+            return rows[:0]
+        if k < len(rows):
+            threshold = np.partition(values, len(rows) - k)[len(rows) - k]
+            above = np.flatnonzero(values > threshold)
+            ties = np.flatnonzero(values == threshold)[:k - len(above)]
+            keep = np.sort(np.concatenate([above, ties]))
+            rows, values = rows[keep], values[keep]
+        return rows[np.argsort(-values.astype(np.float64), kind='stable')]
+
+    def group_count(self, column, mask=None):
+        """Distinct values of a column with their number of rows, most frequent first.
+
+        ``column`` is a column name, or 'day' to group start times by day.
+        """
+        rows = self._rows(mask)
+        values = self.starts[rows] // DAY_MS if column == 'day' else self.column(column)[rows]
+        keys, counts = np.unique(values, return_counts=True)
+        order = np.argsort(-counts, kind='stable')
+        return keys[order], counts[order]
+
+    def select(self, mask):
+        """A frozen store of the rows of a mask, with the same string table"""
+        return TestRecords.from_columns(self._strings, self._statuses,
+                                        {name: self.column(name)[mask] for name in COLUMNS})
+
+    def to_frame(self, mask=None):
+        """The tests as a DataFrame with the columns of the Excel exports"""
+        rows = self._rows(mask)
+        strings = np.array(self._strings, dtype=object)
+        return pd.DataFrame({
+            'Test Name': strings[self.column('name_ids')[rows]],
+            # NO_START is the int64 value numpy reads as NaT
+            'Timestamp': self.starts[rows].view('datetime64[ms]'),
+            'Status': np.array(self._statuses, dtype=object)[self.status_codes[rows]],
+            'Duration (s)': np.round(self.durations[rows].astype(np.float64), 3),
+            'Message': strings[self.column('message_ids')[rows]],
+        })
@@ -1,50 +1,306 @@
 import os
-import subprocess
+import sqlite3
+import tempfile
 import time
+from xml.parsers.expat import ExpatError
 from openpyxl import Workbook
-from robot.api import ExecutionResult
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt
 from PyQt6 import QtCore
 from PyQt6.QtGui import QMovie, QPixmap
-from PyQt6.QtWidgets import QListWidgetItem, QMessageBox
+from PyQt6.QtWidgets import QMessageBox
 from utils.resource_utils import resource_path
 from utils.display_utils import show_cross
+from utils.discovery import DEFAULT_IGNORE_PATTERNS, parse_patterns
+from utils.scheduling import format_duration, source_key
+from utils.selection import filter_arguments
+from utils.tags import tag_arguments
+from utils.run_queue import QUEUE_DIR_NAME, RunJob, parse_variables
+from utils.distributed import DistributedError, DistributedRun, combine_outputs, parse_workers
+from utils.result_cache import cache_key, copy_cached_output
+from utils.results_model import read_output, root_suite_name
+from utils.concurrency import available_memory, choose_process_count, cpu_count, serial_seconds
 from openpyxl.chart import BarChart, Reference
 import traceback
 from openpyxl.styles import Font, PatternFill
 from openpyxl.utils import get_column_letter
 
+REPORT_TITLE = "AUTOS TESTS - REPORT"
+LOG_TITLE = "AUTOS TESTS - LOG"
+FIRST_RUN_OUTPUT = "output_first_run.xml"
+RERUN_OUTPUT = "output_rerun.xml"
+UNCACHED_OUTPUT = "output_uncached.xml"
+CACHED_OUTPUTS_DIR = "cached"
+EXPAND_SEARCH_RESULTS = 20
+
 def load_tests(window):
-    window.testList.clear()
+    """Scan the test directory recursively in the background, listing suites as they are found"""
+    # Suites and tests checked before a refresh are checked again when they show up
+    model = window.test_model
+    window.restore_checks = {}
+    for path in model.paths():
+        if model.check_state(path) == Qt.CheckState.Checked:
+            window.restore_checks[path] = None
+        elif model.check_state(path) == Qt.CheckState.PartiallyChecked:
+            window.restore_checks[path] = set(model.checked_tests(path))
+    model.clear()
+    window.tag_index.clear()
+    window.search_index.clear()
+    window.scanned_folders = {}
+    window.suite_watcher.watch(window.test_directory)
+    if not window.test_directory:
+        return
     window.loadingLabel.show()
     loading_gif_path = resource_path("images/loading.gif")
     window.loading_movie = QMovie(loading_gif_path)
     window.loading_movie.setScaledSize(QtCore.QSize(45, 45))
     window.loadingLabel.setMovie(window.loading_movie)
-    window.loading_movie.start()
-    QTimer.singleShot(1500, lambda: populate_tests(window))
+    window.loading_movie.jumpToFrame(0)
+    window.test_discovery.start(window.test_directory, discovery_patterns(window), excluded=[window.output_directory])
+
+def rescan_folders(window, folders):
+    """Rescan the folders the file system watcher reported as changed"""
+    if window.test_directory:
+        window.test_discovery.start(window.test_directory, discovery_patterns(window), excluded=[window.output_directory],
+                                    folders=folders, known=set(window.scanned_folders))
+
+def discovery_patterns(window):
+    return parse_patterns(window.settings.value("discovery_ignore_patterns", DEFAULT_IGNORE_PATTERNS, type=str))
+
+def update_folder(window, folder, suites, subfolders):
+    """Apply the scan of one folder to the test list, leaving unchanged items (and their check state) alone"""
+    found = dict(suites)
+    previous = window.scanned_folders.get(folder)
+    if previous:
+        for path in previous['files'] - set(found):
+            _remove_suite(window, path)
+        for subfolder in previous['subfolders'] - set(subfolders):
+            _forget_folder(window, subfolder)
+
+    model = window.test_model
+    for path, info in suites:
+        if not model.contains(path):
+            model.set_suite(path, info, window.restore_checks.get(path, set()))
+        elif model.info(path) != info:
+            checked = None if model.check_state(path) == Qt.CheckState.Checked else set(model.checked_tests(path))
+            model.set_suite(path, info, checked)
+        else:
+            continue
+        window.tag_index.set_suite(path, info['tests'])
+        window.search_index.set_suite(path, info)
+    window.scanned_folders[folder] = {'files': set(found), 'subfolders': set(subfolders)}
+    window.suite_watcher.add_folder(folder, list(found))
+
+def _remove_suite(window, path):
+    window.test_model.remove_suite(path)
+    window.tag_index.remove_suite(path)
+    window.search_index.remove_suite(path)
+
+def _forget_folder(window, folder):
+    """Drop the items and watches of a removed folder and of its sub folders"""
+    entry = window.scanned_folders.pop(folder, None)
+    if entry:
+        for path in entry['files']:
+            _remove_suite(window, path)
+        for subfolder in entry['subfolders']:
+            _forget_folder(window, subfolder)
+    window.suite_watcher.remove_folder(folder)
+
+def apply_search(window):
+    """Show only the suites and tests matching the search box, expanding the suites when few match"""
+    query = window.searchInput.text()
+    if not query.strip():
+        window.test_model.set_filter(None)
+        return
+    window.test_model.set_filter(window.search_index.search(query))
+    if window.test_model.rowCount() <= EXPAND_SEARCH_RESULTS:
+        window.testList.expandAll()
+
+def show_discovery_progress(window, folders, suites):
+    """Turn the spinner once per scanned folder"""
+    window.loading_movie.jumpToNextFrame()
+    window.loadingLabel.setToolTip(f"Scanned {folders} folder(s), found {suites} suite(s)")
 
-def populate_tests(window):
+def finish_discovery(window):
+    window.restore_checks = {}
+    apply_search(window)
+    update_tag_matches(window)
     window.loading_movie.stop()
     window.loadingLabel.clear()
+    count = window.test_model.rowCount()
+    window.loadingLabel.setToolTip(f"{count} suite(s) found")
 
-    if window.test_directory:
-        test_files = [file for file in os.listdir(window.test_directory) if file.endswith(".robot")]
+    if not count:
+        show_cross(window)
+        window.label.setStyleSheet("color: #ad402a")
+    else:
+        window.label.setStyleSheet("color: green")
+        check_icon_path = resource_path("images/check.png")
+        check_pixmap = QPixmap(check_icon_path).scaled(27, 27, QtCore.Qt.AspectRatioMode.KeepAspectRatio)
+        window.loadingLabel.setPixmap(check_pixmap)
+        window.loadingLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        if not test_files:
-            show_cross(window)
-            window.label.setStyleSheet("color: #ad402a")
-        else:
-            for file in test_files:
-                item = QListWidgetItem(file)
-                item.setCheckState(Qt.CheckState.Unchecked)
-                window.testList.addItem(item)
+def fail_discovery(window, message):
+    print(message)
+    window.loading_movie.stop()
+    window.loadingLabel.clear()
+    window.loadingLabel.setToolTip(message)
+    show_cross(window)
+    window.label.setStyleSheet("color: #ad402a")
+
+def get_selected_tests(window):
+    """Return the paths of the test files with at least one checked test matching the tag expression"""
+    return [os.path.join(window.test_directory, path) for path, _ in _suite_selection(window)]
+
+def get_test_filters(window):
+    """Return {path: selected test names} of the test files that only run some of their tests"""
+    return {os.path.join(window.test_directory, path): names
+            for path, names in _suite_selection(window) if names is not None}
+
+def _suite_selection(window):
+    """Yield (path, selected test names or None for the whole suite) of the suites to run"""
+    model = window.test_model
+    matches = tag_matches(window)
+    for path in model.paths():
+        state = model.check_state(path)
+        if state == Qt.CheckState.Unchecked:
+            continue
+        if matches is None and state == Qt.CheckState.Checked:
+            yield path, None
+            continue
+        names = model.checked_tests(path)
+        if matches is not None:
+            names = [name for name in names if (path, name) in matches]
+        if names and len(names) == model.test_count(path):
+            yield path, None
+        elif names:
+            yield path, names
+
+def tag_matches(window):
+    """Return the (suite path, test name) pairs matching the tag expression, None without one"""
+    expression = window.tagExpressionInput.text()
+    return window.tag_index.match(expression) if expression.strip() else None
+
+def update_tag_matches(window):
+    """Show how many tests match the tag expression and how many of those are checked"""
+    matches = tag_matches(window)
+    if matches is None:
+        window.tagMatchLabel.setText("")
+        return
+    selected = sum(len(names) if names is not None else window.test_model.test_count(path)
+                   for path, names in _suite_selection(window))
+    window.tagMatchLabel.setText(f"{len(matches)} matching test(s), {selected} selected")
+
+def selection_arguments(window, selected_tests, filters):
+    """--test, --include and --exclude options running only the selected tests"""
+    return filter_arguments(selected_tests, filters) + tag_arguments(window.tagExpressionInput.text())
 
-            window.label.setStyleSheet("color: green")
-            check_icon_path = resource_path("images/check.png")
-            check_pixmap = QPixmap(check_icon_path).scaled(27, 27, QtCore.Qt.AspectRatioMode.KeepAspectRatio)
-            window.loadingLabel.setPixmap(check_pixmap)
-            window.loadingLabel.setAlignment(Qt.AlignmentFlag.AlignCenter)
+def run_options(window):
+    """Options shared by a run and its rerun of failures: live results, timeout, variables and tags.
+
+    The --test filter of partially selected suites is left out: robot runs
+    the union of --test and --rerunfailed, which would rerun every
+    selected test instead of the failed ones.
+    """
+    # Stream per-test results to the dashboard while the run is in progress
+    try:
+        options = window.live_results.listener_arguments()
+    except RuntimeError as e:
+        print(f"Live results disabled: {e}")
+        options = []
+    return (options + timeout_arguments(window) + parse_variables(window.variablesInput.text())
+            + tag_arguments(window.tagExpressionInput.text()))
+
+def scheduling_arguments(window, selected_tests, num_processes, ordering_path=None):
+    """Pabot options dispatching the historically longest suites first"""
+    test_level = window.settings.value("test_level_split", False, type=bool)
+    args = ["--testlevelsplit"] if test_level else []
+    try:
+        ordering_file = window.timing_history.write_ordering_file(
+            selected_tests, int(num_processes), test_level, ordering_path)
+        args += ["--ordering", ordering_file]
+    except OSError as e:
+        print(f"Cannot write pabot ordering file: {e}")
+    return args
+
+def timeout_arguments(window):
+    """Options applying the default test timeout to tests that do not define one"""
+    timeout = window.settings.value("default_timeout", 300, type=int)
+    listener = resource_path("listeners/TestTimeoutListener.py")
+    return ["--listener", f"{listener}:{timeout}"]
+
+def auto_process_count(window, selected_tests):
+    """Process count minimizing the predicted run time on this machine"""
+    test_level = window.settings.value("test_level_split", False, type=bool)
+    count, _ = choose_process_count(
+        window.timing_history.estimate_jobs(selected_tests, test_level),
+        cpu_count(), available_memory(), window.concurrency_history.worker_memory(),
+        window.processInput.maximum())
+    return count
+
+def update_predicted_duration(window):
+    """Show the predicted wall-clock time of the selection next to the process count"""
+    selected_tests = get_selected_tests(window) if window.test_directory else []
+    if selected_tests and window.autoProcessCheckBox.isChecked():
+        window.processInput.setValue(auto_process_count(window, selected_tests))
+    if not selected_tests or not window.timing_history.has_history(selected_tests):
+        window.predictionLabel.setText("")
+        return
+
+    test_level = window.settings.value("test_level_split", False, type=bool)
+    makespan = window.timing_history.predict_makespan(
+        selected_tests, window.processInput.value(), test_level)
+    window.predictionLabel.setText(f"Predicted duration: ~{format_duration(makespan)}")
+
+def build_command(window, selected_tests, output_directory, num_processes, extra_args=(), ordering_path=None):
+    """Build the robot or pabot command running the selected suites"""
+    if num_processes == "1":
+        return ["robot", "-d", output_directory] + list(extra_args) + selected_tests
+    return ["pabot", "--processes", num_processes] + scheduling_arguments(
+               window, selected_tests, num_processes, ordering_path) + [
+           "--outputdir", output_directory,
+           "--reporttitle", REPORT_TITLE, "--logtitle", LOG_TITLE] + list(extra_args) + selected_tests
+
+def enqueue_selection(window):
+    """Add the selected tests to the run queue with the queue options of the main page"""
+    if not window.test_directory or not window.output_directory:
+        window.resultLabel.setText("Veuillez sélectionner un dossier et un emplacement pour les résultats.")
+        window.resultLabel.setStyleSheet("color: #ad402a; font: bold")
+        return None
+
+    selected_tests = get_selected_tests(window)
+    if not selected_tests:
+        window.resultLabel.setText("Veuillez sélectionner au moins un test.")
+        window.resultLabel.setStyleSheet("color: #ad402a; font: bold")
+        return None
+
+    variables = window.variablesInput.text().strip()
+    try:
+        variable_args = parse_variables(variables)
+    except ValueError as e:
+        window.resultLabel.setText(str(e))
+        window.resultLabel.setStyleSheet("color: #ad402a; font: bold")
+        return None
+
+    if window.autoProcessCheckBox.isChecked():
+        window.processInput.setValue(auto_process_count(window, selected_tests))
+    num_processes = window.processInput.text()
+
+    names = [os.path.splitext(os.path.basename(source))[0] for source in selected_tests]
+    name = names[0] if len(names) == 1 else f"{names[0]} +{len(names) - 1}"
+    queue_directory = os.path.join(window.output_directory, QUEUE_DIR_NAME)
+    os.makedirs(queue_directory, exist_ok=True)
+    output_directory = tempfile.mkdtemp(prefix=time.strftime("%Y%m%d-%H%M%S_"), dir=queue_directory)
+    command = build_command(window, selected_tests, output_directory, num_processes,
+                            variable_args + timeout_arguments(window)
+                            + selection_arguments(window, selected_tests, get_test_filters(window)),
+                            os.path.join(output_directory, "pabot_ordering.txt"))
+
+    job = RunJob(name, command, window.test_directory, output_directory, num_processes,
+                 window.priorityInput.value(), variables)
+    window.run_queue.add(job)
+    window.resultLabel.setText(f"'{name}' added to the run queue ({window.run_queue.pending_count()} waiting)")
+    window.resultLabel.setStyleSheet("color: green")
+    return job
 
 def run_tests(window):
     try:
@@ -60,9 +316,7 @@ def run_tests(window):
             window.resultLabel.setStyleSheet("color: #ad402a; font: bold")
             return False
         
-        selected_tests = [os.path.join(window.test_directory, window.testList.item(i).text())
-                         for i in range(window.testList.count())
-                         if window.testList.item(i).checkState() == Qt.CheckState.Checked]
+        selected_tests = get_selected_tests(window)
         
         if not selected_tests:
             window.resultLabel.setStyleSheet("color: none")
@@ -70,45 +324,199 @@ def run_tests(window):
             window.resultLabel.setStyleSheet("color: #ad402a; font: bold")
             return False
         
+        auto_processes = window.autoProcessCheckBox.isChecked()
+        if auto_processes:
+            window.processInput.setValue(auto_process_count(window, selected_tests))
         num_processes = window.processInput.text()
-        repport_title = "AUTOS TESTS - REPORT"
-        log_title = "AUTOS TESTS - LOG"
 
         # Ensure output directory exists
         os.makedirs(window.output_directory, exist_ok=True)
 
-        if num_processes == "1":
-            command = ["robot", "-d", window.output_directory] + selected_tests
-        else:
-            command = ["pabot", "--processes", num_processes, "--outputdir", window.output_directory, 
-                      "--reporttitle", repport_title, "--logtitle", log_title] + selected_tests
-        
-        # Run tests
-        process = subprocess.Popen(command, cwd=window.test_directory)
-        process.wait()
+        # Reuse the results of suites that recently passed with the same inputs
+        all_selected = selected_tests
+        filters = get_test_filters(window)
+        selected_tests, cache_keys, cached_outputs = split_cached_tests(window, selected_tests, filters)
+        if not selected_tests:
+            window.run_context = {'stage': 'run', 'sources': all_selected, 'processes': num_processes,
+                                  'options': [], 'cache_keys': {}, 'cached_outputs': cached_outputs}
+            return _merge_cached_outputs(window, window.run_context, None)
+
+        if window.settings.value("distributed_enabled", False, type=bool):
+            return run_distributed_tests(window, selected_tests, num_processes, cache_keys, cached_outputs, filters)
 
-        # Wait for output.xml to be generated
+        options = run_options(window)
+        command = build_command(window, selected_tests, window.output_directory, num_processes,
+                                options + filter_arguments(selected_tests, filters))
+
+        # Run tests asynchronously, results are shown once the engine reports completion
+        window.run_context = {'stage': 'run', 'sources': selected_tests, 'processes': num_processes,
+                              'options': options, 'auto_processes': auto_processes, 'worker_peaks': [],
+                              'impact_snapshot': impact_snapshot(window, selected_tests, filters),
+                              'cache_keys': cache_keys, 'cached_outputs': cached_outputs}
         output_path = os.path.join(window.output_directory, "output.xml")
-        max_wait = 15  
-        wait_interval = 0.5  
+        return window.execution_engine.start(command, window.test_directory, output_path)
+
+    except Exception as e:
+        QMessageBox.critical(
+            window,
+            "Test Execution Error",
+            f"Failed to run tests: {str(e)}"
+        )
+        return False
+
+def run_distributed_tests(window, selected_tests, num_processes, cache_keys=None, cached_outputs=(), filters=None):
+    """Split the selected suites across the configured workers"""
+    workers = parse_workers(window.settings.value("distributed_workers", "", type=str))
+    if not workers:
+        raise DistributedError("No worker configured in Settings > Distributed Execution")
+    distributed_run = DistributedRun(workers, window.settings.value("distributed_token", "", type=str))
+    window.run_context = {'stage': 'run', 'sources': selected_tests, 'processes': num_processes,
+                          'distributed': True, 'options': run_options(window),
+                          'impact_snapshot': impact_snapshot(window, selected_tests, filters or {}),
+                          'cache_keys': cache_keys or {}, 'cached_outputs': list(cached_outputs)}
+    return window.distributed_runner.start(
+        distributed_run, selected_tests, window.test_directory, window.output_directory,
+        options=parse_variables(window.variablesInput.text()) + selection_arguments(window, selected_tests, filters or {}),
+        test_timeout=window.settings.value("default_timeout", 300, type=int),
+        timing_history=window.timing_history,
+        report_options=["--reporttitle", REPORT_TITLE, "--logtitle", LOG_TITLE],
+        run_timeout=window.settings.value("run_timeout", 0, type=int) * 60)
 
-        for _ in range(int(max_wait / wait_interval)):
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                break
-            time.sleep(wait_interval)
+def split_cached_tests(window, selected_tests, filters=None):
+    """Return the suites to run, their cache keys and the cached outputs of the skipped ones"""
+    if not window.settings.value("result_cache_enabled", False, type=bool):
+        return selected_tests, {}, []
+    # Results depend on the variables, and a tag selection runs only part of a suite
+    options = parse_variables(window.variablesInput.text()) + tag_arguments(window.tagExpressionInput.text())
+    force_run = window.forceRunCheckBox.isChecked()
+    to_run, cache_keys, cached_outputs = [], {}, []
+    cached_dir = os.path.join(window.output_directory, CACHED_OUTPUTS_DIR)
+    for source in selected_tests:
+        # Only whole suites are cached, suites run with a --test filter never are
+        if filters and source in filters:
+            to_run.append(source)
+            continue
+        key = cache_key(window.impact_index, source, window.test_directory, options)
+        cached = None if force_run else window.result_cache.lookup(key)
+        if cached:
+            cached_outputs.append(copy_cached_output(cached, cached_dir, len(cached_outputs)))
         else:
-            raise FileNotFoundError(f"output.xml not generated after {max_wait} seconds")
+            to_run.append(source)
+            cache_keys[source_key(source)] = key
+    window.impact_index.save()
+    return to_run, cache_keys, cached_outputs
+
+def impact_snapshot(window, selected_tests, filters):
+    """Input state of the fully selected suites, the only ones that can become green"""
+    whole_suites = [source for source in selected_tests if source not in filters]
+    return window.impact_index.snapshot(whole_suites, window.test_directory)
+
+def continue_run(window, output_path):
+    """Start the next stage of a run (rerun of failures, merges); return True while one is pending"""
+    context = window.run_context
+    stage = context.get('stage')
+    try:
+        # A run aborted by the watchdog has no budget left for a rerun
+        if stage == 'run' and not context.get('aborted') and window.settings.value("retry_failed", False, type=bool):
+            failed = window.results_model.snapshot(output_path).failed
+            if failed:
+                return _rerun_failed_tests(window, context, output_path, failed)
+        elif stage == 'rerun':
+            return _merge_rerun_outputs(window, context, output_path)
+    except Exception as e:
+        print(f"Retrying failed tests aborted: {e}")
+        restore_first_run_output(window)
+
+    try:
+        if context.get('cached_outputs') and context.get('stage') != 'cache':
+            return _merge_cached_outputs(window, context, output_path)
+    except Exception as e:
+        print(f"Merging cached results aborted: {e}")
+        restore_first_run_output(window)
+    return False
+
+def _rerun_failed_tests(window, context, output_path, failed):
+    """Run only the failed tests again, spread over the configured processes"""
+    first_output = os.path.join(window.output_directory, FIRST_RUN_OUTPUT)
+    os.replace(output_path, first_output)
+    # Same variables, tags, timeout and live results as the first run
+    rerun_options = ["--rerunfailed", first_output, "--outputdir", window.output_directory,
+                     "--output", RERUN_OUTPUT, "--log", "NONE", "--report", "NONE"] + context['options']
+    # With several sources the root suite is named after all of them, and rebot --merge
+    # only accepts a rerun of the same root, even when it has failures in some sources only
+    name = root_suite_name(first_output)
+    if name:
+        rerun_options += ["--name", name]
+    if context['processes'] == "1":
+        command = ["robot"] + rerun_options + context['sources']
+    else:
+        command = ["pabot", "--processes", context['processes'], "--testlevelsplit"] + rerun_options + context['sources']
+
+    window.resultLabel.setText(f"Retrying {failed} failed test(s)...")
+    window.resultLabel.setStyleSheet("color: none")
+    context['stage'] = 'rerun'
+    return window.execution_engine.start(command, window.test_directory,
+                                         os.path.join(window.output_directory, RERUN_OUTPUT))
+
+def _merge_rerun_outputs(window, context, rerun_output):
+    """Merge the rerun into the first output so the final verdicts are reported"""
+    first_output = os.path.join(window.output_directory, FIRST_RUN_OUTPUT)
+    command = ["rebot", "--merge", "--outputdir", window.output_directory, "--output", "output.xml",
+               "--reporttitle", REPORT_TITLE, "--logtitle", LOG_TITLE, first_output, rerun_output]
+    context['stage'] = 'merge'
+    return window.execution_engine.start(command, window.test_directory,
+                                         os.path.join(window.output_directory, "output.xml"))
 
-        # Process results
-        result = ExecutionResult(output_path)
+def _merge_cached_outputs(window, context, output_path):
+    """Combine the executed suites with the cached ones and rebuild the log and report"""
+    final_output = os.path.join(window.output_directory, "output.xml")
+    outputs = list(context['cached_outputs'])
+    # Set first, so restore_first_run_output puts the executed suites back if combining fails
+    context['stage'] = 'cache'
+    if output_path and os.path.exists(output_path):
+        uncached_output = os.path.join(window.output_directory, UNCACHED_OUTPUT)
+        os.replace(output_path, uncached_output)
+        outputs.insert(0, uncached_output)
+    combine_outputs(outputs, final_output)
+    command = ["rebot", "--outputdir", window.output_directory, "--output", "NONE",
+               "--reporttitle", REPORT_TITLE, "--logtitle", LOG_TITLE, final_output]
+
+    window.resultLabel.setText(f"Adding {len(context['cached_outputs'])} cached suite result(s)...")
+    window.resultLabel.setStyleSheet("color: none")
+    return window.execution_engine.start(command, window.test_directory, final_output)
+
+def restore_first_run_output(window):
+    """Fall back to the first run results when the rerun or a merge did not complete"""
+    context = window.run_context
+    first_output = os.path.join(window.output_directory, FIRST_RUN_OUTPUT)
+    uncached_output = os.path.join(window.output_directory, UNCACHED_OUTPUT)
+    if context.get('stage') in ('rerun', 'merge') and os.path.exists(first_output):
+        os.replace(first_output, os.path.join(window.output_directory, "output.xml"))
+        context['stage'] = 'done'
+        return True
+    if context.get('stage') == 'cache' and os.path.exists(uncached_output):
+        os.replace(uncached_output, os.path.join(window.output_directory, "output.xml"))
+        context['stage'] = 'done'
+        return True
+    return False
+
+def show_results(window, output_path):
+    """Display the summary of a finished run in the result label"""
+    try:
+        result = window.results_model.execution_result(output_path)
+        # Reuse this parse to feed the duration history used for scheduling
+        window.timing_history.record_result(result)
+        record_concurrency(window, result)
+        record_green_suites(window, result)
+        cache_passed_suites(window, result)
+        snapshot = window.results_model.snapshot(output_path)
+        record_history(window, snapshot)
         
-        if result.suite.statistics.failed >= 1:
-            window.resultLabel.setStyleSheet("color: none")
-            window.resultLabel.setText(f"Total: {result.suite.statistics.total} | Passés: {result.suite.statistics.passed} | Échoués: {result.suite.statistics.failed}")
+        window.resultLabel.setStyleSheet("color: none")
+        window.resultLabel.setText(f"Total: {len(snapshot.tests)} | Passés: {snapshot.passed} | Échoués: {snapshot.failed}")
+        if snapshot.failed >= 1:
             window.resultLabel.setStyleSheet("color: #ad402a; font: bold")
         else:
-            window.resultLabel.setStyleSheet("color: none")
-            window.resultLabel.setText(f"Total: {result.suite.statistics.total} | Passés: {result.suite.statistics.passed} | Échoués: {result.suite.statistics.failed}")
             window.resultLabel.setStyleSheet("color: green; font: bold")
         
         return True
@@ -117,10 +525,87 @@ def run_tests(window):
         QMessageBox.critical(
             window,
             "Test Execution Error",
-            f"Failed to run tests: {str(e)}"
+            f"Failed to read test results: {str(e)}"
         )
         return False
 
+def select_affected_tests(window):
+    """Check only the suites whose inputs changed since they last passed; return their count"""
+    if not window.test_directory:
+        return 0
+    model = window.test_model
+    paths = model.paths()
+    sources = [os.path.join(window.test_directory, path) for path in paths]
+    affected = set(window.impact_index.affected(sources, window.test_directory))
+    model.set_all_checked(False)
+    for path, source in zip(paths, sources):
+        if source in affected:
+            model.set_suite_checked(path, True)
+    return len(affected)
+
+def cache_passed_suites(window, result):
+    """Store the outputs of the executed suites that passed in the result cache"""
+    cache_keys = window.run_context.pop('cache_keys', None)
+    if not cache_keys:
+        return
+    suites = [result.suite]
+    while suites:
+        suite = suites.pop()
+        if suite.source and os.path.isfile(str(suite.source)):
+            key = cache_keys.get(source_key(suite.source))
+            if key and suite.status == 'PASS':
+                window.result_cache.store(key, suite)
+        else:
+            suites.extend(suite.suites)
+    window.result_cache.evict()
+
+def record_green_suites(window, result):
+    """Record the inputs of the suites that passed as their last green state"""
+    snapshot = window.run_context.pop('impact_snapshot', None)
+    if snapshot is None:
+        return
+    passed = []
+    suites = [result.suite]
+    while suites:
+        suite = suites.pop()
+        if suite.source and os.path.isfile(str(suite.source)):
+            if suite.status == 'PASS':
+                passed.append(str(suite.source))
+        else:
+            suites.extend(suite.suites)
+    window.impact_index.record_green(snapshot, passed)
+
+def record_concurrency(window, result):
+    """Record the process count, speedup and worker memory of the finished run"""
+    context = window.run_context
+    if 'wall_seconds' not in context or context.get('distributed'):
+        return
+    window.concurrency_history.record_worker_peaks(context['worker_peaks'])
+    speedup = window.concurrency_history.record_run(
+        context['processes'], context['auto_processes'], context.pop('wall_seconds'), serial_seconds(result.suite))
+    mode = "auto" if context['auto_processes'] else "manual"
+    window.autoProcessCheckBox.setToolTip(
+        f"Last run: {context['processes']} process(es) ({mode}), speedup x{speedup:.1f}")
+
+def record_history(window, snapshot):
+    """Add the finished run to the run history, which outlives the results folder.
+
+    Suites reused from the result cache did not run again: their tests are
+    left out, and the run starts when it was launched, not at their old times.
+    """
+    context = window.run_context
+    tests = snapshot.tests
+    try:
+        cached = set()
+        for cached_output in context.get('cached_outputs', ()):
+            cached.update((test.suite, test.name) for test in read_output(cached_output).tests)
+        if cached:
+            tests = tests.select([(test.suite, test.name) not in cached for test in tests])
+        if len(tests):
+            window.run_history.record_run(tests, context.get('processes') or 1, started=context.get('started_at'))
+    except (sqlite3.Error, OSError, ValueError, ExpatError) as e:
+        print(f"Error recording run history: {e}")
+
 def open_report(window):
     report_path = os.path.join(window.output_directory, "report.html")
     if os.path.exists(report_path):
@@ -156,7 +641,7 @@ def export_results(window):
             return
 
         # Process test results
-        result = ExecutionResult(output_xml)
+        snapshot = window.results_model.snapshot(output_xml)
         wb = Workbook()
         ws = wb.active
         ws.title = "Test Results"
@@ -172,21 +657,19 @@ def export_results(window):
         failed_count = 0
 
         # Populate test data with status formatting
-        for suite in result.suite.suites:
-            for test in suite.tests:
-                status = "Passed" if test.passed else "Failed"
-                duration = getattr(test.elapsed_time, 'total_seconds', lambda: 0)()
-                ws.append([suite.name, test.name, status, duration])
-
-                status_cell = ws.cell(row=ws.max_row, column=3)
-                if test.passed:
-                    passed_count += 1
-                    status_cell.fill = PatternFill(start_color="C6EFCE", fill_type="solid")
-                    status_cell.font = Font(color="006100")
-                else:
-                    failed_count += 1
-                    status_cell.fill = PatternFill(start_color="FFC7CE", fill_type="solid")
-                    status_cell.font = Font(color="9C0006")
+        for test in snapshot.tests:
+            passed = test.status == 'PASS'
+            ws.append([test.suite, test.name, "Passed" if passed else "Failed", test.duration])
+
+            status_cell = ws.cell(row=ws.max_row, column=3)
+            if passed:
+                passed_count += 1
+                status_cell.fill = PatternFill(start_color="C6EFCE", fill_type="solid")
+                status_cell.font = Font(color="006100")
+            else:
+                failed_count += 1
+                status_cell.fill = PatternFill(start_color="FFC7CE", fill_type="solid")
+                status_cell.font = Font(color="9C0006")
 
         # Add summary section
         ws.append([])  # Empty row
@@ -0,0 +1,72 @@
+import time
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from robot.utils import timestr_to_secs
+
+
+class RunWatchdog(QObject):
+    """Enforces per-test and per-run time limits from outside the robot processes.
+
+    Robot Framework fails a test when its own timeout expires, but a keyword
+    stuck in native code (a hung browser, a blocking socket read) can keep the
+    worker alive forever. The watchdog follows the live listener events and
+    reports a timeout once a test overruns its limit by GRACE_SECONDS, or when
+    the whole run exceeds its budget.
+    """
+    timed_out = pyqtSignal(str)
+
+    GRACE_SECONDS = 30
+    CHECK_INTERVAL_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.test_timeout = 0
+        self.run_timeout = 0
+        self.run_started = 0
+        self.running_tests = {}
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.CHECK_INTERVAL_MS)
+        self.timer.timeout.connect(self._check)
+
+    def start(self, test_timeout, run_timeout=0):
+        """Start watching a run; a limit of 0 disables it"""
+        self.test_timeout = test_timeout
+        self.run_timeout = run_timeout
+        self.run_started = time.monotonic()
+        self.running_tests = {}
+        self.timer.start()
+
+    def resume(self):
+        """Watch a follow-up stage of the run (rerun, merge) with the time left of its budget"""
+        self.running_tests = {}
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        self.running_tests = {}
+
+    def test_started(self, event):
+        limit = self._timeout_of(event)
+        if limit:
+            self.running_tests[event.get('longname', '')] = (time.monotonic(), limit)
+
+    def test_ended(self, event):
+        self.running_tests.pop(event.get('longname', ''), None)
+
+    def _timeout_of(self, event):
+        try:
+            return timestr_to_secs(event['timeout'])
+        except (KeyError, ValueError, TypeError):
+            return self.test_timeout
+
+    def _check(self):
+        now = time.monotonic()
+        if self.run_timeout and now - self.run_started > self.run_timeout:
+            self.stop()
+            self.timed_out.emit(f"Run exceeded its {self.run_timeout // 60} minute limit")
+            return
+
+        for name, (started, limit) in self.running_tests.items():
+            if now - started > limit + self.GRACE_SECONDS:
+                self.stop()
+                self.timed_out.emit(f"Test '{name}' exceeded its {limit:g} second timeout")
+                return
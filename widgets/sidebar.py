@@ -11,6 +11,7 @@ class SideBar(QWidget):
     testSelectionClicked = pyqtSignal()
     dashboardClicked = pyqtSignal()
     analyticsClicked = pyqtSignal()
+    queueClicked = pyqtSignal()
     settingsClicked = pyqtSignal()
     helpClicked = pyqtSignal()
  
@@ -54,6 +55,9 @@ class SideBar(QWidget):
         self.btn_analytics = QPushButton(QIcon(resource_path("images/analytics.png")), " Analytics")
         self.btn_analytics.setIconSize(QSize(26, 26))
  
+        self.btn_queue = QPushButton(QIcon(resource_path("images/refresh.png")), " Run Queue")
+        self.btn_queue.setIconSize(QSize(26, 26))
+ 
         self.btn_settings = QPushButton(QIcon(resource_path("images/settings.png")), " Settings")
         self.btn_settings.setIconSize(QSize(26, 26))
 
@@ -65,6 +69,7 @@ class SideBar(QWidget):
         layout.addWidget(self.btn_tests)
  
         layout.addWidget(self.btn_analytics)
+        layout.addWidget(self.btn_queue)
  
         layout.addWidget(self.btn_settings)
         layout.addWidget(self.btn_help)
@@ -77,12 +82,13 @@ class SideBar(QWidget):
         self.btn_dashboard.clicked.connect(self.dashboardClicked.emit)
         self.btn_tests.clicked.connect(self.testSelectionClicked.emit)
         self.btn_analytics.clicked.connect(self.analyticsClicked.emit)
+        self.btn_queue.clicked.connect(self.queueClicked.emit)
         self.btn_settings.clicked.connect(self.settingsClicked.emit)
         self.btn_help.clicked.connect(self.helpClicked.emit)
  
         # Style all buttons consistently
         for btn in [self.btn_dashboard, self.btn_tests,
-                    self.btn_analytics, self.btn_settings,
+                    self.btn_analytics, self.btn_queue, self.btn_settings,
                     self.btn_help]:
             btn.setCursor(Qt.CursorShape.PointingHandCursor)
             btn.setMinimumHeight(40)
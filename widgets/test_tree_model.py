@@ -0,0 +1,346 @@
+import os
+from array import array
+from bisect import bisect_left
+from PyQt6.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+ITEM_FLAGS = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable
+
+def suite_sort_key(path):
+    """Order of the discovery scan: the files of a folder by name, then its sub folders.
+
+    Names are compared case-insensitively, then as they are, so paths only
+    differing by case (distinct files on Linux) keep keys, and rows, of their own.
+    """
+    parts = path.split(os.sep)
+    return [(1, part.lower(), part) for part in parts[:-1]] + [(0, parts[-1].lower(), parts[-1])]
+
+
+def suite_tooltip(info):
+    """Suite name, documentation, tests and tags of a discovered suite file"""
+    lines = [f"{info['name']} - {len(info['tests'])} test(s)"]
+    if info['documentation']:
+        lines.append(info['documentation'])
+    tags = sorted({tag for test in info['tests'] for tag in test['tags']})
+    if tags:
+        lines.append(f"Tags: {', '.join(tags)}")
+    return "\n".join(lines)
+
+
+def test_tooltip(test):
+    return "\n".join(filter(None, [test['documentation'],
+                                   f"Tags: {', '.join(test['tags'])}" if test['tags'] else ""]))
+
+
+class TestTreeModel(QAbstractItemModel):
+    """Suite files with their test cases as checkable children, without one Qt item per row.
+
+    Each suite gets an id and a range of slots in a bitset holding the check
+    state of its tests (a suite without tests has one slot of its own). A
+    test is checked when its bit differs from ``_base``, so checking or
+    unchecking everything only flips ``_base`` and drops the bitset. The
+    number of set bits per suite is kept so a suite's tristate state is O(1).
+    Suites keep their ids and slots until the next clear(); replaced or
+    removed ones just leave unused slots behind.
+
+    A filter (see set_filter) hides suites and tests without touching their
+    check states; rows then map to the visible suites and tests only.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._reset_store()
+
+    def _reset_store(self):
+        self._ids = {}
+        self._paths = []
+        self._sort_keys = []
+        self._infos = []
+        self._first = array('q')
+        self._flipped = array('q')
+        self._bits = bytearray()
+        self._slots = 0
+        self._base = False
+        # Suite ids in display order, with their sort keys for bisection
+        self._order = []
+        self._keys = []
+        self._filter = None
+        self._apply_filter()
+
+    # Store
+
+    def clear(self):
+        self.beginResetModel()
+        self._reset_store()
+        self.endResetModel()
+
+    def paths(self):
+        """Relative paths of the suites in display order"""
+        return [self._paths[suite] for suite in self._order]
+
+    def contains(self, path):
+        return path in self._ids
+
+    def info(self, path):
+        return self._infos[self._ids[path]]
+
+    def test_count(self, path):
+        return len(self.info(path)['tests'])
+
+    def set_suite(self, path, info, checked=frozenset()):
+        """Add or replace a suite, checking the tests named in checked (all of them when None)"""
+        suite = self._ids.get(path)
+        if self._filter is not None:
+            # Rows of a filtered list only change through a reset
+            self.beginResetModel()
+            if suite is not None:
+                self._drop_suite(suite)
+            self._insert_suite(self._new_suite(path, info, checked))
+            self._apply_filter()
+            self.endResetModel()
+            return
+        if suite is None:
+            suite = self._new_suite(path, info, checked)
+            row = bisect_left(self._keys, self._sort_keys[suite])
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._insert_suite(suite)
+            self.endInsertRows()
+            return
+        row = self._row(suite)
+        parent = self.index(row, 0)
+        replacement = self._new_suite(path, info, checked)
+        if self._infos[suite]['tests']:
+            self.beginRemoveRows(parent, 0, len(self._infos[suite]['tests']) - 1)
+            self._infos[suite] = dict(self._infos[suite], tests=[])
+            self.endRemoveRows()
+        if info['tests']:
+            self.beginInsertRows(parent, 0, len(info['tests']) - 1)
+        self._order[row] = replacement
+        self._infos[suite] = None
+        if info['tests']:
+            self.endInsertRows()
+        self.dataChanged.emit(parent, parent)
+
+    def remove_suite(self, path):
+        suite = self._ids.pop(path, None)
+        if suite is None:
+            return
+        if self._filter is not None:
+            self.beginResetModel()
+            self._drop_suite(suite)
+            self._apply_filter()
+            self.endResetModel()
+            return
+        row = self._row(suite)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        self._drop_suite(suite)
+        self.endRemoveRows()
+
+    def _insert_suite(self, suite):
+        row = bisect_left(self._keys, self._sort_keys[suite])
+        self._order.insert(row, suite)
+        self._keys.insert(row, self._sort_keys[suite])
+
+    def _drop_suite(self, suite):
+        row = bisect_left(self._keys, self._sort_keys[suite])
+        del self._order[row]
+        del self._keys[row]
+        self._infos[suite] = None
+
+    def _new_suite(self, path, info, checked):
+        suite = len(self._paths)
+        self._ids[path] = suite
+        self._paths.append(path)
+        self._sort_keys.append(suite_sort_key(path))
+        self._infos.append(info)
+        self._first.append(self._slots)
+        self._flipped.append(0)
+        self._slots += max(1, len(info['tests']))
+        self._bits.extend(bytes((self._slots + 7) // 8 - len(self._bits)))
+        if info['tests']:
+            for position, test in enumerate(info['tests']):
+                self._set_slot(suite, position, checked is None or test['name'] in checked)
+        else:
+            self._set_slot(suite, 0, checked is None)
+        return suite
+
+    def _row(self, suite):
+        return bisect_left(self._row_keys, self._sort_keys[suite])
+
+    # Filter
+
+    def set_filter(self, visible):
+        """Show only the suites of {path: test positions, or None for all of them}, or everything for None"""
+        if visible == self._filter:
+            return
+        self.beginResetModel()
+        self._filter = visible
+        self._apply_filter()
+        self.endResetModel()
+
+    def is_filtered(self):
+        return self._filter is not None
+
+    def _apply_filter(self):
+        self._positions = {}
+        if self._filter is None:
+            self._rows, self._row_keys = self._order, self._keys
+            return
+        self._rows = sorted((self._ids[path] for path in self._filter if path in self._ids),
+                            key=self._sort_keys.__getitem__)
+        self._row_keys = [self._sort_keys[suite] for suite in self._rows]
+        for suite in self._rows:
+            positions = self._filter[self._paths[suite]]
+            if positions is not None:
+                self._positions[suite] = positions
+
+    def _visible_tests(self, suite):
+        """Positions of the shown tests of a suite"""
+        positions = self._positions.get(suite)
+        return positions if positions is not None else range(len(self._infos[suite]['tests']))
+
+    # Check states
+
+    def _is_set(self, suite, position):
+        slot = self._first[suite] + position
+        return bool(self._bits[slot >> 3] & (1 << (slot & 7))) != self._base
+
+    def _set_slot(self, suite, position, checked):
+        if self._is_set(suite, position) != checked:
+            slot = self._first[suite] + position
+            self._bits[slot >> 3] ^= 1 << (slot & 7)
+            self._flipped[suite] += 1 if self._bits[slot >> 3] & (1 << (slot & 7)) else -1
+
+    def _checked_count(self, suite):
+        size = max(1, len(self._infos[suite]['tests']))
+        return size - self._flipped[suite] if self._base else self._flipped[suite]
+
+    def _suite_state(self, suite):
+        checked = self._checked_count(suite)
+        if not checked:
+            return Qt.CheckState.Unchecked
+        if checked == max(1, len(self._infos[suite]['tests'])):
+            return Qt.CheckState.Checked
+        return Qt.CheckState.PartiallyChecked
+
+    def check_state(self, path):
+        return self._suite_state(self._ids[path])
+
+    def checked_tests(self, path):
+        suite = self._ids[path]
+        tests = self._infos[suite]['tests']
+        if self._checked_count(suite) in (0, len(tests)):
+            return [test['name'] for test in tests] if self._checked_count(suite) else []
+        return [test['name'] for position, test in enumerate(tests) if self._is_set(suite, position)]
+
+    def set_suite_checked(self, path, checked, positions=None):
+        """Check or uncheck the tests of a suite at positions (all of them when None)"""
+        suite = self._ids[path]
+        for position in positions if positions is not None else range(max(1, len(self._infos[suite]['tests']))):
+            self._set_slot(suite, position, checked)
+        self._suite_changed(suite)
+
+    def set_all_checked(self, checked):
+        """Check or uncheck every shown test; O(1) Python work when nothing is filtered out"""
+        if self._filter is not None:
+            for suite in self._rows:
+                self.set_suite_checked(self._paths[suite], checked, self._positions.get(suite))
+            return
+        self._base = checked
+        self._bits = bytearray(len(self._bits))
+        self._flipped = array('q', bytes(len(self._flipped) * self._flipped.itemsize))
+        if self._order:
+            # A range spanning several rows repaints the whole viewport, children included
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self._order) - 1, 0),
+                                  [Qt.ItemDataRole.CheckStateRole])
+
+    def _suite_changed(self, suite):
+        row = self._row(suite)
+        if row == len(self._rows) or self._rows[row] != suite:
+            return
+        parent = self.index(row, 0)
+        count = len(self._visible_tests(suite))
+        if count:
+            self.dataChanged.emit(self.index(0, 0, parent), self.index(count - 1, 0, parent),
+                                  [Qt.ItemDataRole.CheckStateRole])
+        self.dataChanged.emit(parent, parent, [Qt.ItemDataRole.CheckStateRole])
+
+    # QAbstractItemModel
+
+    def index(self, row, column, parent=QModelIndex()):
+        # Bounds are checked here rather than with hasIndex(), which calls back into rowCount()
+        if row < 0 or column:
+            return QModelIndex()
+        if parent.isValid():
+            if parent.internalId() or row >= self.rowCount(parent):
+                return QModelIndex()
+            # Test rows carry their suite id + 1, suite rows carry 0
+            return self.createIndex(row, column, self._rows[parent.row()] + 1)
+        if row >= len(self._rows):
+            return QModelIndex()
+        return self.createIndex(row, column, 0)
+
+    def parent(self, index):
+        if not index.isValid() or not index.internalId():
+            return QModelIndex()
+        return self.createIndex(self._row(index.internalId() - 1), 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._rows)
+        if parent.internalId() or parent.column():
+            return 0
+        suite = self._rows[parent.row()]
+        positions = self._positions.get(suite)
+        return len(positions) if positions is not None else len(self._infos[suite]['tests'])
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return ITEM_FLAGS
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.internalId():
+            suite = index.internalId() - 1
+            position = self._visible_tests(suite)[index.row()]
+            test = self._infos[suite]['tests'][position]
+            if role == Qt.ItemDataRole.DisplayRole:
+                return test['name']
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if self._is_set(suite, position) else Qt.CheckState.Unchecked
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return test_tooltip(test)
+            return None
+        suite = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._paths[suite]
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return self._suite_state(suite)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return suite_tooltip(self._infos[suite])
+        if role == Qt.ItemDataRole.UserRole:
+            return self._infos[suite]
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        checked = Qt.CheckState(value) != Qt.CheckState.Unchecked
+        if index.internalId():
+            suite = index.internalId() - 1
+            self._set_slot(suite, self._visible_tests(suite)[index.row()], checked)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+            parent = index.parent()
+            self.dataChanged.emit(parent, parent, [Qt.ItemDataRole.CheckStateRole])
+            return True
+        suite = self._rows[index.row()]
+        positions = self._positions.get(suite)
+        if positions is not None:
+            # A filtered suite toggles its shown tests only
+            checked = not all(self._is_set(suite, position) for position in positions)
+        self.set_suite_checked(self._paths[suite], checked, positions)
+        return True